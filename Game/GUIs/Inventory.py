@@ -10,7 +10,19 @@ class InventoryScreen(Screen):
         self.item_font = pygame.font.Font(self.game.fonts["Pixel"], 24)
 
         self.selected_index = 0
-        self.was_key_pressed = {pygame.K_UP: False, pygame.K_DOWN: False}
+        self.was_key_pressed = {pygame.K_UP: False, pygame.K_DOWN: False, pygame.K_e: False}
+
+        # Rendered stat summary, rebuilt only when the player's stats change
+        self.stats_surface = None
+        self.game.player.stats.subscribe(self._on_stats_changed)
+
+    def _on_stats_changed(self, changes):
+        self.stats_surface = None
+
+    def _render_stats(self):
+        stats = self.game.player.stats
+        text = f"Hearts {int(stats.current_max_health)}   Speed {stats.max_speed:g}   Damage {stats.attack_damage:g}   Jumps {stats.max_jumps:g}"
+        return self.font.render(text, True, (200, 200, 200))
 
     def toggle(self):
         self.active = not self.active
@@ -39,8 +51,19 @@ class InventoryScreen(Screen):
         if keys[pygame.K_DOWN] and not self.was_key_pressed[pygame.K_DOWN]:
             self.selected_index = (self.selected_index + 1) % len(inventory_items)
 
+        # Equip / unequip the selected item
+        if keys[pygame.K_e] and not self.was_key_pressed[pygame.K_e]:
+            player = self.game.player
+            name = inventory_items[self.selected_index % len(inventory_items)]
+            item = player.inventory[name]
+            if name in player.equipped:
+                player.unequip(item)
+            elif hasattr(item, 'attribute_values'):
+                player.equip(item)
+
         self.was_key_pressed[pygame.K_UP] = keys[pygame.K_UP]
         self.was_key_pressed[pygame.K_DOWN] = keys[pygame.K_DOWN]
+        self.was_key_pressed[pygame.K_e] = keys[pygame.K_e]
 
     def draw(self, screen):
         if not self.active:
@@ -80,7 +103,11 @@ class InventoryScreen(Screen):
             for i, (name, item) in enumerate(inventory_items):
                 color = (255, 255, 255) if i == self.selected_index else (120, 120, 120)
                 prefix = "> " if i == self.selected_index else "  "
-                item_text = self.item_font.render(f"{prefix}{name}", True, color)
+                count = self.game.player.item_counts.get(name, 1)
+                suffix = f" x{count}" if count > 1 else ""
+                if name in self.game.player.equipped:
+                    suffix += " [E]"
+                item_text = self.item_font.render(f"{prefix}{name}{suffix}", True, color)
                 screen.blit(item_text, (item_list_x, item_list_y + i * item_height))
 
             # Draw Detailed View of Selected Item
@@ -128,7 +155,12 @@ class InventoryScreen(Screen):
                             attr_text = self.font.render(f"{attr}: {val}", True, (150, 255, 150))
                             screen.blit(attr_text, (detail_x + 10, attr_y + 30 + row * 24))
 
+        if self.stats_surface is None:
+            self.stats_surface = self._render_stats()
+        stats_rect = self.stats_surface.get_rect(centerx=screen_size[0] // 2, bottom=panel_rect.bottom - 50)
+        screen.blit(self.stats_surface, stats_rect)
+
         # Controls Hint
-        hint_text = self.font.render("[TAB/ESC] Close    [UP/DOWN] Select", True, (100, 100, 100))
+        hint_text = self.font.render("[TAB/ESC] Close    [UP/DOWN] Select    [E] Equip", True, (100, 100, 100))
         hint_rect = hint_text.get_rect(centerx=screen_size[0] // 2, bottom=panel_rect.bottom - 20)
         screen.blit(hint_text, hint_rect)
@@ -0,0 +1,56 @@
+import pygame
+from Game.GUIs.Screen import Screen
+
+
+class MapScreen(Screen):
+    def __init__(self, game):
+        super().__init__(game)
+        self.active = False
+        self._was_movable = True
+        self.font = pygame.font.Font(self.game.fonts["Pixel"], 16)
+        self.title_font = pygame.font.Font(self.game.fonts["Pixel"], 48)
+
+    def toggle(self):
+        self.active = not self.active
+        attributes = self.game.player.attributes
+        if self.active:
+            # Closing hands back whatever was holding the player before, e.g. a shop
+            self._was_movable = attributes["movable"]
+            attributes["movable"] = False
+        else:
+            attributes["movable"] = self._was_movable
+
+    def draw(self, screen):
+        if not self.active:
+            return
+
+        # Background dimming
+        surf = pygame.surface.Surface(screen.get_size(), pygame.SRCALPHA)
+        surf.fill((0, 0, 0, 200))
+        screen.blit(surf, (0, 0))
+
+        screen_size = screen.get_size()
+        panel_width, panel_height = 640, 440
+        panel_rect = pygame.Rect((screen_size[0] - panel_width) // 2, (screen_size[1] - panel_height) // 2, panel_width, panel_height)
+        pygame.draw.rect(screen, (30, 30, 30), panel_rect, border_radius=20)
+        pygame.draw.rect(screen, (100, 100, 100), panel_rect, 4, border_radius=20)
+
+        title_text = self.title_font.render("Map", True, (255, 200, 50))
+        title_rect = title_text.get_rect(centerx=screen_size[0] // 2, top=panel_rect.top + 20)
+        screen.blit(title_text, title_rect)
+
+        # Only the baked, already revealed map textures are composed here
+        map_rect = panel_rect.inflate(-40, -140).move(0, 20)
+        player = self.game.player
+        tilemap = player.tilemap
+        ts = tilemap.tile_size if tilemap is not None else 32
+        center_grid = (player.rect.centerx // ts, player.rect.centery // ts)
+
+        screen.set_clip(map_rect)
+        self.game.minimap.draw(screen, center_grid, map_rect.center)
+        pygame.draw.rect(screen, (255, 80, 80), (map_rect.centerx - 2, map_rect.centery - 2, 5, 5))
+        screen.set_clip(None)
+
+        hint_text = self.font.render("[M/ESC] Close", True, (100, 100, 100))
+        hint_rect = hint_text.get_rect(centerx=screen_size[0] // 2, bottom=panel_rect.bottom - 20)
+        screen.blit(hint_text, hint_rect)
@@ -139,13 +139,12 @@ class StoreTile:
         if player.currency >= price:
             player.currency -= price
             if item:
-                # Add to player inventory
+                # Add to player inventory and apply its attributes
                 item_name = getattr(item, 'name', 'Item')
-                player.inventory[item_name] = item
-
                 if hasattr(item, 'attribute_values'):
-                    # Apply attributes from the item to the player
-                    player.add_attributes(item.attribute_values)
+                    player.give_item(item)
+                else:
+                    player.inventory[item_name] = item
 
                 print(f"Bought {item_name}! Remaining currency: {player.currency}")
                 return True
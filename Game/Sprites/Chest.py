@@ -0,0 +1,43 @@
+from Game.Sprites.PhysicsSprite import PhysicsSprite
+from Game.utils.spatial_hash import LAYER_CHEST
+from Game.utils.utils import make_generic_surface
+
+
+class Chest(PhysicsSprite):
+    collision_layer = LAYER_CHEST
+
+    def __init__(self, position, game, tilemap, contents, chest_id=None, opened=False):
+        super().__init__(make_generic_surface((16, 16), (150, 90, 30)), position, game)
+        self.tilemap = tilemap
+        self.contents = contents
+        self.chest_id = chest_id
+        self.opened = False
+        self.sprite_group = None
+
+        if opened:
+            self._show_opened()
+
+    def _show_opened(self):
+        self.opened = True
+        self.image = make_generic_surface((16, 16), (80, 50, 20))
+
+    def open(self, player):
+        """Hand the contents to the player. Entries look like "crystal 5" or an item id with an optional count."""
+        if self.opened:
+            return False
+        self._show_opened()
+        self.tilemap.opened_chests.add(self.chest_id)
+
+        for entry in self.contents:
+            name, _, amount = entry.rpartition(" ")
+            if not amount.isdigit():
+                name, amount = entry, "1"
+
+            if name == "crystal":
+                player.currency += int(amount)
+                continue
+
+            item = self.game.items.get_item(name)
+            if item is not None:
+                player.give_item(item)
+        return True
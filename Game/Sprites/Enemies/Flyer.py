@@ -1,20 +1,29 @@
+import random
+
 import pygame
 from Game.Sprites.Enemy import Enemy
 
 class Flyer(Enemy):
+    __slots__ = ("direction", "tilemap")
+
+    speed = 50
+    damage = 1
+    move_interval = 2.0
+
+    # Gravity shouldn't affect flying enemies
+    gravity = 0
+    max_fall_speed = 0
+
     def __init__(self, img, pos, game, tilemap=None):
         super().__init__(img, pos, game)
-        self.speed = 50
         self.health = 3
-        self.damage = 1
         self.direction = pygame.Vector2(-1, 1)  # Start moving right only
-        self.move_timer = 0
-        self.move_interval = 2.0
         self.tilemap = tilemap
 
-        # Gravity shouldn't affect flying enemies
-        self.gravity = 0
-        self.max_fall_speed = 0
+        # Direction changes are AI, run by the scheduler rather than every update
+        ai = getattr(game, 'ai', None)
+        if ai is not None:
+            ai.register(self, "flyer.wander", Flyer._wander, 1.0 / self.move_interval)
 
     def _move_and_collide(self, dx, dy):
         # Store original position
@@ -68,7 +77,7 @@ class Flyer(Enemy):
         if self.hurt != 0:
             return  # Currently in hurt cooldown, ignore damage
 
-        self.hurt = self.hurt_cooldown
+        self.game.timers.countdown(self, "hurt", self.hurt_cooldown)
 
         if self.immunity <= 0:
             self.health -= damage
@@ -79,35 +88,19 @@ class Flyer(Enemy):
                 # Reverse direction when taking damage
                 self.direction.x *= -1
                 self.direction.y *= -1
-                self.immunity = 0.5  # 0.5 seconds of immunity after taking damage
+                self.game.timers.countdown(self, "immunity", 0.5)  # 0.5 seconds of immunity after taking damage
 
 
-    def update(self, dt):
-        if self.hurt != 0:
-            self.hurt -= dt
-            if self.hurt < 0:
-                self.hurt = 0
-        if self.immunity != 0:
-            self.immunity -= dt
-            if self.immunity < 0:
-                self.immunity = 0
-
-        if not getattr(self, '_update_debug_done', False):
-            self._update_debug_done = True
+    def _wander(self, elapsed):
+        # Periodically change direction for more interesting movement
+        if random.random() < 0.3:  # 30% chance to change Y direction
+            self.direction.y *= -1
+        if random.random() < 0.3:  # 30% chance to change X direction
+            self.direction.x *= -1
 
+    def update(self, dt):
         self._reset_collisions()
 
-        # Periodically change direction for more interesting movement
-        self.move_timer += dt
-        if self.move_timer >= self.move_interval:
-            self.move_timer = 0
-            # Randomly change direction
-            import random
-            if random.random() < 0.3:  # 30% chance to change Y direction
-                self.direction.y *= -1
-            if random.random() < 0.3:  # 30% chance to change X direction
-                self.direction.x *= -1
-
         # Set velocity based on direction and speed
         self.velocity.x = self.speed * self.direction.x
         self.velocity.y = self.speed * self.direction.y
@@ -3,26 +3,22 @@ from Game.Sprites.Enemy import Enemy
 
 
 class GroundCrawler(Enemy):
+    __slots__ = ("direction", "tilemap", "last_flip_ts")
+
+    speed = 50  # pixels per second
+
+    # Debug flag
+    debug = False
+
+    # Ledge detection
+    flip_cooldown_ms = 150
+    flip_nudge_px = 0.35
+
     def __init__(self, img, position, game, tilemap):
         super().__init__(img, position, game)
         self.direction = 1
         self.tilemap = tilemap
-        self.speed = 50  # pixels per second
-
-        # Debug flag
-        self.debug = False
-
-        # Ledge detection
-        self.ledge_grace_px = 3
-        self.flip_cooldown_ms = 150
         self.last_flip_ts = 0
-        self.flip_nudge_px = 0.35
-
-        # Multi-sample ledge detection
-        self.samples_across = 3
-        self.samples_down = 2
-        self.ledge_frames_threshold = 2
-        self._ledge_frame_counter = 0
 
     def _do_flip(self, reason, debug_info=None):
         """Flip direction with cooldown and nudge to avoid re-collision."""
@@ -56,58 +52,17 @@ class GroundCrawler(Enemy):
 
         super().take_damage(damage)
 
-    def _sample_ground_support(self):
-        ts = self.tilemap.tile_size
-        if ts <= 0:
-            return True, False
-
-        # Determine sampling positions
-        if self.direction >= 0:
-            toe_x = self.rect.right - 1
-            horiz_offsets = [toe_x, toe_x - max(2, self.rect.width // 4), self.rect.centerx - max(2, self.rect.width // 4)]
-        else:
-            toe_x = self.rect.left
-            horiz_offsets = [toe_x, toe_x + max(2, self.rect.width // 4), self.rect.centerx + max(2, self.rect.width // 4)]
-
-        vert_offsets = [1, self.ledge_grace_px]
-
-        # Sample points
-        ahead_solid = False
-        samples = []
-
-        for hx in horiz_offsets:
-            for vy in vert_offsets:
-                px = int(hx)
-                py = int(self.rect.bottom + vy)
-                gx = px // ts
-                gy = py // ts
-                tile = self.tilemap.get_tile(gx, gy)
-                solid = tile and ('solid' in tile.get('properties', []))
-                samples.append({'px': (px, py), 'gx': gx, 'gy': gy, 'solid': solid})
-                if solid:
-                    ahead_solid = True
-
-        # Check neighbor tile one step ahead
-        neighbor_gx = int((toe_x // ts) + self.direction)
-        neighbor_gy = int((self.rect.bottom + 1) // ts)
-        neighbor_tile = self.tilemap.get_tile(neighbor_gx, neighbor_gy)
-        neighbor_solid = neighbor_tile and ('solid' in neighbor_tile.get('properties', []))
-
-        return ahead_solid, neighbor_solid, samples
+    def _distance_to_ledge(self):
+        """Pixels the leading edge can still move before the span underfoot ends at a drop or wall."""
+        distance = self.tilemap.distance_to_ledge(self.rect.centerx, self.rect.bottom + 1, self.direction)
+        if distance is None:
+            return None
+        return distance - self.rect.width / 2
 
     def update(self, dt):
         # Set horizontal velocity
         self.velocity.x = self.speed * self.direction
 
-        # Sample ground ahead
-        ahead_solid, neighbor_solid, samples = self._sample_ground_support()
-
-        # Debug output before physics
-        if self.debug:
-            pos = getattr(self, 'pos', self.rect.topleft)
-            sample_summary = ','.join([f"({s['px']}->{s['gx']},{s['gy']} solid={s['solid']})" for s in samples])
-            print(f"[GroundCrawler update] BEFORE rect={self.rect.topleft} pos={pos} vel.x={self.velocity.x:.2f} dir={self.direction} samples=[{sample_summary}] neighbor_solid={neighbor_solid} collisions_bottom={self.collisions['bottom']}")
-
         # Call parent update (physics)
         super().update(dt)
 
@@ -121,15 +76,8 @@ class GroundCrawler(Enemy):
             self._do_flip('collision')
             self.velocity.x = self.speed * self.direction
 
-        # Ledge detection: if no support ahead and no neighbor solid, increment counter and flip when threshold reached
-        if not ahead_solid and not neighbor_solid:
-            self._ledge_frame_counter += 1
-            if self._ledge_frame_counter >= self.ledge_frames_threshold:
-                flipped = self._do_flip('ledge')
-                if flipped:
-                    self._ledge_frame_counter = 0
-                    self.velocity.x = self.speed * self.direction
-        else:
-            # Support detected, reset counter
-            self._ledge_frame_counter = 0
-
+        # Ledge detection: the walkable span table tells us how far we can go before a drop or wall
+        distance = self._distance_to_ledge()
+        if distance is not None and distance <= 0:
+            if self._do_flip('ledge'):
+                self.velocity.x = self.speed * self.direction
@@ -1,22 +1,27 @@
 import pygame
 from Game.Sprites.PhysicsSprite import PhysicsSprite
+from Game.utils.spatial_hash import LAYER_ENEMY
 
 class Enemy(PhysicsSprite):
+    __slots__ = ("health", "max_health", "immunity", "hurt")
+
+    collision_layer = LAYER_ENEMY
+    hurt_cooldown = 0.2
+
     def __init__(self, image, position, game):
         super().__init__(image, position, game)
         self.health = 3
         self.max_health = 3
-        self.immunity = 0  # Time remaining for immunity after taking damage
+        self.immunity = 0  # Non-zero while immune after taking damage, cleared by game.timers
         self.sprite_group = None
 
         self.hurt = 0
-        self.hurt_cooldown = 0.2
 
     def take_damage(self, damage):
         if self.hurt != 0:
             return  # Currently in hurt cooldown, ignore damage
 
-        self.hurt = self.hurt_cooldown
+        self.game.timers.countdown(self, "hurt", self.hurt_cooldown)
 
         if self.immunity <= 0:
             self.health -= damage
@@ -24,7 +29,7 @@ class Enemy(PhysicsSprite):
                 self.health = 0
                 self.die()  # Call custom death method
             else:
-                self.immunity = 0.5  # 0.5 seconds of immunity after taking damage
+                self.game.timers.countdown(self, "immunity", 0.5)  # 0.5 seconds of immunity after taking damage
 
     def die(self):
         """Method to handle enemy death"""
@@ -34,24 +39,19 @@ class Enemy(PhysicsSprite):
     def kill(self):
         # Call parent kill to remove from all groups
         super().kill()
+        # Stop being hit or touched for the rest of this tick, not just from the next one
+        entities = getattr(self.game, 'entities', None)
+        if entities is not None:
+            entities.remove(self)
+        ai = getattr(self.game, 'ai', None)
+        if ai is not None:
+            ai.unregister(self)
 
     def apply_knockback(self, vec):
+        self.wake()
         self.velocity.x += vec.x
         self.velocity.y += vec.y
 
-    def update(self, dt):
-        if self.hurt > 0:
-            self.hurt -= dt
-            if self.hurt < 0:
-                self.hurt = 0
-        # Update immunity timer
-        if self.immunity > 0:
-            self.immunity -= dt
-            if self.immunity < 0:
-                self.immunity = 0
-
-        super().update(dt)
-
     def draw(self, screen, offset):
         # support offset as sequence (tuple/list) or pygame.Vector2
         try:
@@ -64,11 +64,9 @@ class Enemy(PhysicsSprite):
             except Exception:
                 offx = 0
                 offy = 0
-        # Use hasattr to check if pos attribute exists (for PhysicsSprite compatibility)
-        if hasattr(self, 'pos'):
-            pos = (int(self.pos.x - offx), int(self.pos.y - offy))
-        else:
-            pos = (int(self.rect.x - offx), int(self.rect.y - offy))
+        # Drawn between the last two simulation ticks
+        pos = self.interpolated_pos()
+        pos = (int(pos.x - offx), int(pos.y - offy))
         if self.hurt == 0:
             screen.blit(self.image, pos)
         elif self.hurt > 0:
@@ -0,0 +1,87 @@
+import pygame
+from Game.Sprites.Sprite import Sprite
+from Game.utils.spatial_hash import LAYER_ENEMY, LAYER_NPC, LAYER_CHEST
+from Game.utils.utils import make_generic_surface
+
+
+class MovingPlatform(Sprite):
+    """
+    A kinematic solid that follows a list of waypoints (pixels) back and forth.
+
+    It is never moved by collisions. Bodies that stood on it last frame are carried by its
+    per-frame delta, and bodies it runs into are pushed out of the way.
+    """
+
+    def __init__(self, rect, game, tilemap, path, speed=60, one_way=False):
+        rect = pygame.Rect(rect)
+        super().__init__(make_generic_surface(rect.size, (110, 110, 110)), rect.topleft)
+        self.game = game
+        self.tilemap = tilemap
+        self.pos = pygame.math.Vector2(rect.topleft)
+        self.prev_pos = pygame.math.Vector2(self.pos)
+        self.path = [pygame.math.Vector2(point) for point in path] or [pygame.math.Vector2(self.pos)]
+        self.target = 1 % len(self.path)
+        self.step = 1
+        self.speed = speed
+        self.one_way = one_way
+
+        self.delta = pygame.math.Vector2(0, 0)
+        self.riders = set()
+        self.sprite_group = None
+
+    def interpolated_pos(self):
+        return self.prev_pos.lerp(self.pos, getattr(self.game, 'render_alpha', 1.0))
+
+    def _advance(self, dt):
+        distance = self.speed * dt
+        if len(self.path) < 2:
+            return
+        # Bounded so a path of identical waypoints can't spin forever
+        for _ in range(2 * len(self.path)):
+            to_target = self.path[self.target] - self.pos
+            length = to_target.length()
+            if length > distance:
+                self.pos += to_target * (distance / length)
+                return
+            self.pos = pygame.math.Vector2(self.path[self.target])
+            distance -= length
+
+            # Ping-pong along the path
+            if not 0 <= self.target + self.step < len(self.path):
+                self.step *= -1
+            self.target += self.step
+
+    def update(self, dt):
+        old_topleft = self.rect.topleft
+        self._advance(dt)
+        self.rect.topleft = (int(round(self.pos.x)), int(round(self.pos.y)))
+
+        # Whole-pixel delta so riders stay glued to the top edge
+        self.delta = pygame.math.Vector2(self.rect.x - old_topleft[0], self.rect.y - old_topleft[1])
+        self.game.dynamic_solids.move(self)
+
+        if self.delta.x or self.delta.y:
+            for rider in self.riders:
+                rider.pos += self.delta
+                rider.rect.topleft = (int(round(rider.pos.x)), int(round(rider.pos.y)))
+            if not self.one_way:
+                self._push_bodies()
+        self.riders.clear()
+
+    def _push_bodies(self):
+        # The hash was filled last tick, so look a little wider than the platform itself
+        bodies = [self.game.player] + self.game.entities.query(self.rect.inflate(64, 64), LAYER_ENEMY | LAYER_NPC | LAYER_CHEST)
+        for body in bodies:
+            if body in self.riders or not body.rect.colliderect(self.rect):
+                continue
+            if self.delta.y < 0:
+                body.rect.bottom = self.rect.top
+            elif self.delta.y > 0:
+                body.rect.top = self.rect.bottom
+            elif self.delta.x > 0:
+                body.rect.left = self.rect.right
+            else:
+                body.rect.right = self.rect.left
+            body.pos.x = float(body.rect.x)
+            body.pos.y = float(body.rect.y)
+            body.wake()
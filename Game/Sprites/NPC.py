@@ -1,16 +1,27 @@
 import pygame
 from Game.Sprites.Player import PhysicsSprite
+from Game.utils.spatial_hash import LAYER_NPC
 
 class NPC(PhysicsSprite):
+    __slots__ = ("tilemap", "dialogue", "current_dialogue_index", "is_talking")
+
+    collision_layer = LAYER_NPC
+    _font = None  # One font for every NPC, loaded on first use
+
     def __init__(self, image, position, game, tilemap):
         super().__init__(image, position, game)
         self.game = game
         self.tilemap = tilemap
         self.dialogue = []
         self.current_dialogue_index = 0
-        self.font = pygame.font.SysFont("Arial", 14)
         self.is_talking = False
 
+    @property
+    def font(self):
+        if NPC._font is None:
+            NPC._font = pygame.font.SysFont("Arial", 14)
+        return NPC._font
+
     def update(self, dt):
         super().update(dt)
 
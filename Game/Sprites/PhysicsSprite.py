@@ -2,8 +2,45 @@ import pygame
 
 from Game.Sprites.Sprite import Sprite
 
+SLEEP_AFTER_TICKS = 5  # Consecutive resting ticks before a body stops simulating
+
+# Collision sides, as bits of CollisionFlags
+COLLIDE_TOP = 1
+COLLIDE_BOTTOM = 2
+COLLIDE_LEFT = 4
+COLLIDE_RIGHT = 8
+_SIDES = {"top": COLLIDE_TOP, "bottom": COLLIDE_BOTTOM, "left": COLLIDE_LEFT, "right": COLLIDE_RIGHT}
+
+
+class CollisionFlags:
+    """The sides a body touched this tick. A bitmask, read and written like the old dict (flags["bottom"])."""
+
+    __slots__ = ("bits",)
+
+    def __init__(self, bits=0):
+        self.bits = bits
+
+    def __getitem__(self, side):
+        return bool(self.bits & _SIDES[side])
+
+    def __setitem__(self, side, value):
+        if value:
+            self.bits |= _SIDES[side]
+        else:
+            self.bits &= ~_SIDES[side]
+
+    def __repr__(self):
+        return f"CollisionFlags({', '.join(side for side, bit in _SIDES.items() if self.bits & bit) or '-'})"
+
 
 class PhysicsSprite(Sprite):
+    __slots__ = ("game", "pos", "prev_pos", "velocity", "acceleration", "collisions",
+                 "can_sleep", "sleeping", "_rest_ticks", "lod_tier", "lod_pending", "lod_ticks")
+
+    # Gravity in pixels / s^2, shared per class
+    gravity = 1200
+    max_fall_speed = 1200
+
     def __init__(self, image, position, game, velocity=(0, 0), acceleration=(0, 0)):
         super().__init__(image, position)
         self.image = image
@@ -12,29 +49,37 @@ class PhysicsSprite(Sprite):
 
         # Single source of truth: pos is the float position
         self.pos = pygame.math.Vector2(self.rect.topleft)
+        # Position at the start of the current tick, drawn blended towards pos by game.render_alpha
+        self.prev_pos = pygame.math.Vector2(self.pos)
 
         self.velocity = pygame.math.Vector2(velocity)
         self.acceleration = pygame.math.Vector2(acceleration)
 
-        # Gravity in pixels / s^2
-        self.gravity = 1200
-        self.max_fall_speed = 1200
+        # Collision state flags, cleared in place every update
+        self.collisions = CollisionFlags()
+
+        # Bodies standing still on the ground stop integrating until something wakes them
+        self.can_sleep = True
+        self.sleeping = False
+        self._rest_ticks = 0
 
-        # Collision state flags
-        self.collisions = {
-            "top": False,
-            "bottom": False,
-            "left": False,
-            "right": False
-        }
+        # Simulation level of detail bookkeeping, see Game.utils.sim_lod
+        self.lod_tier = 0
+        self.lod_pending = 0.0
+        self.lod_ticks = 0
 
     def _get_solid_tiles_in_rect(self, rect):
+        return self._get_tiles_in_rect(rect)[0]
+
+    def _get_tiles_in_rect(self, rect):
+        """Full solid tile rects, plus (rect, shape) pairs for one-way and slope tiles."""
         solid_rects = []
+        shaped = []
 
         # Debug - only print once
         debug = False
 
-        for tilemap in self.game.tilemaps.values():
+        for _, tilemap in self.game.world_index.query_rect(rect.inflate(128, 128)):
             if not tilemap.rendered:
                 continue
 
@@ -68,22 +113,121 @@ class PhysicsSprite(Sprite):
                     # Check if 'solid' in properties.
                     properties = tile.get('properties', [])
                     if "solid" in properties:
-                         solid_rects.append(pygame.Rect(gx * tile_size, gy * tile_size, tile_size, tile_size))
-
-        return solid_rects
+                        tile_rect = pygame.Rect(gx * tile_size, gy * tile_size, tile_size, tile_size)
+                        shape = tilemap.get_collision_shape(tile)
+                        if shape is None:
+                            solid_rects.append(tile_rect)
+                        else:
+                            shaped.append((tile_rect, shape))
+
+        # Moving platforms live in their own small overlay next to the static grid
+        dynamic_solids = getattr(self.game, 'dynamic_solids', None)
+        if dynamic_solids is not None:
+            for platform in dynamic_solids.query_rect(rect.inflate(64, 64)):
+                if platform.one_way:
+                    shaped.append((platform.rect, ("one_way", None)))
+                else:
+                    solid_rects.append(platform.rect)
+
+        return solid_rects, shaped
+
+    def _surface_height(self, tile_rect, shape):
+        """Pixel y of a one-way or slope tile's walkable surface under this body, or None."""
+        kind, profile = shape
+        if kind == "one_way":
+            if self.rect.right > tile_rect.left and self.rect.left < tile_rect.right:
+                return tile_rect.top
+            return None
+
+        column = self.rect.centerx - tile_rect.left
+        if 0 <= column < len(profile) and profile[column] is not None:
+            return tile_rect.top + profile[column]
+        return None
+
+    def _snap_to_slopes(self, shaped):
+        # Walking into a slope lifts the body onto it, up to half a tile per step
+        for tile_rect, shape in shaped:
+            if shape[0] != "slope":
+                continue
+            surface = self._surface_height(tile_rect, shape)
+            if surface is not None and surface < self.rect.bottom <= surface + tile_rect.height // 2:
+                self.rect.bottom = surface
+                self.pos.y = float(self.rect.y)
+                self.collisions.bits |= COLLIDE_BOTTOM
 
     def _reset_collisions(self):
-        self.collisions = {
-            "top": False,
-            "bottom": False,
-            "left": False,
-            "right": False
-        }
-
-    def _move_and_collide(self, dx, dy):
-        STEPSIZE = 2  # Reduced step size for smoother collision detection
-
-        # Move horizontally with stepping
+        self.collisions.bits = 0
+
+    def _block_x(self, x, direction):
+        self.rect.x = x
+        if direction > 0:  # Moving right
+            self.collisions.bits |= COLLIDE_RIGHT
+        else:  # Moving left
+            self.collisions.bits |= COLLIDE_LEFT
+        self.pos.x = float(self.rect.x)
+        # Only zero out velocity if we were moving in that direction
+        if (direction > 0 and self.velocity.x > 0) or (direction < 0 and self.velocity.x < 0):
+            self.velocity.x = 0
+
+    def _block_y(self, y, direction):
+        self.rect.y = y
+        if direction > 0:  # Moving down
+            self.collisions.bits |= COLLIDE_BOTTOM
+        else:  # Moving up
+            self.collisions.bits |= COLLIDE_TOP
+        self.pos.y = float(self.rect.y)
+        # Only zero out velocity if we were moving in that direction
+        if (direction > 0 and self.velocity.y > 0) or (direction < 0 and self.velocity.y < 0):
+            self.velocity.y = 0
+
+    def _sweep_x(self, target, direction, solid_rects):
+        """Leftmost (moving right) or rightmost (moving left) x the rect can reach before target, or None if nothing is in the way."""
+        rect = self.rect
+        stop = None
+        for tile_rect in solid_rects:
+            if tile_rect.bottom <= rect.top or tile_rect.top >= rect.bottom:
+                continue
+            if direction > 0:
+                if tile_rect.right > rect.left and tile_rect.left < target + rect.width:
+                    x = tile_rect.left - rect.width
+                    if stop is None or x < stop:
+                        stop = x
+            elif tile_rect.left < rect.right and tile_rect.right > target:
+                x = tile_rect.right
+                if stop is None or x > stop:
+                    stop = x
+        return stop
+
+    def _sweep_y(self, target, direction, solid_rects, shaped):
+        """Like _sweep_x, but downward moves also land on one-way tops and slopes whose surface they cross."""
+        rect = self.rect
+        stop = None
+        for tile_rect in solid_rects:
+            if tile_rect.right <= rect.left or tile_rect.left >= rect.right:
+                continue
+            if direction > 0:
+                if tile_rect.bottom > rect.top and tile_rect.top < target + rect.height:
+                    y = tile_rect.top - rect.height
+                    if stop is None or y < stop:
+                        stop = y
+            elif tile_rect.top < rect.bottom and tile_rect.bottom > target:
+                y = tile_rect.bottom
+                if stop is None or y > stop:
+                    stop = y
+
+        # One-way tops and slopes only stop a body that crosses their surface on the way down
+        if direction > 0:
+            for tile_rect, shape in shaped:
+                surface = self._surface_height(tile_rect, shape)
+                if surface is not None and rect.bottom <= surface < target + rect.height:
+                    y = surface - rect.height
+                    if stop is None or y < stop:
+                        stop = y
+        return stop
+
+    def _step_x(self, dx, solid_rects, shaped):
+        # Slopes lift the body as it walks, which changes what it can bump into, so step through them
+        STEPSIZE = 2
         remaining_x = dx
         while abs(remaining_x) > 0.01:
             step = max(-STEPSIZE, min(STEPSIZE, remaining_x))
@@ -91,57 +235,44 @@ class PhysicsSprite(Sprite):
             self.pos.x += step
             self.rect.x = int(round(self.pos.x))
 
-            # Check for collision
-            collided = False
-            solid_rects = self._get_solid_tiles_in_rect(self.rect)
             for tile_rect in solid_rects:
                 if self.rect.colliderect(tile_rect):
-                    if step > 0:  # Moving right
-                        self.rect.right = tile_rect.left
-                        self.collisions["right"] = True
-                    else:  # Moving left
-                        self.rect.left = tile_rect.right
-                        self.collisions["left"] = True
-                    self.pos.x = float(self.rect.x)
-                    # Only zero out velocity if we were moving in that direction
-                    if (step > 0 and self.velocity.x > 0) or (step < 0 and self.velocity.x < 0):
-                        self.velocity.x = 0
-                    collided = True
-                    break
-
-            if collided:
-                break
-            remaining_x -= step
+                    self._block_x(tile_rect.left - self.rect.width if step > 0 else tile_rect.right, step)
+                    return
 
-        # Move vertically with stepping
-        remaining_y = dy
-        while abs(remaining_y) > 0.01:
-            step = max(-STEPSIZE, min(STEPSIZE, remaining_y))
-
-            self.pos.y += step
-            self.rect.y = int(round(self.pos.y))
+            self._snap_to_slopes(shaped)
+            remaining_x -= step
 
-            # Check for collision
-            collided = False
-            solid_rects = self._get_solid_tiles_in_rect(self.rect)
-            for tile_rect in solid_rects:
-                if self.rect.colliderect(tile_rect):
-                    if step > 0:  # Moving down
-                        self.rect.bottom = tile_rect.top
-                        self.collisions["bottom"] = True
-                    else:  # Moving up
-                        self.rect.top = tile_rect.bottom
-                        self.collisions["top"] = True
-                    self.pos.y = float(self.rect.y)
-                    # Only zero out velocity if we were moving in that direction
-                    if (step > 0 and self.velocity.y > 0) or (step < 0 and self.velocity.y < 0):
-                        self.velocity.y = 0
-                    collided = True
-                    break
-
-            if collided:
-                break
-            remaining_y -= step
+    def _move_and_collide(self, dx, dy):
+        """
+        Move by (dx, dy), x first, then y. Each axis queries the solids under its whole swept
+        rect once and stops at the earliest contact, instead of re-querying every few pixels.
+        """
+        if abs(dx) > 0.01:
+            target = int(round(self.pos.x + dx))
+            swept = self.rect.union(self.rect.move(target - self.rect.x, 0))
+            solid_rects, shaped = self._get_tiles_in_rect(swept)
+            slopes = [(tile_rect, shape) for tile_rect, shape in shaped if shape[0] == "slope"]
+            if slopes:
+                self._step_x(dx, solid_rects, slopes)
+            else:
+                stop = self._sweep_x(target, dx, solid_rects)
+                if stop is not None:
+                    self._block_x(stop, dx)
+                else:
+                    self.pos.x += dx
+                    self.rect.x = target
+
+        if abs(dy) > 0.01:
+            target = int(round(self.pos.y + dy))
+            swept = self.rect.union(self.rect.move(0, target - self.rect.y))
+            solid_rects, shaped = self._get_tiles_in_rect(swept)
+            stop = self._sweep_y(target, dy, solid_rects, shaped)
+            if stop is not None:
+                self._block_y(stop, dy)
+            else:
+                self.pos.y += dy
+                self.rect.y = target
 
         # Final sync - keep pos and rect in sync properly
         self.pos.x = self.rect.x
@@ -149,14 +280,35 @@ class PhysicsSprite(Sprite):
 
         return dx, dy
 
+    def sleep(self):
+        self.sleeping = True
+        self.velocity.x = 0
+        self.velocity.y = 0
+
+    def wake(self):
+        """Resume simulating; call after changing velocity or position from outside the physics."""
+        self.sleeping = False
+        self._rest_ticks = 0
+
+    def _update_sleep(self, start, platform):
+        # Resting: didn't move, didn't try to, and touched the ground at some point while still.
+        # Standing on a moving platform never counts, the platform has to keep carrying the body.
+        resting = (self.rect.topleft == start and self.velocity.x == 0 and platform is None
+                   and (self.collisions.bits & COLLIDE_BOTTOM or self._rest_ticks > 0))
+        self._rest_ticks = self._rest_ticks + 1 if resting else 0
+        if self._rest_ticks >= SLEEP_AFTER_TICKS:
+            self.sleep()
+
     def apply_gravity(self, dt):
         self.velocity.y += self.gravity * dt
         if self.velocity.y > self.max_fall_speed:
             self.velocity.y = self.max_fall_speed
 
     def update(self, dt):
-        if not getattr(self, '_update_debug_done', False):
-            self._update_debug_done = True
+        if self.sleeping:
+            return
+        start = self.rect.topleft
+        walking = self.velocity.x != 0
 
         self._reset_collisions()
 
@@ -177,5 +329,21 @@ class PhysicsSprite(Sprite):
         self.pos.x = float(self.rect.x)
         self.pos.y = float(self.rect.y)
 
+        # Ask to be carried by whatever moving platform we ended up standing on
+        platform = None
+        dynamic_solids = getattr(self.game, 'dynamic_solids', None)
+        if dynamic_solids is not None and self.velocity.y >= 0:
+            platform = dynamic_solids.support_for(self.rect)
+            if platform is not None:
+                platform.riders.add(self)
+
+        if self.can_sleep and not walking:
+            self._update_sleep(start, platform)
+        else:
+            self._rest_ticks = 0
+
+    def interpolated_pos(self):
+        return self.prev_pos.lerp(self.pos, getattr(self.game, 'render_alpha', 1.0))
+
     def draw(self, screen, offset):
         super().draw(screen, offset)
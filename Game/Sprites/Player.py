@@ -2,30 +2,46 @@ import pygame
 from statistics import median
 
 from Game.Sprites.PhysicsSprite import PhysicsSprite
-from Game.utils.helpers import crop_to_content, find_tilemap_for_rect
+from Game.utils.helpers import crop_to_content
+from Game.utils.spatial_hash import LAYER_ENEMY, LAYER_NPC, LAYER_CHEST, LAYER_PICKUP
+from Game.utils.stats import StatBlock, Modifier, MOD_ADD, MOD_MULTIPLY
 from Game.utils.utils import SpriteSheet
 
+# Item attribute names that feed a differently named stat
+ITEM_STAT_ALIASES = {"health": "current_max_health", "speed": "max_speed", "jumps": "max_jumps"}
+
 
 class Player(PhysicsSprite):
     def __init__(self, game, position):
         super().__init__(pygame.surface.Surface((32, 32)), position, game)
-        self.attributes = {
+        # Derived stats: base values plus item / effect modifiers, read as self.stats.max_speed
+        self.stats = StatBlock({
             "max_speed": 200,
-            "velocity": pygame.math.Vector2(0, 0),
             "acceleration": 1200,
             "friction": 600,
             "air_resistance": 100,
             "terminal_velocity": 600,
             "max_health": 10,
             "current_max_health": 5,
-            "health": 5,
             "jump_velocity": -500,
-            "jumps_left": 1,
             "max_jumps": 1,
 
-            "immunity": 0,
             "attack_cooldown": 0.5,
             "attack_damage": 1,
+
+            # Only ever raised by items
+            "luck": 0,
+            "looting": 0,
+        }, limits={"current_max_health": (0, "max_health")})
+        self.stats.subscribe(self._on_stats_changed)
+
+        # State that changes during play
+        self.attributes = {
+            "velocity": pygame.math.Vector2(0, 0),
+            "health": 5,
+            "jumps_left": 1,
+
+            "immunity": 0,
             "attack_timer": 0,
 
             "movable": True,
@@ -36,6 +52,7 @@ class Player(PhysicsSprite):
         self.attack_hitbox = None
         self.is_attacking = False
         self.attacked_enemies = set()
+        self.attacked_tiles = set()
 
         self.player_scale = 1
 
@@ -53,61 +70,98 @@ class Player(PhysicsSprite):
         self.on_ground = False
         self.facing_right = True
 
+        # Input can start the player moving at any time, so it never sleeps
+        self.can_sleep = False
+
         self.debug = True
 
         self.currency = 100 # Default for testing or whatever
         self.inventory = {}
+        self.item_counts = {}  # Item name -> copies owned
+        self.equipped = {}  # Item name -> modifier source of each equipped copy
 
-    def add_attributes(self, attrs):
-        """Apply a dictionary of attributes to the player"""
+    def add_attributes(self, attrs, source=None):
+        """Apply a dictionary of item attributes to the player as stat modifiers from source"""
+        modifiers = []
         for key, value in attrs.items():
-            if key == "health":
-                # Increase max health and heal by the same amount
-                self.attributes["current_max_health"] += value
-                self.attributes["health"] += value
-
-                # Clamp current_max_health to absolute maximum
-                if self.attributes["current_max_health"] > self.attributes["max_health"]:
-                    self.attributes["current_max_health"] = self.attributes["max_health"]
-
-                # Clamp health to new current_max_health
-                if self.attributes["health"] > self.attributes["current_max_health"]:
-                    self.attributes["health"] = self.attributes["current_max_health"]
-
-            elif key == "max_speed" or key == "speed":
-                self.attributes["max_speed"] += value
-            elif key == "jumps":
-                self.attributes["max_jumps"] += value
-            elif key == "attack_damage":
-                self.attributes["attack_damage"] += value
+            stat = ITEM_STAT_ALIASES.get(key, key)
+            if isinstance(value, dict):
+                # {"add": 10, "mul": 0.25}
+                for kind in (MOD_ADD, MOD_MULTIPLY):
+                    if kind in value:
+                        modifiers.append(Modifier(stat, value[kind], kind, source))
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                modifiers.append(Modifier(stat, value, MOD_ADD, source))
             else:
-                # Handle other attributes like luck, looting, etc.
-                if key in self.attributes:
-                    if isinstance(self.attributes[key], (int, float)):
-                        self.attributes[key] += value
-                    else:
-                        self.attributes[key] = value
-                else:
-                    self.attributes[key] = value
+                # Not a number to stack, just a flag or setting
+                self.attributes[key] = value
+        self.stats.add_modifiers(modifiers)
+
+    def give_item(self, item):
+        """Add a copy of an item to the inventory and equip it. Copies stack, each adding its own modifiers."""
+        health = self.attributes["health"]
+        self.inventory[item.name] = item
+        self.item_counts[item.name] = self.item_counts.get(item.name, 0) + 1
+        if item.name in self.equipped:
+            self._equip_copy(item)
+        else:
+            self.equip(item)
+
+        # A health item heals by its value, even when max health is already at the cap
+        copy = self.equipped[item.name][-1]
+        healed = sum(modifier.value for modifier in self.stats.modifiers("current_max_health")
+                     if modifier.source is copy and modifier.kind == MOD_ADD)
+        if healed:
+            self.attributes["health"] = max(0, min(health + healed, self.stats.current_max_health))
+
+    def equip(self, item):
+        if item.name in self.equipped:
+            return
+        self.equipped[item.name] = []
+        for _ in range(self.item_counts.get(item.name, 1)):
+            self._equip_copy(item)
+
+    def _equip_copy(self, item):
+        # Items are shared between owners, so every copy gets its own token as the modifier source
+        copy = object()
+        self.equipped[item.name].append(copy)
+        self.add_attributes(item.attribute_values, source=copy)
+
+    def unequip(self, item):
+        for copy in self.equipped.pop(item.name, ()):
+            self.stats.remove_source(copy)
+
+    def _on_stats_changed(self, changes):
+        # Lowering max health takes the health above it away; give_item does the healing
+        if "current_max_health" in changes:
+            new = changes["current_max_health"][1]
+            self.attributes["health"] = max(0, min(self.attributes["health"], new))
 
     def check_enemy_collisions(self):
-        for enemy in self.tilemap.enemies.sprites():
-            if self.rect.colliderect(enemy.rect) and self.attributes["immunity"] <= 0:
+        # Any enemy touching the player, whichever tilemap it belongs to
+        for enemy in self.game.entities.query(self.rect, LAYER_ENEMY):
+            if self.attributes["immunity"] <= 0:
                 direction = -1
                 if enemy.rect.centerx > self.rect.centerx:
                     direction = 1
                 self.take_damage(1, pygame.math.Vector2(-300 * direction, -200))
 
+    def check_pickups(self):
+        for pickup in self.game.entities.query(self.rect, LAYER_PICKUP):
+            if hasattr(pickup, 'collect'):
+                pickup.collect(self)
+
     def take_damage(self, damage, direction):
         self.attributes["health"] -= damage
         if self.attributes["health"] < 0:
             self.attributes["health"] = 0
 
-        self.attributes["immunity"] = 1.0
+        self.game.timers.countdown(self.attributes, "immunity", 1.0)
 
         self.apply_knockback(direction)
 
     def apply_knockback(self, vec):
+        self.wake()
         self.velocity.x += vec.x
         self.velocity.y += vec.y
 
@@ -208,17 +262,9 @@ class Player(PhysicsSprite):
             self.attributes["health"] = 0
             return
 
-        if self.attributes["movable_timer"] > 0:
-            self.attributes["movable_timer"] -= dt
-
         self.controls(dt)
         super().update(dt)
 
-        if self.attributes["immunity"] > 0:
-            self.attributes["immunity"] -= dt
-        else:
-            self.attributes["immunity"] = 0
-
         # Update facing direction
         if self.velocity.x < -0.01:
             self.facing_right = False
@@ -231,8 +277,9 @@ class Player(PhysicsSprite):
             self.check_attack_collisions()
 
         self.check_enemy_collisions()
+        self.check_pickups()
 
-        tilemap_name, tilemap = find_tilemap_for_rect(self.game.tilemaps, self.rect)
+        tilemap_name, tilemap = self.game.world_index.find_owner(self.rect)
         if tilemap is not None:
             self.tilemap_name = tilemap_name
             self.tilemap = tilemap
@@ -240,7 +287,7 @@ class Player(PhysicsSprite):
         self.on_ground = self.collisions["bottom"]
 
         if self.on_ground:
-            self.attributes["jumps_left"] = self.attributes["max_jumps"]
+            self.attributes["jumps_left"] = self.stats.max_jumps
 
         # Animation State
         if self.is_attacking:
@@ -269,10 +316,10 @@ class Player(PhysicsSprite):
                      self.is_attacking = False
                      self.attack_hitbox = None
 
-        if self.velocity.y > self.attributes["terminal_velocity"]:
-            self.velocity.y = self.attributes["terminal_velocity"]
+        if self.velocity.y > self.stats.terminal_velocity:
+            self.velocity.y = self.stats.terminal_velocity
 
-        self.velocity.x = median((-self.attributes["max_speed"], self.velocity.x, self.attributes["max_speed"]))
+        self.velocity.x = median((-self.stats.max_speed, self.velocity.x, self.stats.max_speed))
 
     def draw(self, surf, camera_offset=(0, 0)):
         sheet = self.animations[self.animation][0]
@@ -292,10 +339,11 @@ class Player(PhysicsSprite):
             frame = pygame.transform.flip(frame, True, False)
 
         self.image = frame
-        # Use the precise position for drawing to reduce jittering
+        # Use the precise position, interpolated between simulation ticks, to reduce jittering
+        pos = self.interpolated_pos()
         draw_pos = (
-            int(self.pos.x + (self.rect.width - frame.get_width()) // 2 - camera_offset[0]),
-            int(self.pos.y + self.rect.height - frame.get_height() - camera_offset[1])
+            int(pos.x + (self.rect.width - frame.get_width()) // 2 - camera_offset[0]),
+            int(pos.y + self.rect.height - frame.get_height() - camera_offset[1])
         )
         surf.blit(frame, draw_pos)
 
@@ -323,24 +371,26 @@ class Player(PhysicsSprite):
             self.attack_hitbox = None
 
     def check_attack_collisions(self):
-        """Check for collisions between the attack hitbox and enemies"""
+        """Check for collisions between the attack hitbox and enemies or breakable blocks"""
         if self.attack_hitbox and self.is_attacking:
-            for enemy in self.tilemap.enemies.sprites():
-                if self.attack_hitbox.colliderect(enemy.rect):
-                    if enemy not in self.attacked_enemies:
-                        # Damage the enemy
-                        enemy.take_damage(self.attributes["attack_damage"])
+            for enemy in self.game.entities.query(self.attack_hitbox, LAYER_ENEMY):
+                if enemy not in self.attacked_enemies:
+                    # Damage the enemy
+                    enemy.take_damage(self.stats.attack_damage)
+
+                    knockback_direction = 1 if enemy.rect.centerx < self.rect.centerx else -1
 
-                        knockback_direction = 1 if enemy.rect.centerx < self.rect.centerx else -1
+                    self.attacked_enemies.add(enemy)
 
-                        self.attacked_enemies.add(enemy)
+            self.tilemap.hit_breakables(self.attack_hitbox, self.stats.attack_damage, self.attacked_tiles)
 
     def attack(self):
         # Only allow attack if cooldown is finished
         if self.attributes["attack_timer"] <= 0:
-            self.attributes["attack_timer"] = self.attributes["attack_cooldown"]
+            self.game.timers.countdown(self.attributes, "attack_timer", self.stats.attack_cooldown)
             self.is_attacking = True
             self.attacked_enemies.clear()
+            self.attacked_tiles.clear()
 
             # Set the attack animation - it will not be prefixed with direction thanks to our fix
             self.set_animation("slash")  # or "double_slash" for stronger attack
@@ -357,15 +407,11 @@ class Player(PhysicsSprite):
             return
 
         if keys[pygame.K_w]:
-            for npc in self.tilemap.npcs.sprites():
-                if self.rect.colliderect(npc.rect) and hasattr(npc, 'interact'):
+            for npc in self.game.entities.query(self.rect, LAYER_NPC):
+                if hasattr(npc, 'interact'):
                     self.attributes["movable"] = npc.interact(self)
-
-        # Update attack timer (cooldown)
-        if self.attributes["attack_timer"] > 0:
-            self.attributes["attack_timer"] -= dt
-            if self.attributes["attack_timer"] < 0:
-                self.attributes["attack_timer"] = 0
+            for chest in self.game.entities.query(self.rect, LAYER_CHEST):
+                chest.open(self)
 
         # Handle attack input
         if keys[pygame.K_x] or keys[pygame.K_c]:  # Using X or C as attack buttons
@@ -379,18 +425,18 @@ class Player(PhysicsSprite):
             horizontal_input += 1
 
         if horizontal_input != 0:
-            target_speed = self.attributes["max_speed"] * horizontal_input
+            target_speed = self.stats.max_speed * horizontal_input
             if self.on_ground:
-                self.velocity.x += horizontal_input * self.attributes["acceleration"] * dt
+                self.velocity.x += horizontal_input * self.stats.acceleration * dt
                 # Clamp to max speed
-                self.velocity.x = max(-self.attributes["max_speed"], min(self.attributes["max_speed"], self.velocity.x))
+                self.velocity.x = max(-self.stats.max_speed, min(self.stats.max_speed, self.velocity.x))
             else:
-                air_acceleration = self.attributes["acceleration"] * 0.7
+                air_acceleration = self.stats.acceleration * 0.7
                 if (target_speed > 0 and self.velocity.x < target_speed) or (target_speed < 0 and self.velocity.x > target_speed):
                     self.velocity.x += horizontal_input * air_acceleration * dt
-                    self.velocity.x = max(-self.attributes["max_speed"], min(self.attributes["max_speed"], self.velocity.x))
+                    self.velocity.x = max(-self.stats.max_speed, min(self.stats.max_speed, self.velocity.x))
                 else:
-                    friction = self.attributes["air_resistance"] * 0.5
+                    friction = self.stats.air_resistance * 0.5
                     decel = friction * dt
                     if self.velocity.x > 0 >= target_speed:
                         self.velocity.x = max(target_speed, self.velocity.x - decel)
@@ -398,7 +444,7 @@ class Player(PhysicsSprite):
                         self.velocity.x = min(target_speed, self.velocity.x + decel)
         else:
             if self.velocity.x != 0:
-                friction = self.attributes["friction"] if self.on_ground else self.attributes["air_resistance"] * 0.7
+                friction = self.stats.friction if self.on_ground else self.stats.air_resistance * 0.7
                 decel = friction * dt
                 if self.velocity.x > 0:
                     self.velocity.x = max(0, self.velocity.x - decel)
@@ -407,13 +453,13 @@ class Player(PhysicsSprite):
 
         if keys[pygame.K_SPACE]:
             if self.on_ground:
-                self.velocity.y = self.attributes["jump_velocity"]
+                self.velocity.y = self.stats.jump_velocity
                 self.on_ground = False
-                self.attributes["jumps_left"] = self.attributes["max_jumps"] - 1
+                self.attributes["jumps_left"] = self.stats.max_jumps - 1
             elif self.attributes["jumps_left"] > 0:
                 try:
                     if pygame.key.get_just_pressed()[pygame.K_SPACE]:
-                        self.velocity.y = self.attributes["jump_velocity"]
+                        self.velocity.y = self.stats.jump_velocity
                         self.attributes["jumps_left"] -= 1
                 except AttributeError:
                     pass
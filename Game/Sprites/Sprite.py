@@ -1,6 +1,10 @@
 import pygame
 
 class Sprite(pygame.sprite.Sprite):
+    # pygame's Sprite still brings a __dict__ (for its group set and any ad-hoc attributes), the
+    # attributes every entity has live in slots
+    __slots__ = ("image", "rect", "sprite_group")
+
     def __init__(self, image, position):
         super().__init__()
         self.image = image
@@ -18,8 +22,12 @@ class Sprite(pygame.sprite.Sprite):
             except Exception:
                 offx = 0
                 offy = 0
+        # Moving sprites are drawn between their last two simulation ticks
+        if hasattr(self, 'interpolated_pos'):
+            pos = self.interpolated_pos()
+            pos = (int(pos.x - offx), int(pos.y - offy))
         # Use hasattr to check if pos attribute exists (for PhysicsSprite compatibility)
-        if hasattr(self, 'pos'):
+        elif hasattr(self, 'pos'):
             pos = (int(self.pos.x - offx), int(self.pos.y - offy))
         else:
             pos = (int(self.rect.x - offx), int(self.rect.y - offy))
@@ -1,12 +1,23 @@
 from Game.FolderStorage import FolderStorage
 from Game.MISC.Items import ItemManager
 from Game.Sprites.Enemies.GroundCrawler import GroundCrawler
+from Game.utils import textures
 from Game.utils.camera import Camera
+from Game.utils.sensors import SensorSystem
+from Game.utils.dynamic_solids import DynamicSolids
+from Game.utils.minimap import Minimap
+from Game.utils.spatial_hash import SpatialHash
+from Game.utils.sim_lod import SimulationLOD, LOD_FROZEN
+from Game.utils.ai_scheduler import AIScheduler
+from Game.utils.timer_wheel import TimerWheel
+from Game.utils.tilemap_loader import TilemapLoader
+from Game.utils.world_index import WorldIndex
 from Game.utils.tilemaps import *
 from Game.utils.utils import *
 from Game.Sprites.Player import Player
 from Game.utils.hud import Hud
 from Game.GUIs.Inventory import InventoryScreen
+from Game.GUIs.MapScreen import MapScreen
 
 class Game:
     def __init__(self):
@@ -19,17 +30,38 @@ class Game:
         self.clock = pygame.time.Clock()
         self.running = True
 
+        # The simulation advances in fixed ticks; rendering interpolates between the last two
+        simulation = get_config().get("simulation", {})
+        self.tick_dt = 1.0 / simulation.get("tick_rate", 60)
+        self.max_ticks_per_frame = simulation.get("max_ticks_per_frame", 5)
+        self.max_frame_time = simulation.get("max_frame_time", 0.25)
+        self.fps_cap = simulation.get("fps_cap", 60)
+        self.accumulator = 0.0
+        self.render_alpha = 1.0
+
+        # Shared clock that every animated tile reads its frame from
+        self.animation_time = 0.0
+
         self.assets = {}
 
         self.items = ItemManager(self)
 
         self.camera = Camera(self.screen.get_width(), self.screen.get_height())
         self.tilemaps = {}
+        self.world_index = WorldIndex()
+        self.sensors = SensorSystem()
+        self.dynamic_solids = DynamicSolids()
+        self.entities = SpatialHash()
+        self.lod = SimulationLOD(**get_config().get("simulation_lod", {}))
+        self.ai = AIScheduler(get_config().get("ai", {}).get("budget_us", 1000), is_live=self._ai_is_live)
+        self.timers = TimerWheel(self.tick_dt)
+        self.minimap = Minimap()
         self.screens = FolderStorage()
         self.load()
 
         self.player = Player(self, position=pygame.Vector2(100, 128))
         self.player_tilemap = self.tilemaps["cave"]
+        self.tilemap_loader = TilemapLoader(self)
 
         self.current_bg_colour = pygame.Vector3(self.player_tilemap.bg_colour)
         self.target_bg_colour = pygame.Vector3(self.player_tilemap.bg_colour)
@@ -52,6 +84,9 @@ class Game:
         self.inventory_screen = InventoryScreen(self)
         self.screens["inventory"]["main"] = self.inventory_screen
 
+        self.map_screen = MapScreen(self)
+        self.screens["map"]["main"] = self.map_screen
+
         # Initialize text overlay properties
         self.text_overlay = "Sample Text Overlay"
         self.text_overlay_show = True
@@ -61,30 +96,9 @@ class Game:
 
         # Create a higher resolution gradient surface for smoother transitions
         grad_size = 1024  # Increased from 512 for more precision
-        center = grad_size // 2
-
-        radial_grad = pygame.Surface((grad_size, grad_size), pygame.SRCALPHA)
-
-        # Create a smoother vignette using a quadratic falloff
-        for y in range(grad_size):
-            for x in range(grad_size):
-                # Calculate distance from center
-                dx = x - center
-                dy = y - center
-                distance = (dx * dx + dy * dy) ** 0.5
-                max_distance = center
-
-                # Use a quadratic curve for smoother transition
-                # This creates a more gradual fall-off than linear
-                if distance <= max_distance:
-                    norm_dist = distance / max_distance
-                    alpha = (norm_dist * norm_dist)
-                    alpha = max(0, min(1, alpha ** 1.5))
-                    alpha_value = int(alpha * 255)
-
-                    radial_grad.set_at((x, y), (255, 255, 255, alpha_value))
-                else:
-                    radial_grad.set_at((x, y), (255, 255, 255, 0))
+
+        # Quadratic falloff raised to 1.5, i.e. (distance / radius) ** 3, shared from the texture cache
+        radial_grad = textures.radial_gradient(grad_size, exponent=3.0)
 
         # Scale the gradient to fit the screen with some padding to ensure coverage
         self.vignette_mask = pygame.transform.smoothscale(radial_grad, (int(size[0] * 2.2), int(size[1] * 2.2)))
@@ -100,8 +114,17 @@ class Game:
         self.vignette.fill((int(tint.x), int(tint.y), int(tint.z)), special_flags=pygame.BLEND_RGBA_MULT)
 
     def restart(self):
+        for tilemap in self.tilemaps.values():
+            if tilemap.streamer is not None:
+                tilemap.streamer.stop()
+
         self.clock = pygame.time.Clock()
         self.running = True
+        self.accumulator = 0.0
+        self.render_alpha = 1.0
+
+        # Shared clock that every animated tile reads its frame from
+        self.animation_time = 0.0
 
         self.assets = {}
 
@@ -109,11 +132,20 @@ class Game:
 
         self.camera = Camera(self.screen.get_width(), self.screen.get_height())
         self.tilemaps = {}
+        self.world_index = WorldIndex()
+        self.sensors = SensorSystem()
+        self.dynamic_solids = DynamicSolids()
+        self.entities = SpatialHash()
+        self.lod = SimulationLOD(**get_config().get("simulation_lod", {}))
+        self.ai = AIScheduler(get_config().get("ai", {}).get("budget_us", 1000), is_live=self._ai_is_live)
+        self.timers = TimerWheel(self.tick_dt)
+        self.minimap = Minimap()
         self.screens = FolderStorage()
         self.load()
 
         self.player = Player(self, position=pygame.Vector2(100, 128))
         self.player_tilemap = self.tilemaps["cave"]
+        self.tilemap_loader = TilemapLoader(self)
 
         self.current_bg_colour = pygame.Vector3(self.player_tilemap.bg_colour)
         self.target_bg_colour = pygame.Vector3(self.player_tilemap.bg_colour)
@@ -136,6 +168,9 @@ class Game:
         self.inventory_screen = InventoryScreen(self)
         self.screens["inventory"]["main"] = self.inventory_screen
 
+        self.map_screen = MapScreen(self)
+        self.screens["map"]["main"] = self.map_screen
+
         # Initialize text overlay properties
         self.text_overlay = "Sample Text Overlay"
         self.text_overlay_show = True
@@ -173,13 +208,16 @@ class Game:
 
         positions = config.get("tilemap_positions", {})
         
-        self.tilemaps["cave"] = TileMap(self, tile_size=tile_size, pos=positions.get("cave", (0, 0)), rendered=True)
-        self.tilemaps["mossy"] = TileMap(self, tile_size=tile_size, pos=positions.get("mossy", (0, 0)), rendered=False)
+        self.tilemaps["cave"] = TileMap(self, tile_size=tile_size, pos=positions.get("cave", (0, 0)), rendered=True, name="cave")
+        self.tilemaps["mossy"] = TileMap(self, tile_size=tile_size, pos=positions.get("mossy", (0, 0)), rendered=False, name="mossy")
 
         maps = get_config()["tilemaps"]
 
-        for name, tilemaps in self.tilemaps.items():
-            tilemaps.load_map("Game/assets/" + maps[name])
+        # Only the rendered maps are built now; the rest load on demand through TilemapLoader
+        for name, tilemap in self.tilemaps.items():
+            tilemap.load_header("Game/assets/" + maps[name])
+            if tilemap.rendered:
+                tilemap.ensure_loaded()
 
         try:
             cfg = get_config()
@@ -194,9 +232,61 @@ class Game:
                 if len(tilemap.tile_map) == 0:
                     print(f"  WARNING: tile_map for '{name}' is empty")
 
+    def _ai_is_live(self, owner):
+        # Only entities that are registered in the world and not frozen by the LOD get to think
+        return owner in self.entities and getattr(owner, 'lod_tier', 0) != LOD_FROZEN
+
+    def sleep_counts(self):
+        """(asleep, total) physics bodies over the loaded tilemaps."""
+        asleep = total = 0
+        for tilemap in self.tilemaps.values():
+            if tilemap.loaded:
+                a, t = tilemap.sleep_counts()
+                asleep += a
+                total += t
+        return asleep, total
+
+    def _tick(self, dt):
+        """Advance the simulation by one fixed step."""
+        self.timers.advance(dt)
+
+        self.player.prev_pos.update(self.player.pos)
+        for tilemap in self.tilemaps.values():
+            tilemap.snapshot_positions()
+
+        self.tilemap_loader.update(dt)
+
+        for tilemap in self.tilemaps.values():
+            if tilemap.streamer is not None and tilemap.loaded:
+                tilemap.streamer.update(self.camera.view_rect(), self.player.velocity)
+
+        self.sensors.update(self.player)
+
+        self.lod.set_view(self.camera.view_rect())
+        for tilemap in self.tilemaps.values():
+            tilemap.update(dt)
+
+        # Enemies moved at the end of the last tick, everything else just now
+        self.entities.begin()
+        for tilemap in self.tilemaps.values():
+            if tilemap.rendered and tilemap.loaded:
+                tilemap.index_entities(self.entities)
+        self.entities.prune()
+
+        self.player.update(dt)
+        if self.player.tilemap is not None:
+            self.minimap.reveal(self.player.tilemap_name, self.player.tilemap, self.player.rect.center)
+
+        for tilemap in self.tilemaps.values():
+            if tilemap.rendered:
+                tilemap.update_enemies(dt)
+
     def run(self):
         while self.running:
-            dt = self.clock.tick(60) / 1000.0
+            # A long stall (loading, dragging the window) is clamped instead of replayed in full
+            dt = min(self.clock.tick(self.fps_cap) / 1000.0, self.max_frame_time)
+            self.accumulator += dt
+            self.animation_time += dt
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     self.running = False
@@ -219,6 +309,10 @@ class Game:
                             self.inventory_screen.toggle()
                     if event.key == pygame.K_ESCAPE and self.inventory_screen.active:
                         self.inventory_screen.toggle()
+                    if event.key == pygame.K_m and not self.inventory_screen.active:
+                        self.map_screen.toggle()
+                    elif event.key == pygame.K_ESCAPE and self.map_screen.active:
+                        self.map_screen.toggle()
 
             fade_speed = 5.0 * dt
             if self.current_bg_colour.distance_to(self.target_bg_colour) > 0.1:
@@ -234,24 +328,30 @@ class Game:
                     self.current_tint_colour = pygame.Vector3(self.target_tint_colour)
                     self._update_vignette()
 
+            ticks = 0
+            while self.accumulator >= self.tick_dt and ticks < self.max_ticks_per_frame:
+                self._tick(self.tick_dt)
+                self.accumulator -= self.tick_dt
+                ticks += 1
+            # AI thinking is time-sliced per frame, over the simulation time that just passed
+            if ticks:
+                self.ai.update(ticks * self.tick_dt)
+            if ticks == self.max_ticks_per_frame:
+                # Spiral-of-death guard: drop whatever backlog is left rather than catching up on it next frame
+                self.accumulator = min(self.accumulator, self.tick_dt)
+            self.render_alpha = self.accumulator / self.tick_dt
+
             self.screen.fill((int(self.current_bg_colour.x), int(self.current_bg_colour.y), int(self.current_bg_colour.z)))
 
-            self.camera.update(self.player)
+            self.camera.update(self.player, dt)
 
-            for tilemap in self.tilemaps.values():
-                tilemap.update(dt)
-                if tilemap.rendered:
+            visible = {name for name, _ in self.world_index.query_rect(self.camera.view_rect(margin=self.camera.render_margin))}
+
+            for name, tilemap in self.tilemaps.items():
+                if tilemap.rendered and name in visible:
                     for layer in tilemap._layers:
                         tilemap.render(self.screen, self.camera.offset, layer)
 
-            # Update and draw player and enemies to the off-screen surface
-            self.player.update(dt)
-
-            # Update and draw enemies
-            for tilemap in self.tilemaps.values():
-                if tilemap.rendered:
-                    tilemap.enemies.update(dt)
-
             # Draw player, enemies, HUD, then vignette overlay
             self.player.draw(self.screen, self.camera.offset)
 
@@ -260,7 +360,6 @@ class Game:
                 if tilemap.rendered:
                     tilemap.enemies.draw(self.screen, self.camera.offset)
 
-
             self.screen.blit(self.vignette, (0, 0))
 
             # Scale the off-screen buffer to the displayed screen
@@ -0,0 +1,93 @@
+import heapq
+import itertools
+import time
+import weakref
+
+
+class ThinkTask:
+    def __init__(self, owner, name, think, period, now):
+        # Weak so a task never keeps an unloaded entity alive
+        self.owner = weakref.ref(owner)
+        self.name = name
+        self.think = think
+        self.period = period
+        self.last = now
+        self.alive = True
+
+
+class AIScheduler:
+    """
+    Runs AI "think" callbacks at their own rate instead of inline in every update.
+
+    Behaviours register think(owner, elapsed) with a frequency. Tasks with the same frequency
+    are spread across their period so they don't all land on the same frame. Each update runs
+    the due tasks, oldest first, until budget_us microseconds are used up. Whatever is left stays
+    due and goes first next frame. is_live(owner) lets the game skip owners that aren't being
+    simulated (frozen, evicted); their tasks just wait for the next period.
+    """
+
+    def __init__(self, budget_us=1000, is_live=None):
+        self.budget_us = budget_us
+        self.is_live = is_live
+        self.time = 0.0
+        self._queue = []
+        self._seq = itertools.count()
+        self._spread = 0.0
+
+        # name -> {"calls", "total_us", "max_us"}
+        self.stats = {}
+        # The last update: thinks run, microseconds used, thinks left over
+        self.last_update = {"ran": 0, "used_us": 0.0, "backlog": 0}
+
+    def register(self, owner, name, think, hz):
+        period = 1.0 / hz
+        task = ThinkTask(owner, name, think, period, self.time)
+        # Golden-ratio offsets keep the first runs evenly spread however many tasks register
+        self._spread = (self._spread + 0.618034) % 1.0
+        heapq.heappush(self._queue, (self.time + period * self._spread, next(self._seq), task))
+        return task
+
+    def unregister(self, owner):
+        # Dead tasks are dropped when they next come up
+        for _, _, task in self._queue:
+            if task.owner() is owner:
+                task.alive = False
+
+    def update(self, dt):
+        self.time += dt
+        start = time.perf_counter_ns()
+        budget_ns = self.budget_us * 1000
+        ran = 0
+
+        while self._queue and self._queue[0][0] <= self.time:
+            if time.perf_counter_ns() - start >= budget_ns:
+                break
+            _, _, task = heapq.heappop(self._queue)
+            owner = task.owner()
+            if not task.alive or owner is None:
+                continue
+
+            if self.is_live is None or self.is_live(owner):
+                t0 = time.perf_counter_ns()
+                task.think(owner, self.time - task.last)
+                cost_us = (time.perf_counter_ns() - t0) / 1000
+                ran += 1
+
+                stats = self.stats.get(task.name)
+                if stats is None:
+                    stats = self.stats[task.name] = {"calls": 0, "total_us": 0.0, "max_us": 0.0}
+                stats["calls"] += 1
+                stats["total_us"] += cost_us
+                stats["max_us"] = max(stats["max_us"], cost_us)
+            task.last = self.time
+            heapq.heappush(self._queue, (self.time + task.period, next(self._seq), task))
+
+        backlog = 0
+        if self._queue and self._queue[0][0] <= self.time:
+            backlog = sum(1 for due, _, _ in self._queue if due <= self.time)
+        self.last_update = {"ran": ran, "used_us": (time.perf_counter_ns() - start) / 1000, "backlog": backlog}
+
+    def report(self):
+        """(name, calls, average us, max us) per behaviour, most expensive first."""
+        rows = [(name, s["calls"], s["total_us"] / s["calls"], s["max_us"]) for name, s in self.stats.items() if s["calls"]]
+        return sorted(rows, key=lambda row: row[1] * row[2], reverse=True)
@@ -7,6 +7,7 @@ class Camera:
         self.width = width
         self.height = height
         self.smoothing_factor = 0.1  # Lower values = smoother but more lag
+        self.render_margin = 128  # Extra pixels around the view for tiles that overhang their cell
 
     def apply(self, entity):
         return pygame.Rect(
@@ -16,15 +17,32 @@ class Camera:
             entity.rect.height
         )
 
-    def update(self, target):
+    def view_rect(self, margin=0):
+        return pygame.Rect(
+            int(self.offset.x) - margin,
+            int(self.offset.y) - margin,
+            self.width + margin * 2,
+            self.height + margin * 2
+        )
+
+    def update(self, target, dt=1 / 60):
+        # Follow where the target is drawn, which may be between two simulation ticks
+        if hasattr(target, 'interpolated_pos'):
+            pos = target.interpolated_pos()
+            centerx = pos.x + target.rect.width / 2
+            centery = pos.y + target.rect.height / 2
+        else:
+            centerx, centery = target.rect.center
+
         # Calculate target position
-        target_x = target.rect.centerx - (self.width // 2)
-        target_y = target.rect.centery - (self.height // 2)
+        target_x = centerx - (self.width // 2)
+        target_y = centery - (self.height // 2)
 
         # Apply smoothing to reduce jittering
         self.target_offset.x = target_x
         self.target_offset.y = target_y
 
-        # Smooth interpolation towards target
-        self.offset.x += (self.target_offset.x - self.offset.x) * self.smoothing_factor
-        self.offset.y += (self.target_offset.y - self.offset.y) * self.smoothing_factor
+        # Smooth interpolation towards target; smoothing_factor is per 1/60 s, so the lag is the same at any frame rate
+        factor = 1 - (1 - self.smoothing_factor) ** (dt * 60)
+        self.offset.x += (self.target_offset.x - self.offset.x) * factor
+        self.offset.y += (self.target_offset.y - self.offset.y) * factor
@@ -0,0 +1,234 @@
+import json
+import os
+import queue
+import sys
+import threading
+
+MANIFEST_SUFFIX = ".manifest.json"
+DEFAULT_CHUNK_SIZE = 16
+
+
+def chunk_file_name(cx, cy):
+    return f"chunk_{cx}_{cy}.json"
+
+
+def write_chunked_level(level_path, out_dir, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Split a level JSON into a manifest plus one file of expanded tiles and entities per chunk."""
+    from Game.utils.tilemaps import TileMap
+
+    with open(level_path, 'r') as f:
+        data = json.load(f)
+
+    # Reuse the loader's expansion so chunk files hold exactly what load_map would build
+    shell = TileMap(None)
+    shell._apply_header(data)
+
+    chunks = {}
+    sensors = []
+    platforms = []
+    for layer in data['layers']:
+        if layer['type'] == 'tilelayer':
+            shell._expand_tile_layer(layer, data['environment'])
+        elif layer['type'] == 'breakables':
+            shell._add_breakables(layer['data'], data['environment'])
+        elif layer['type'] in ("enemies", "npcs", "chests"):
+            for entry in layer['data']:
+                key = (int(float(entry['x'])) // chunk_size, int(float(entry['y'])) // chunk_size)
+                chunk = chunks.setdefault(key, {"tiles": [], "entities": {}})
+                chunk["entities"].setdefault(layer['type'], []).append(entry)
+        elif layer['type'] == 'sensor_layer':
+            sensors.extend(layer['data'])
+        elif layer['type'] == 'platforms':
+            platforms.extend(layer['data'])
+
+    for (x, y), tile in shell.tile_map.items():
+        key = (x // chunk_size, y // chunk_size)
+        chunks.setdefault(key, {"tiles": [], "entities": {}})["tiles"].append(tile)
+
+    os.makedirs(out_dir, exist_ok=True)
+    for (cx, cy), chunk in chunks.items():
+        with open(os.path.join(out_dir, chunk_file_name(cx, cy)), 'w') as f:
+            json.dump(chunk, f)
+
+    xs = [x for x, _ in shell.tile_map] or [0]
+    ys = [y for _, y in shell.tile_map] or [0]
+    manifest = {
+        "width": data['width'],
+        "height": data['height'],
+        "tile_size": data['tile_size'],
+        # The shell already fell back to the TileMap defaults for levels without colours
+        "bg_colour": shell.bg_colour,
+        "tint_colour": shell.tint_colour,
+        "environment": data['environment'],
+        "z_layers": shell._layers,
+        "chunk_size": chunk_size,
+        "extent": [min(xs), min(ys), max(xs) + 1, max(ys) + 1],
+        "sensors": sensors,
+        "platforms": platforms,
+        "chunks": {f"{cx},{cy}": chunk_file_name(cx, cy) for cx, cy in chunks},
+    }
+    name = os.path.splitext(os.path.basename(level_path))[0]
+    manifest_path = os.path.join(out_dir, name + MANIFEST_SUFFIX)
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest_path
+
+
+class ChunkStreamer:
+    """
+    Keeps only the chunks around the camera resident in a TileMap.
+
+    Chunk files are read and parsed on a background thread, but tiles and entities are only
+    installed or evicted from update(), so collision, rendering and entity updates in the
+    rest of the frame all see the same resident set.
+    """
+
+    def __init__(self, tilemap, manifest, folder, chunk_radius=1, evict_radius=2, prefetch_chunks=1):
+        self.tilemap = tilemap
+        self.folder = folder
+        self.chunk_size = manifest.get('chunk_size', DEFAULT_CHUNK_SIZE)
+        self.chunk_files = {}
+        for key, file_name in manifest['chunks'].items():
+            cx, cy = key.split(",")
+            self.chunk_files[(int(cx), int(cy))] = file_name
+
+        self.chunk_radius = chunk_radius
+        self.prefetch_chunks = prefetch_chunks
+        # Prefetched chunks must not be evicted the moment they arrive
+        self.evict_radius = max(evict_radius, chunk_radius + prefetch_chunks)
+
+        self.resident = {}
+        self.dormant = {}
+        self.spawned = set()
+        self._pending = set()
+
+        self._requests = queue.Queue()
+        self._loaded = queue.Queue()
+        self._thread = threading.Thread(target=self._worker, daemon=True)
+        self._thread.start()
+
+    def _read_chunk(self, key):
+        try:
+            with open(os.path.join(self.folder, self.chunk_files[key]), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _worker(self):
+        while True:
+            key = self._requests.get()
+            if key is None:
+                return
+            self._loaded.put((key, self._read_chunk(key)))
+
+    def stop(self):
+        self._requests.put(None)
+
+    def _view_chunks(self, view_rect):
+        ts = self.tilemap.tile_size
+        ox, oy = int(self.tilemap.pos.x), int(self.tilemap.pos.y)
+        size = self.chunk_size
+        left = (view_rect.left // ts - ox) // size
+        top = (view_rect.top // ts - oy) // size
+        right = ((view_rect.right - 1) // ts - ox) // size
+        bottom = ((view_rect.bottom - 1) // ts - oy) // size
+        return left, top, right, bottom
+
+    def chunk_for_px(self, px, py):
+        ts = self.tilemap.tile_size
+        return ((int(px) // ts - int(self.tilemap.pos.x)) // self.chunk_size,
+                (int(py) // ts - int(self.tilemap.pos.y)) // self.chunk_size)
+
+    def is_resident(self, px, py):
+        return self.chunk_for_px(px, py) in self.resident
+
+    def update(self, view_rect, velocity=(0, 0)):
+        left, top, right, bottom = self._view_chunks(view_rect)
+
+        # Chunks on screen can't wait for the worker
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                key = (cx, cy)
+                if key in self.chunk_files and key not in self.resident:
+                    self._pending.discard(key)
+                    self._install(key, self._read_chunk(key))
+
+        while True:
+            try:
+                key, data = self._loaded.get_nowait()
+            except queue.Empty:
+                break
+            if key in self._pending:
+                self._pending.discard(key)
+                self._install(key, data)
+
+        r = self.chunk_radius
+        want_left, want_top, want_right, want_bottom = left - r, top - r, right + r, bottom + r
+        if velocity[0] > 0:
+            want_right += self.prefetch_chunks
+        elif velocity[0] < 0:
+            want_left -= self.prefetch_chunks
+        if velocity[1] > 0:
+            want_bottom += self.prefetch_chunks
+        elif velocity[1] < 0:
+            want_top -= self.prefetch_chunks
+
+        for cx in range(want_left, want_right + 1):
+            for cy in range(want_top, want_bottom + 1):
+                key = (cx, cy)
+                if key in self.chunk_files and key not in self.resident and key not in self._pending:
+                    self._pending.add(key)
+                    self._requests.put(key)
+
+        for key in list(self.resident):
+            cx, cy = key
+            distance = max(left - cx, cx - right, top - cy, cy - bottom, 0)
+            if distance > self.evict_radius:
+                self._evict(key)
+
+    def _install(self, key, data):
+        if data is None:
+            return
+        tilemap = self.tilemap
+        ox, oy = int(tilemap.pos.x), int(tilemap.pos.y)
+
+        tiles = []
+        for tile in data.get('tiles', []):
+            if 'breakable' in tile and tuple(tile['breakable']) in tilemap.broken:
+                continue
+            tile = dict(tile)
+            tile['x'] += ox
+            tile['y'] += oy
+            tiles.append(tile)
+        tilemap.set_tiles(tiles)
+        self.resident[key] = [(tile['x'], tile['y']) for tile in tiles]
+
+        if key in self.dormant:
+            for group, sprite_key, sprite in self.dormant.pop(key):
+                group.insert(sprite_key, sprite)
+        elif key not in self.spawned:
+            for layer_type, entries in data.get('entities', {}).items():
+                tilemap._spawn_entities(layer_type, entries)
+            self.spawned.add(key)
+
+    def evict_all(self):
+        for key in list(self.resident):
+            self._evict(key)
+        self._pending.clear()
+
+    def _evict(self, key):
+        tilemap = self.tilemap
+        tilemap.remove_tiles(self.resident.pop(key), evicted=True)
+
+        parked = []
+        for group in (tilemap.enemies, tilemap.npcs, tilemap.chests):
+            for sprite in group.sprites():
+                if self.chunk_for_px(*sprite.rect.center) == key:
+                    parked.append((group, group.pop(sprite), sprite))
+        if parked:
+            self.dormant[key] = parked
+
+
+if __name__ == "__main__":
+    # python -m Game.utils.chunks Game/assets/level/cave.json Game/assets/level/cave_chunks
+    print(write_chunked_level(sys.argv[1], sys.argv[2]))
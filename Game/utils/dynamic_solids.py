@@ -0,0 +1,56 @@
+class DynamicSolids:
+    """
+    Spatial hash of kinematic solids (moving platforms, elevators, crushers).
+
+    Bodies still collide against the static tile grid first; this overlay only hands them the
+    few moving solids in the cells around them, so adding platforms doesn't slow down bodies
+    that are nowhere near one.
+    """
+
+    def __init__(self, cell_size=128):
+        self.cell_size = cell_size
+        self._cells = {}
+        self._bodies = {}
+
+    def _cells_for(self, rect):
+        cs = self.cell_size
+        for cx in range(rect.left // cs, (rect.right - 1) // cs + 1):
+            for cy in range(rect.top // cs, (rect.bottom - 1) // cs + 1):
+                yield cx, cy
+
+    def add(self, body):
+        cells = list(self._cells_for(body.rect))
+        self._bodies[id(body)] = cells
+        for cell in cells:
+            self._cells.setdefault(cell, []).append(body)
+
+    def remove(self, body):
+        for cell in self._bodies.pop(id(body), ()):
+            bucket = self._cells.get(cell)
+            if bucket is not None and body in bucket:
+                bucket.remove(body)
+                if not bucket:
+                    del self._cells[cell]
+
+    def move(self, body):
+        """Rebucket a body after it moved; cheap when it stayed within the same cells."""
+        cells = list(self._cells_for(body.rect))
+        if cells != self._bodies.get(id(body)):
+            self.remove(body)
+            self.add(body)
+
+    def query_rect(self, rect):
+        found = []
+        for cell in self._cells_for(rect):
+            for body in self._cells.get(cell, ()):
+                if body not in found and body.rect.colliderect(rect):
+                    found.append(body)
+        return found
+
+    def support_for(self, rect):
+        """The solid a rect is standing on, i.e. whose top touches the rect's bottom, or None."""
+        probe = rect.move(0, 1)
+        for body in self.query_rect(probe):
+            if body.rect.top == rect.bottom and body.rect.right > rect.left and body.rect.left < rect.right:
+                return body
+        return None
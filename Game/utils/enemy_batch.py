@@ -0,0 +1,218 @@
+import pygame
+
+from Game.Sprites.PhysicsSprite import COLLIDE_TOP, COLLIDE_BOTTOM, COLLIDE_LEFT, COLLIDE_RIGHT
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, enemies then update one by one
+    np = None
+
+
+class CrawlerBatch:
+    """
+    Struct-of-arrays update for a tilemap's GroundCrawlers.
+
+    Each tick the crawlers' state (position, velocity, direction) is copied into arrays,
+    gravity, movement against the tile grid and the wall / ledge flips run as whole-array
+    passes, and the results are written back. The crawler objects stay the interface the rest
+    of the game uses (rect, pos, take_damage, draw); their hurt / immunity timers live on
+    game.timers.
+
+    Only plain cases are batched: bodies no bigger than a tile, moving less than a tile per
+    tick, away from one-way / slope tiles and moving platforms. Everything else is returned to
+    the caller to update the usual way, so both paths stay interchangeable.
+    """
+
+    def __init__(self, tilemap):
+        self.tilemap = tilemap
+        self._grid_version = None
+        self._solid = None  # [y, x] full solid tiles
+        self._special = None  # [y, x] one-way and slope tiles
+        self._origin = (0, 0)
+
+    def _build_grids(self):
+        tilemap = self.tilemap
+        if self._grid_version == tilemap.tile_version:
+            return
+        self._grid_version = tilemap.tile_version
+
+        cells = tilemap._solid_cells
+        if not cells:
+            self._solid = np.zeros((1, 1), dtype=bool)
+            self._special = np.zeros((1, 1), dtype=bool)
+            self._origin = (0, 0)
+            return
+
+        xs = [x for x, _ in cells]
+        ys = [y for _, y in cells]
+        x0, y0 = min(xs), min(ys)
+        shape = (max(ys) - y0 + 1, max(xs) - x0 + 1)
+        self._solid = np.zeros(shape, dtype=bool)
+        self._special = np.zeros(shape, dtype=bool)
+        for x, y in cells:
+            if tilemap.get_collision_shape(tilemap.tile_map[(x, y)]) is None:
+                self._solid[y - y0, x - x0] = True
+            else:
+                self._special[y - y0, x - x0] = True
+        self._origin = (x0, y0)
+
+    def _lookup(self, grid, gx, gy):
+        # Grid values at world cells (gx, gy); anything outside the grid is empty
+        x0, y0 = self._origin
+        h, w = grid.shape
+        lx = gx - x0
+        ly = gy - y0
+        inside = (lx >= 0) & (lx < w) & (ly >= 0) & (ly < h)
+        return grid[np.clip(ly, 0, h - 1), np.clip(lx, 0, w - 1)] & inside
+
+    def _walkable(self, gx, gy):
+        # Same rule as the span table: a solid cell with open space above it
+        return self._lookup(self._solid, gx, gy) & ~self._lookup(self._solid, gx, gy - 1)
+
+    def _near_platforms(self, x, y, w, h):
+        near = np.zeros(len(x), dtype=bool)
+        for platform in self.tilemap.platforms.sprites():
+            area = platform.rect.inflate(64, 64)
+            near |= (x < area.right) & (x + w > area.left) & (y < area.bottom) & (y + h > area.top)
+        return near
+
+    def update(self, crawlers, dt):
+        """
+        Update the crawlers that can be batched, by a shared dt or one dt per crawler.
+        Returns (crawler, dt) for the ones left for a per-object update.
+        """
+        n = len(crawlers)
+        if np is None or not crawlers:
+            return list(zip(crawlers, [dt] * n if isinstance(dt, (int, float)) else dt))
+        self._build_grids()
+        ts = self.tilemap.tile_size
+        dt = np.broadcast_to(np.asarray(dt, dtype=float), (n,))
+
+        # pos can carry a fraction (the flip nudge) that rect doesn't; moves start from pos, collisions from rect
+        pos_x = np.fromiter((c.pos.x for c in crawlers), float, n)
+        pos_y = np.fromiter((c.pos.y for c in crawlers), float, n)
+        x = np.fromiter((c.rect.x for c in crawlers), float, n)
+        y = np.fromiter((c.rect.y for c in crawlers), float, n)
+        w = np.fromiter((c.rect.width for c in crawlers), int, n)
+        h = np.fromiter((c.rect.height for c in crawlers), int, n)
+        vy = np.fromiter((c.velocity.y for c in crawlers), float, n)
+        speed = np.fromiter((c.speed for c in crawlers), float, n)
+        direction = np.fromiter((c.direction for c in crawlers), int, n)
+        gravity = np.fromiter((c.gravity for c in crawlers), float, n)
+        max_fall = np.fromiter((c.max_fall_speed for c in crawlers), float, n)
+        last_flip = np.fromiter((c.last_flip_ts for c in crawlers), float, n)
+        cooldown = np.fromiter((c.flip_cooldown_ms for c in crawlers), float, n)
+        nudge = np.fromiter((c.flip_nudge_px for c in crawlers), float, n)
+
+        # GroundCrawler.update walks at speed; PhysicsSprite.update applies gravity
+        vx = speed * direction
+        vy = np.minimum(vy + gravity * dt, max_fall)
+        dx = vx * dt
+        dy = vy * dt
+
+        # Pick out the crawlers the array pass can't handle exactly
+        col0 = np.floor_divide(x, ts).astype(int)
+        row0 = np.floor_divide(y, ts).astype(int)
+        offsets = np.arange(-1, 3)
+        special = self._lookup(self._special, col0[:, None, None] + offsets[None, None, :], row0[:, None, None] + offsets[None, :, None]).any(axis=(1, 2))
+        batched = (w <= ts) & (h <= ts) & (np.abs(dx) < ts) & (np.abs(dy) < ts) & ~special & ~self._near_platforms(x, y, w, h)
+
+        # Horizontal move: the leading edge can only reach the next column over in one tick
+        hit_left = np.zeros(n, dtype=bool)
+        hit_right = np.zeros(n, dtype=bool)
+        moving = batched & (np.abs(dx) > 0.01)
+        target = np.rint(pos_x + dx)
+        top_row = np.floor_divide(y, ts).astype(int)
+        bottom_row = np.floor_divide(y + h - 1, ts).astype(int)
+
+        def solid_in_column(col):
+            return self._lookup(self._solid, col, top_row) | self._lookup(self._solid, col, bottom_row)
+
+        right = moving & (dx > 0)
+        near_col = np.floor_divide(x + w - 1, ts).astype(int)
+        far_col = np.floor_divide(target + w - 1, ts).astype(int)
+        stop = np.where(solid_in_column(far_col), far_col * ts - w, np.inf)
+        stop = np.where(solid_in_column(near_col), near_col * ts - w, stop)
+        hit_right = right & np.isfinite(stop)
+        x = np.where(hit_right, stop, np.where(right, target, x))
+
+        left = moving & (dx < 0)
+        near_col = np.floor_divide(x, ts).astype(int)
+        far_col = np.floor_divide(target, ts).astype(int)
+        stop = np.where(solid_in_column(far_col), (far_col + 1) * ts, -np.inf)
+        stop = np.where(solid_in_column(near_col), (near_col + 1) * ts, stop)
+        hit_left = left & np.isfinite(stop)
+        x = np.where(hit_left, stop, np.where(left, target, x))
+        vx = np.where(hit_left | hit_right, 0.0, vx)
+
+        # Vertical move, against the columns the body covers after moving horizontally
+        hit_top = np.zeros(n, dtype=bool)
+        hit_bottom = np.zeros(n, dtype=bool)
+        moving = batched & (np.abs(dy) > 0.01)
+        target = np.rint(pos_y + dy)
+        left_col = np.floor_divide(x, ts).astype(int)
+        right_col = np.floor_divide(x + w - 1, ts).astype(int)
+
+        def solid_in_row(row):
+            return self._lookup(self._solid, left_col, row) | self._lookup(self._solid, right_col, row)
+
+        down = moving & (dy > 0)
+        near_row = np.floor_divide(y + h - 1, ts).astype(int)
+        far_row = np.floor_divide(target + h - 1, ts).astype(int)
+        stop = np.where(solid_in_row(far_row), far_row * ts - h, np.inf)
+        stop = np.where(solid_in_row(near_row), near_row * ts - h, stop)
+        hit_bottom = down & np.isfinite(stop)
+        y = np.where(hit_bottom, stop, np.where(down, target, y))
+
+        up = moving & (dy < 0)
+        near_row = np.floor_divide(y, ts).astype(int)
+        far_row = np.floor_divide(target, ts).astype(int)
+        stop = np.where(solid_in_row(far_row), (far_row + 1) * ts, -np.inf)
+        stop = np.where(solid_in_row(near_row), (near_row + 1) * ts, stop)
+        hit_top = up & np.isfinite(stop)
+        y = np.where(hit_top, stop, np.where(up, target, y))
+        vy = np.where((hit_bottom & (vy > 0)) | (hit_top & (vy < 0)), 0.0, vy)
+
+        # GroundCrawler._do_flip, first on walls, then at ledges, sharing one cooldown
+        now = pygame.time.get_ticks()
+        pos_x = x.copy()
+
+        def flip(mask):
+            mask = mask & (now - last_flip >= cooldown)
+            flipped_direction = np.where(mask, -direction, direction)
+            nudged = np.where(mask, x + flipped_direction * nudge, pos_x)
+            return mask, flipped_direction, nudged, np.where(mask, np.trunc(nudged), x)
+
+        flipped, direction, pos_x, x = flip(batched & (hit_left | hit_right))
+        last_flip = np.where(flipped, now, last_flip)
+
+        centre = x.astype(int) + w // 2
+        foot_col = np.floor_divide(centre, ts)
+        foot_row = np.floor_divide(y.astype(int) + h + 1, ts)
+        standing = self._walkable(foot_col, foot_row)
+        ahead_col = foot_col + direction
+        at_edge = np.where(direction >= 0, (foot_col + 1) * ts - centre - w / 2 <= 0, centre - foot_col * ts - w / 2 <= 0)
+        ledge = standing & at_edge & ~self._walkable(ahead_col, foot_row)
+        flipped, direction, pos_x, x = flip(batched & ledge)
+        last_flip = np.where(flipped, now, last_flip)
+        vx = np.where(batched, speed * direction, vx)
+
+        # Write the results back onto the crawler objects
+        collision_bits = (hit_top * COLLIDE_TOP) | (hit_bottom * COLLIDE_BOTTOM) | (hit_left * COLLIDE_LEFT) | (hit_right * COLLIDE_RIGHT)
+        rest = []
+        columns = zip(batched.tolist(), dt.tolist(), pos_x.tolist(), x.tolist(), y.tolist(), vx.tolist(), vy.tolist(), direction.tolist(),
+                      last_flip.tolist(), collision_bits.tolist())
+        for crawler, (ok, cdt, cpx, cx, cy, cvx, cvy, cdir, cflip, cbits) in zip(crawlers, columns):
+            if not ok:
+                rest.append((crawler, cdt))
+                continue
+            crawler.pos.x = cpx
+            crawler.pos.y = cy
+            crawler.rect.x = int(cx)
+            crawler.rect.y = int(cy)
+            crawler.velocity.x = cvx
+            crawler.velocity.y = cvy
+            crawler.direction = cdir
+            crawler.last_flip_ts = cflip
+            crawler.collisions.bits = cbits
+        return rest
@@ -34,20 +34,35 @@ class Hud:
 
         self.text_overlay_box = TextOverlay(game)
 
+        # Hearts follow max health as it changes instead of checking it every frame
+        self._ensure_hearts_count(int(self.player.stats.current_max_health))
+        self.player.stats.subscribe(self._on_stats_changed)
+
+    def _on_stats_changed(self, changes):
+        if "current_max_health" in changes:
+            self._ensure_hearts_count(int(changes["current_max_health"][1]))
+
     def _ensure_hearts_count(self, count):
         """Ensure the hearts_state list has the correct number of entries."""
         while len(self.hearts_state) < count:
-            self.hearts_state.append({
+            heart_data = {
                 "animation_state": ("full", 0),
-                "shine_timer": random.uniform(0, self.shine_interval)
-            })
+                "shine_ready": False,
+            }
+            self._schedule_shine(heart_data, random.uniform(0, self.shine_interval))
+            self.hearts_state.append(heart_data)
         if len(self.hearts_state) > count:
+            for heart_data in self.hearts_state[count:]:
+                heart_data["shine_timer"].cancel()
             self.hearts_state = self.hearts_state[:count]
 
-    def update(self, dt):
-        current_max = int(self.player.attributes["current_max_health"])
-        self._ensure_hearts_count(current_max)
+    def _schedule_shine(self, heart_data, delay):
+        # The heart shines the next time it is full once the timer has run out
+        def ready():
+            heart_data["shine_ready"] = True
+        heart_data["shine_timer"] = self.game.timers.schedule(delay, ready)
 
+    def update(self, dt):
         current_health = self.player.attributes["health"]
 
         # Handle death - set can_restart flag when fadeout is complete
@@ -65,11 +80,10 @@ class Hud:
 
         for i, heart_data in enumerate(self.hearts_state):
             # Shine logic for full hearts
-            if i + 1 <= current_health:
-                heart_data["shine_timer"] -= dt
-                if heart_data["shine_timer"] <= 0 and heart_data["animation_state"][0] == "full":
-                    heart_data["animation_state"] = ("shine", 0)
-                    heart_data["shine_timer"] = self.shine_interval + random.uniform(-0.5, 0.5)
+            if i + 1 <= current_health and heart_data["shine_ready"] and heart_data["animation_state"][0] == "full":
+                heart_data["animation_state"] = ("shine", 0)
+                heart_data["shine_ready"] = False
+                self._schedule_shine(heart_data, self.shine_interval + random.uniform(-0.5, 0.5))
 
             # Advance animations
             anim_type, frames = heart_data["animation_state"]
@@ -107,7 +121,7 @@ class Hud:
                 screen.blit(restart_surface, restart_rect)
 
     def draw_hud(self, screen):
-        current_max = int(self.player.attributes["current_max_health"])
+        current_max = int(self.player.stats.current_max_health)
         current_health = self.player.attributes["health"]
 
         # Scale heart size based on max health to fit in a reasonable area
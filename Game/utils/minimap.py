@@ -0,0 +1,131 @@
+import pygame
+
+MAP_CHUNK_SIZE = 16  # cells per side of an explored bitmask chunk (256 bits per int)
+
+FLOOR_COLOUR = (40, 40, 40, 170)
+SOLID_COLOUR = (200, 200, 200, 255)
+DARK_COLOUR = (90, 90, 90, 255)
+
+
+class Minimap:
+    """
+    Per-tilemap map textures plus what the player has explored of them.
+
+    Each map is baked once at load into a small texture (cell_px pixels per tile) and patched
+    cell by cell when tiles change. Explored cells are tracked as per-chunk bitmasks, and as they
+    are revealed the matching texture cells are copied onto a "revealed" surface, so drawing the
+    map is one blit per tilemap however large the world is.
+    """
+
+    def __init__(self, cell_px=3, reveal_radius=8):
+        self.cell_px = cell_px
+        self.reveal_radius = reveal_radius
+
+        # name -> {"origin": (gx, gy), "texture": Surface, "revealed": Surface}
+        self.maps = {}
+        # name -> {(cx, cy): bitmask}
+        self.explored = {}
+        self._last_cell = None
+
+    def _cell_colour(self, tilemap, x, y):
+        tile = tilemap.tile_map.get((x, y))
+        if tile is None:
+            return FLOOR_COLOUR
+        if 'solid' in tile.get('properties', []):
+            return SOLID_COLOUR
+        if tilemap._is_dark(x, y):
+            return DARK_COLOUR
+        return FLOOR_COLOUR
+
+    def bake(self, name, tilemap):
+        ts = tilemap.tile_size
+        extent = tilemap.extent
+        if ts <= 0 or extent.width <= 0 or extent.height <= 0:
+            return
+
+        left, top = extent.left // ts, extent.top // ts
+        width = (extent.right - 1) // ts - left + 1
+        height = (extent.bottom - 1) // ts - top + 1
+        cp = self.cell_px
+
+        texture = pygame.Surface((width * cp, height * cp), pygame.SRCALPHA)
+        texture.fill(FLOOR_COLOUR)
+        for (x, y) in tilemap.tile_map:
+            colour = self._cell_colour(tilemap, x, y)
+            if colour != FLOOR_COLOUR:
+                texture.fill(colour, ((x - left) * cp, (y - top) * cp, cp, cp))
+
+        entry = {"origin": (left, top), "texture": texture, "revealed": pygame.Surface(texture.get_size(), pygame.SRCALPHA)}
+        self.maps[name] = entry
+
+        # Re-apply what was already explored onto the new texture
+        for (cx, cy), bits in self.explored.get(name, {}).items():
+            for i in range(MAP_CHUNK_SIZE * MAP_CHUNK_SIZE):
+                if bits >> i & 1:
+                    self._copy_cell(entry, cx * MAP_CHUNK_SIZE + i % MAP_CHUNK_SIZE, cy * MAP_CHUNK_SIZE + i // MAP_CHUNK_SIZE)
+
+    def _inside(self, entry, x, y):
+        left, top = entry["origin"]
+        cp = self.cell_px
+        w, h = entry["texture"].get_size()
+        return 0 <= (x - left) * cp < w and 0 <= (y - top) * cp < h
+
+    def patch(self, name, tilemap, cells):
+        """Repaint changed cells; a cell outside the baked texture means the map grew, so rebake it."""
+        entry = self.maps.get(name)
+        if entry is None or any(not self._inside(entry, x, y) for x, y in cells):
+            self.bake(name, tilemap)
+            return
+
+        left, top = entry["origin"]
+        cp = self.cell_px
+        for x, y in cells:
+            entry["texture"].fill(self._cell_colour(tilemap, x, y), ((x - left) * cp, (y - top) * cp, cp, cp))
+            if self.is_explored(name, x, y):
+                self._copy_cell(entry, x, y)
+
+    def _copy_cell(self, entry, x, y):
+        if not self._inside(entry, x, y):
+            return
+        left, top = entry["origin"]
+        cp = self.cell_px
+        area = pygame.Rect((x - left) * cp, (y - top) * cp, cp, cp)
+        entry["revealed"].fill((0, 0, 0, 0), area)
+        entry["revealed"].blit(entry["texture"], area, area)
+
+    def is_explored(self, name, x, y):
+        bits = self.explored.get(name, {}).get((x // MAP_CHUNK_SIZE, y // MAP_CHUNK_SIZE), 0)
+        return bool(bits >> ((y % MAP_CHUNK_SIZE) * MAP_CHUNK_SIZE + x % MAP_CHUNK_SIZE) & 1)
+
+    def reveal(self, name, tilemap, pos):
+        """Mark the cells around pos (pixels) as explored. Only does work when the player changes cell."""
+        ts = tilemap.tile_size
+        if ts <= 0:
+            return
+        gx, gy = int(pos[0]) // ts, int(pos[1]) // ts
+        if (name, gx, gy) == self._last_cell:
+            return
+        self._last_cell = (name, gx, gy)
+
+        entry = self.maps.get(name)
+        chunks = self.explored.setdefault(name, {})
+        r = self.reveal_radius
+        for y in range(gy - r, gy + r + 1):
+            for x in range(gx - r, gx + r + 1):
+                if (x - gx) ** 2 + (y - gy) ** 2 > r * r:
+                    continue
+                key = (x // MAP_CHUNK_SIZE, y // MAP_CHUNK_SIZE)
+                bit = 1 << ((y % MAP_CHUNK_SIZE) * MAP_CHUNK_SIZE + x % MAP_CHUNK_SIZE)
+                bits = chunks.get(key, 0)
+                if bits & bit:
+                    continue
+                chunks[key] = bits | bit
+                if entry is not None:
+                    self._copy_cell(entry, x, y)
+
+    def draw(self, surface, center_grid, center_px):
+        """Blit every revealed map so that grid cell center_grid lands on center_px."""
+        cp = self.cell_px
+        for entry in self.maps.values():
+            left, top = entry["origin"]
+            surface.blit(entry["revealed"], (center_px[0] + (left - center_grid[0]) * cp, center_px[1] + (top - center_grid[1]) * cp))
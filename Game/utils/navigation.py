@@ -0,0 +1,187 @@
+import heapq
+import math
+
+JUMP_PENALTY = 0.25  # seconds added to jump links so walking and dropping are preferred
+
+
+class NavGraph:
+    """
+    Platform graph for ground AI, built from a TileMap's walkable spans.
+
+    Nodes are spans as (y, left, right) in grid cells. Links are "walk" (stepping off an edge
+    onto the row below), "drop" (falling further) and "jump" (an arc within the jump height and
+    reach the physics constants allow), each costed as an estimate of travel time in seconds.
+    The graph and its path cache are rebuilt lazily once the tilemap's tile_version moves on.
+    """
+
+    def __init__(self, tilemap, gravity=1200, jump_velocity=-500, speed=200, max_drop_tiles=12):
+        self.tilemap = tilemap
+        self.gravity = gravity
+        self.jump_speed = abs(jump_velocity)
+        self.speed = speed
+        self.max_drop_tiles = max_drop_tiles
+
+        self.version = None
+        self.edges = {}
+        self._paths = {}
+
+    def ensure_current(self):
+        if self.version != self.tilemap.tile_version:
+            self.build()
+
+    def build(self):
+        tilemap = self.tilemap
+        self.version = tilemap.tile_version
+        self._paths = {}
+
+        rows = {}
+        for span in tilemap.iter_spans():
+            rows.setdefault(span[0], []).append(span)
+
+        ts = tilemap.tile_size
+        jump_height = self.jump_speed ** 2 / (2 * self.gravity)
+        up_rows = int(jump_height // ts) if ts else 0
+
+        self.edges = {}
+        for row in rows.values():
+            for span in row:
+                links = {}
+                for y in range(span[0] - up_rows, span[0] + self.max_drop_tiles + 1):
+                    for other in rows.get(y, ()):
+                        if other == span:
+                            continue
+                        link = self._fall_link(span, other) or self._jump_link(span, other, jump_height)
+                        if link is not None:
+                            links[other] = link
+                self.edges[span] = [(other, kind, cost) for other, (kind, cost) in links.items()]
+
+    def _fall_link(self, a, b):
+        ya, la, ra = a
+        yb, lb, rb = b
+        if yb <= ya:
+            return None
+
+        ts = self.tilemap.tile_size
+        fall_time = math.sqrt(2 * (yb - ya) * ts / self.gravity)
+        reach = self.speed * fall_time
+
+        for edge, direction in ((ra + 1, 1), (la - 1, -1)):
+            start_x = (edge + 0.5) * ts
+            if direction > 0:
+                if rb < edge or lb * ts > start_x + reach:
+                    continue
+                land_x = max((lb + 0.5) * ts, start_x)
+            else:
+                if lb > edge or (rb + 1) * ts < start_x - reach:
+                    continue
+                land_x = min((rb + 0.5) * ts, start_x)
+
+            start = (start_x, ya * ts - ts / 2)
+            land = (land_x, yb * ts - ts / 2)
+            if not self.tilemap.line_of_sight(start, land):
+                continue
+
+            kind = "walk" if yb == ya + 1 and lb <= edge <= rb else "drop"
+            return kind, abs(land_x - start_x) / self.speed + fall_time
+        return None
+
+    def _jump_link(self, a, b, jump_height):
+        ya, la, ra = a
+        yb, lb, rb = b
+        ts = self.tilemap.tile_size
+
+        # Take off from the end of a nearest b and land on the end of b nearest a
+        if ra < lb:
+            takeoff, landing = ra, lb
+        elif rb < la:
+            takeoff, landing = la, rb
+        elif yb < ya and la < lb:
+            takeoff, landing = lb - 1, lb
+        elif yb < ya and ra > rb:
+            takeoff, landing = rb + 1, rb
+        else:
+            return None
+
+        rise = (ya - yb) * ts
+        apex_y = min(ya, yb) * ts - ts / 2 - 1
+        if ya * ts - ts / 2 - apex_y > jump_height:
+            return None
+
+        air_time = (self.jump_speed + math.sqrt(max(0, self.jump_speed ** 2 - 2 * self.gravity * rise))) / self.gravity
+        start = ((takeoff + 0.5) * ts, ya * ts - ts / 2)
+        land = ((landing + 0.5) * ts, yb * ts - ts / 2)
+        if abs(land[0] - start[0]) > self.speed * air_time:
+            return None
+
+        # Approximate the arc as straight up, across, and down onto the landing spot
+        apex_start = (start[0], apex_y)
+        apex_land = (land[0], apex_y)
+        los = self.tilemap.line_of_sight
+        if not (los(start, apex_start) and los(apex_start, apex_land) and los(apex_land, land)):
+            return None
+
+        return "jump", air_time + JUMP_PENALTY
+
+    def span_under(self, rect):
+        """The (y, left, right) span a body is standing on, or None."""
+        ts = self.tilemap.tile_size
+        y = (rect.bottom + 1) // ts
+        span = self.tilemap.span_at(rect.centerx // ts, y)
+        if span is None:
+            return None
+        return y, span[0], span[1]
+
+    def find_path(self, start, goal):
+        """
+        Cheapest route between two spans as [(span, kind), ...] after start, or None.
+
+        Results are shared between every caller asking for the same (start, goal) until the
+        tiles change.
+        """
+        self.ensure_current()
+        key = (start, goal)
+        if key in self._paths:
+            return self._paths[key]
+
+        path = self._search(start, goal)
+        self._paths[key] = path
+        return path
+
+    def _heuristic(self, span, goal):
+        ts = self.tilemap.tile_size
+        gap = max(0, goal[1] - span[2] - 1, span[1] - goal[2] - 1)
+        return gap * ts / self.speed
+
+    def _search(self, start, goal):
+        if start not in self.edges or goal not in self.edges:
+            return None
+        if start == goal:
+            return []
+
+        came_from = {start: None}
+        cost_so_far = {start: 0}
+        frontier = [(self._heuristic(start, goal), 0, start)]
+        counter = 1
+        while frontier:
+            _, _, current = heapq.heappop(frontier)
+            if current == goal:
+                break
+            for other, kind, cost in self.edges[current]:
+                new_cost = cost_so_far[current] + cost
+                if other not in cost_so_far or new_cost < cost_so_far[other]:
+                    cost_so_far[other] = new_cost
+                    came_from[other] = (current, kind)
+                    heapq.heappush(frontier, (new_cost + self._heuristic(other, goal), counter, other))
+                    counter += 1
+
+        if goal not in came_from:
+            return None
+
+        path = []
+        node = goal
+        while node != start:
+            previous, kind = came_from[node]
+            path.append((node, kind))
+            node = previous
+        path.reverse()
+        return path
@@ -0,0 +1,121 @@
+import math
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, batched casts fall back to one ray at a time
+    np = None
+
+
+def cast_ray(is_solid, tile_size, origin, direction, max_distance):
+    """
+    Amanatides-Woo grid traversal from origin (pixels) along direction.
+
+    Visits every cell the ray crosses, in order, and returns the first solid one as
+    {'distance', 'point', 'cell', 'normal'}, or None if nothing is hit within max_distance.
+    """
+    ox, oy = origin
+    dx, dy = direction
+    length = math.hypot(dx, dy)
+    if length == 0:
+        return None
+    dx /= length
+    dy /= length
+
+    ts = tile_size
+    gx = math.floor(ox / ts)
+    gy = math.floor(oy / ts)
+    if is_solid(gx, gy):
+        return {'distance': 0.0, 'point': (ox, oy), 'cell': (gx, gy), 'normal': (0, 0)}
+
+    step_x = 1 if dx > 0 else -1
+    step_y = 1 if dy > 0 else -1
+    delta_x = ts / abs(dx) if dx else math.inf
+    delta_y = ts / abs(dy) if dy else math.inf
+    if dx > 0:
+        t_max_x = ((gx + 1) * ts - ox) / dx
+    elif dx < 0:
+        t_max_x = (gx * ts - ox) / dx
+    else:
+        t_max_x = math.inf
+    if dy > 0:
+        t_max_y = ((gy + 1) * ts - oy) / dy
+    elif dy < 0:
+        t_max_y = (gy * ts - oy) / dy
+    else:
+        t_max_y = math.inf
+
+    while True:
+        if t_max_x < t_max_y:
+            t = t_max_x
+            gx += step_x
+            t_max_x += delta_x
+            normal = (-step_x, 0)
+        else:
+            t = t_max_y
+            gy += step_y
+            t_max_y += delta_y
+            normal = (0, -step_y)
+
+        if t > max_distance:
+            return None
+        if is_solid(gx, gy):
+            return {'distance': t, 'point': (ox + dx * t, oy + dy * t), 'cell': (gx, gy), 'normal': normal}
+
+
+def cast_rays(grid, grid_origin, tile_size, origins, directions, max_distance):
+    """
+    Vectorized cast_ray over many rays against a dense boolean solid grid (indexed [y, x]).
+
+    All rays step together, one cell per iteration, so the Python loop runs as many times as
+    the longest ray has cells rather than once per cell per ray. Returns (distances, cells) as
+    lists, the same as casting the rays one by one: a miss has an inf distance and a None cell.
+    """
+    o = np.asarray(origins, dtype=float).reshape(-1, 2)
+    d = np.asarray(directions, dtype=float).reshape(-1, 2)
+    n = len(o)
+    ts = tile_size
+    x0, y0 = grid_origin
+    height, width = grid.shape
+
+    length = np.hypot(d[:, 0], d[:, 1])
+    moving = length > 0
+    d[moving] /= length[moving, None]
+
+    cells = np.floor(o / ts).astype(int)
+    step = np.where(d > 0, 1, -1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        delta = np.where(d != 0, ts / np.abs(d), np.inf)
+        boundary = np.where(d > 0, (cells + 1) * ts, cells * ts)
+        t_max = np.where(d != 0, (boundary - o) / d, np.inf)
+
+    def solid_at(c):
+        gx = c[:, 0] - x0
+        gy = c[:, 1] - y0
+        inside = (gx >= 0) & (gx < width) & (gy >= 0) & (gy < height)
+        result = np.zeros(len(c), dtype=bool)
+        result[inside] = grid[gy[inside], gx[inside]]
+        return result
+
+    distances = np.full(n, np.inf)
+    # Like cast_ray, a ray without a direction misses even from inside a solid cell
+    start_solid = moving & solid_at(cells)
+    distances[start_solid] = 0.0
+    active = np.nonzero(moving & ~start_solid)[0]
+
+    while len(active):
+        axis = (t_max[active, 0] >= t_max[active, 1]).astype(int)
+        t = t_max[active, axis]
+        cells[active, axis] += step[active, axis]
+        t_max[active, axis] += delta[active, axis]
+
+        in_range = t <= max_distance
+        active = active[in_range]
+        t = t[in_range]
+
+        hit = solid_at(cells[active])
+        distances[active[hit]] = t[hit]
+        active = active[~hit]
+
+    # Where a missed ray stopped isn't a hit cell
+    hit_cells = [tuple(cell) if distance != math.inf else None for distance, cell in zip(distances.tolist(), cells.tolist())]
+    return distances.tolist(), hit_cells
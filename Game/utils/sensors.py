@@ -0,0 +1,92 @@
+import pygame
+
+
+def compile_actions(properties):
+    """Turn property strings like "toggle_render:mossy" into (action, argument) pairs once."""
+    actions = []
+    for prop in properties:
+        action, _, argument = prop.partition(":")
+        actions.append((action, argument or None))
+    return actions
+
+
+class SensorTrigger:
+    def __init__(self, sensor_id, kind, rect, actions, owner=None):
+        self.id = sensor_id
+        self.kind = kind
+        self.rect = pygame.Rect(rect)
+        self.actions = actions
+        self.owner = owner
+
+
+class SensorSystem:
+    """
+    Spatial hash of sensor triggers.
+
+    update() only tests triggers in the cells a body overlaps and reports "enter", "stay" and
+    "exit" events to subscribers as callback(trigger, body).
+    """
+
+    def __init__(self, cell_size=256):
+        self.cell_size = cell_size
+        self._cells = {}
+        self._triggers = []
+        self._inside = {}
+        self._listeners = {"enter": [], "stay": [], "exit": []}
+
+    def _cells_for(self, rect):
+        cs = self.cell_size
+        for cx in range(rect.left // cs, (rect.right - 1) // cs + 1):
+            for cy in range(rect.top // cs, (rect.bottom - 1) // cs + 1):
+                yield cx, cy
+
+    def add(self, trigger):
+        self._triggers.append(trigger)
+        for cell in self._cells_for(trigger.rect):
+            self._cells.setdefault(cell, []).append(trigger)
+
+    def remove_owner(self, owner):
+        """Drop every trigger belonging to owner, e.g. before a tilemap re-registers its sensors."""
+        removed = [trigger for trigger in self._triggers if trigger.owner is owner]
+        if not removed:
+            return
+        self._triggers = [trigger for trigger in self._triggers if trigger.owner is not owner]
+        for cell in list(self._cells):
+            bucket = [trigger for trigger in self._cells[cell] if trigger.owner is not owner]
+            if bucket:
+                self._cells[cell] = bucket
+            else:
+                del self._cells[cell]
+        for inside in self._inside.values():
+            inside.difference_update(removed)
+
+    def subscribe(self, event, callback):
+        self._listeners[event].append(callback)
+
+    def unsubscribe(self, event, callback):
+        if callback in self._listeners[event]:
+            self._listeners[event].remove(callback)
+
+    def _emit(self, event, trigger, body):
+        for callback in self._listeners[event]:
+            callback(trigger, body)
+
+    def query_rect(self, rect):
+        found = []
+        for cell in self._cells_for(rect):
+            for trigger in self._cells.get(cell, ()):
+                if trigger not in found and trigger.rect.colliderect(rect):
+                    found.append(trigger)
+        return found
+
+    def update(self, body):
+        now_inside = self.query_rect(body.rect)
+        was_inside = self._inside.get(id(body), set())
+
+        for trigger in now_inside:
+            self._emit("stay" if trigger in was_inside else "enter", trigger, body)
+        for trigger in was_inside:
+            if trigger not in now_inside:
+                self._emit("exit", trigger, body)
+
+        self._inside[id(body)] = set(now_inside)
@@ -0,0 +1,61 @@
+# Simulation tiers by distance from the camera view
+LOD_FULL = 0
+LOD_REDUCED = 1
+LOD_FROZEN = 2
+
+
+class SimulationLOD:
+    """
+    Decides which entities get updated each tick and with what dt.
+
+    Within full_margin pixels of the camera view entities update every tick. Out to
+    reduced_margin they update every reduced_interval ticks with the time they missed (the
+    swept collision keeps those longer steps safe). Beyond that they are frozen and the time
+    they miss is dropped, so an entity picks up where it stopped instead of replaying it.
+    """
+
+    def __init__(self, full_margin=256, reduced_margin=1024, reduced_interval=4):
+        self.full_margin = full_margin
+        self.reduced_margin = reduced_margin
+        self.reduced_interval = reduced_interval
+        self.full_rect = None
+        self.reduced_rect = None
+
+    def set_view(self, view_rect):
+        self.full_rect = view_rect.inflate(self.full_margin * 2, self.full_margin * 2)
+        self.reduced_rect = view_rect.inflate(self.reduced_margin * 2, self.reduced_margin * 2)
+
+    def tier(self, rect):
+        if self.full_rect is None or self.full_rect.colliderect(rect):
+            return LOD_FULL
+        if self.reduced_rect.colliderect(rect):
+            return LOD_REDUCED
+        return LOD_FROZEN
+
+    def due(self, sprites, dt):
+        """The (sprite, dt) pairs to update this tick."""
+        updates = []
+        for sprite in sprites:
+            tier = self.tier(sprite.rect)
+            previous = getattr(sprite, 'lod_tier', LOD_FULL)
+            sprite.lod_tier = tier
+
+            if tier == LOD_FROZEN:
+                sprite.lod_pending = 0.0
+                sprite.lod_ticks = 0
+                continue
+
+            if previous == LOD_FROZEN:
+                # Coming back: start from where it stopped rather than interpolating from there
+                if hasattr(sprite, 'prev_pos'):
+                    sprite.prev_pos.update(sprite.pos)
+
+            sprite.lod_pending = getattr(sprite, 'lod_pending', 0.0) + dt
+            sprite.lod_ticks = getattr(sprite, 'lod_ticks', 0) + 1
+
+            # Full rate, the reduced interval is up, or it just moved up a tier and catches up now
+            if tier == LOD_FULL or sprite.lod_ticks >= self.reduced_interval:
+                updates.append((sprite, sprite.lod_pending))
+                sprite.lod_pending = 0.0
+                sprite.lod_ticks = 0
+        return updates
@@ -0,0 +1,94 @@
+# Collision layers. A body sits on one layer; queries pass a mask of the layers they want.
+LAYER_PLAYER = 1
+LAYER_ENEMY = 2
+LAYER_NPC = 4
+LAYER_CHEST = 8
+LAYER_PICKUP = 16
+ALL_LAYERS = LAYER_PLAYER | LAYER_ENEMY | LAYER_NPC | LAYER_CHEST | LAYER_PICKUP
+
+
+class SpatialHash:
+    """
+    World-wide spatial hash of entities (enemies, NPCs, chests, pickups) for overlap queries.
+
+    Bodies are re-registered once per tick from the loaded tilemaps' groups. A body is only
+    rebucketed when the range of cells its rect covers changes, and bodies that weren't seen
+    in a round (killed, evicted, unloaded) are pruned at the end of it.
+    """
+
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self._cells = {}
+        # id(body) -> [body, layer, cell range, generation]
+        self._entries = {}
+        self.generation = 0
+
+    def _cell_range(self, rect):
+        cs = self.cell_size
+        return rect.left // cs, rect.top // cs, (rect.right - 1) // cs, (rect.bottom - 1) // cs
+
+    def _link(self, entry):
+        left, top, right, bottom = entry[2]
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                self._cells.setdefault((cx, cy), []).append(entry)
+
+    def _unlink(self, entry):
+        left, top, right, bottom = entry[2]
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                bucket = self._cells.get((cx, cy))
+                if bucket is not None and entry in bucket:
+                    bucket.remove(entry)
+                    if not bucket:
+                        del self._cells[(cx, cy)]
+
+    def begin(self):
+        """Start a registration round."""
+        self.generation += 1
+
+    def update(self, body, layer):
+        cell_range = self._cell_range(body.rect)
+        entry = self._entries.get(id(body))
+        if entry is None:
+            entry = [body, layer, cell_range, self.generation]
+            self._entries[id(body)] = entry
+            self._link(entry)
+            return
+        if entry[2] != cell_range:
+            self._unlink(entry)
+            entry[2] = cell_range
+            self._link(entry)
+        entry[1] = layer
+        entry[3] = self.generation
+
+    def remove(self, body):
+        entry = self._entries.pop(id(body), None)
+        if entry is not None:
+            self._unlink(entry)
+
+    def prune(self):
+        """Drop every body that wasn't updated since begin()."""
+        stale = [entry[0] for entry in self._entries.values() if entry[3] != self.generation]
+        for body in stale:
+            self.remove(body)
+
+    def query(self, rect, mask):
+        """Bodies on a layer in mask whose rect overlaps rect."""
+        found = []
+        seen = set()
+        left, top, right, bottom = self._cell_range(rect)
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                for entry in self._cells.get((cx, cy), ()):
+                    body = entry[0]
+                    if entry[1] & mask and id(body) not in seen and body.rect.colliderect(rect):
+                        seen.add(id(body))
+                        found.append(body)
+        return found
+
+    def __contains__(self, body):
+        return id(body) in self._entries
+
+    def __len__(self):
+        return len(self._entries)
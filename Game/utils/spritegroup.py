@@ -1,6 +1,7 @@
 class SpriteGroup:
     def __init__(self):
         self.sprite_dict = {}
+        self._next_key = 0
 
     def add(self, *sprites):
         for sprite in sprites:
@@ -14,7 +15,11 @@ class SpriteGroup:
         if hasattr(sprite, 'id'):
             self.sprite_dict[sprite.id] = sprite
         else:
-            self.sprite_dict[len(self.sprite_dict)] = sprite
+            # A running counter so keys stay unique after removals
+            while self._next_key in self.sprite_dict:
+                self._next_key += 1
+            self.sprite_dict[self._next_key] = sprite
+            self._next_key += 1
 
 
     def remove(self, *sprites):
@@ -27,6 +32,16 @@ class SpriteGroup:
                 for k in keys_to_remove:
                     del self.sprite_dict[k]
 
+    def pop(self, sprite):
+        """Remove a sprite and return the key it was stored under, so it can be re-inserted later."""
+        key = self.get_id_by_sprite(sprite)
+        if key is not None:
+            del self.sprite_dict[key]
+        return key
+
+    def insert(self, key, sprite):
+        self.sprite_dict[key] = sprite
+
     def get_by_id(self, sprite_id):
         return self.sprite_dict.get(sprite_id)
 
@@ -0,0 +1,120 @@
+# Modifier kinds
+MOD_ADD = "add"
+MOD_MULTIPLY = "mul"
+
+
+class Modifier:
+    def __init__(self, stat, value, kind=MOD_ADD, source=None):
+        self.stat = stat
+        self.value = value
+        self.kind = kind
+        self.source = source  # The item or effect it came from, so it can be taken off again
+
+
+class StatBlock:
+    """
+    Base stats plus stacked modifiers from items and effects.
+
+    A stat is (base + additive modifiers) * (1 + multiplicative modifiers), clamped to its
+    limits, which can be numbers or other stats. Values are only recomputed when a base value
+    or modifier changes and are read as plain attributes (stats.max_speed), so the per-frame
+    reads are attribute lookups. Only stats with a base value or a modifier exist; reading any
+    other name is an AttributeError. Listeners get {stat: (old, new)} for whatever changed.
+    """
+
+    def __init__(self, base, limits=None):
+        self._base = dict(base)
+        # stat -> (low, high), each a number, another stat's name or None
+        self._limits = dict(limits or {})
+        self._modifiers = []
+        self._listeners = []
+
+        # Stats whose limits depend on a stat
+        self._dependents = {}
+        for stat, bounds in self._limits.items():
+            for bound in bounds:
+                if isinstance(bound, str):
+                    self._dependents.setdefault(bound, []).append(stat)
+
+        for stat in self._base:
+            setattr(self, stat, self._base[stat])
+        for stat in self._base:
+            setattr(self, stat, self._compute(stat))
+
+    def _compute(self, stat):
+        added = self._base.get(stat, 0)
+        scale = 1.0
+        for modifier in self._modifiers:
+            if modifier.stat == stat:
+                if modifier.kind == MOD_MULTIPLY:
+                    scale += modifier.value
+                else:
+                    added += modifier.value
+        value = added * scale if scale != 1.0 else added
+
+        low, high = self._limits.get(stat, (None, None))
+        if isinstance(low, str):
+            low = getattr(self, low)
+        if isinstance(high, str):
+            high = getattr(self, high)
+        if low is not None and value < low:
+            value = low
+        if high is not None and value > high:
+            value = high
+        return value
+
+    def _refresh(self, stats):
+        changes = {}
+        pending = list(stats)
+        while pending:
+            stat = pending.pop(0)
+            old = getattr(self, stat, None)
+            new = self._compute(stat)
+            if new != old:
+                setattr(self, stat, new)
+                # A stat's first modifier changes it from 0, not from nothing
+                first_old = changes[stat][0] if stat in changes else (0 if old is None else old)
+                changes[stat] = (first_old, new)
+                pending.extend(self._dependents.get(stat, ()))
+        if changes:
+            for listener in list(self._listeners):
+                listener(changes)
+
+    def base(self, stat):
+        return self._base.get(stat, 0)
+
+    def set_base(self, stat, value):
+        self._base[stat] = value
+        self._refresh([stat])
+
+    def add_modifiers(self, modifiers):
+        """Apply several modifiers with one recompute and one notification."""
+        self._modifiers.extend(modifiers)
+        self._refresh({modifier.stat for modifier in modifiers})
+
+    def add_modifier(self, stat, value, kind=MOD_ADD, source=None):
+        modifier = Modifier(stat, value, kind, source)
+        self.add_modifiers([modifier])
+        return modifier
+
+    def remove_modifier(self, modifier):
+        if modifier in self._modifiers:
+            self._modifiers.remove(modifier)
+            self._refresh([modifier.stat])
+
+    def remove_source(self, source):
+        """Take off every modifier that came from source."""
+        removed = {modifier.stat for modifier in self._modifiers if modifier.source is source}
+        if removed:
+            self._modifiers = [modifier for modifier in self._modifiers if modifier.source is not source]
+            self._refresh(removed)
+
+    def modifiers(self, stat=None):
+        return [modifier for modifier in self._modifiers if stat is None or modifier.stat == stat]
+
+    def subscribe(self, listener):
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
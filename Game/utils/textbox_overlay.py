@@ -31,7 +31,7 @@ class TextOverlay:
             return True
 
         if keys[pygame.K_ESCAPE]:
-            self.input_cooldown = 0.2
+            self.game.timers.countdown(self, "input_cooldown", 0.2)
             if not self.typewriter_finished:
                 self.current_typewriter_text = self.typewriter_text
                 self.typewriter_index = len(self.typewriter_text)
@@ -65,9 +65,6 @@ class TextOverlay:
             self.typewriter_finished = True
 
     def update(self, dt):
-        if self.input_cooldown > 0:
-            self.input_cooldown -= dt
-
         if self.typewriter_text and not self.typewriter_finished:
             self.typewriter_timer += dt
             if self.typewriter_timer >= self.typewriter_speed:
@@ -0,0 +1,107 @@
+import random
+
+import pygame
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, textures are then drawn the slow way
+    np = None
+
+# (kind, size, params) -> Surface. Textures are shared between every caller, so never draw on them.
+_cache = {}
+
+
+def _memoized(key, build):
+    surface = _cache.get(key)
+    if surface is None:
+        surface = build()
+        _cache[key] = surface
+    return surface
+
+
+def _alpha_surface(size, colour, alpha):
+    """An SRCALPHA surface filled with colour whose alpha channel is the (width, height) array alpha."""
+    surface = pygame.Surface(size, pygame.SRCALPHA)
+    surface.fill((*colour, 0))
+    pixels = pygame.surfarray.pixels_alpha(surface)
+    pixels[...] = alpha
+    del pixels
+    return surface
+
+
+def noise(size=128, cell=4, seed=None):
+    """Black squares of cell x cell pixels with random alpha."""
+    def build():
+        rng = random.Random(seed)
+        cells = (size + cell - 1) // cell
+        if np is not None:
+            values = np.array([rng.randint(0, 255) for _ in range(cells * cells)], dtype=np.uint8).reshape(cells, cells)
+            alpha = np.repeat(np.repeat(values, cell, axis=0), cell, axis=1)[:size, :size]
+            return _alpha_surface((size, size), (0, 0, 0), alpha)
+
+        surface = pygame.Surface((size, size), pygame.SRCALPHA)
+        for x in range(0, size, cell):
+            for y in range(0, size, cell):
+                pygame.draw.rect(surface, (0, 0, 0, rng.randint(0, 255)), (x, y, cell, cell))
+        return surface
+
+    return _memoized(("noise", size, (cell, seed)), build)
+
+
+def fade_ramp(width, height, direction="bottom", strength=0.5, colour=(0, 0, 0)):
+    """
+    A fade hanging off one side of a tile: "bottom" is strongest (strength * 255 alpha) along
+    the top edge and fades out downwards, the other directions likewise.
+    """
+    def build():
+        length = height if direction in ("top", "bottom") else width
+        ramp = [int(255 * (1 - i / length) * strength) for i in range(length)]
+        if direction in ("top", "left"):
+            ramp.reverse()
+
+        if np is not None:
+            line = np.array(ramp, dtype=np.uint8)
+            if direction in ("top", "bottom"):
+                alpha = np.broadcast_to(line[None, :], (width, height))
+            else:
+                alpha = np.broadcast_to(line[:, None], (width, height))
+            return _alpha_surface((width, height), colour, alpha)
+
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        for i, alpha in enumerate(ramp):
+            if direction in ("top", "bottom"):
+                pygame.draw.line(surface, (*colour, alpha), (0, i), (width, i))
+            else:
+                pygame.draw.line(surface, (*colour, alpha), (i, 0), (i, height))
+        return surface
+
+    return _memoized(("fade", (width, height), (direction, strength, colour)), build)
+
+
+def radial_gradient(size, colour=(255, 255, 255), exponent=3.0):
+    """Alpha rising from 0 at the centre to 255 at the edge as (distance / radius) ** exponent; clear outside."""
+    def build():
+        center = size // 2
+
+        if np is not None:
+            coords = np.arange(size) - center
+            distance = np.sqrt(coords[:, None] ** 2 + coords[None, :] ** 2)
+            norm = distance / center
+            alpha = (np.clip(norm ** exponent, 0, 1) * 255).astype(np.uint8)
+            alpha[distance > center] = 0
+            return _alpha_surface((size, size), colour, alpha)
+
+        surface = pygame.Surface((size, size), pygame.SRCALPHA)
+        for y in range(size):
+            for x in range(size):
+                dx = x - center
+                dy = y - center
+                distance = (dx * dx + dy * dy) ** 0.5
+                if distance <= center:
+                    alpha = max(0, min(1, (distance / center) ** exponent))
+                    surface.set_at((x, y), (*colour, int(alpha * 255)))
+                else:
+                    surface.set_at((x, y), (*colour, 0))
+        return surface
+
+    return _memoized(("radial", size, (colour, exponent)), build)
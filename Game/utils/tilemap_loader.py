@@ -0,0 +1,48 @@
+from Game.utils.config import get_config
+
+
+class TilemapLoader:
+    """
+    Loads tilemaps when they become relevant and unloads them once they have been idle.
+
+    A map is needed while it is rendered, owns the player, or overlaps the camera view grown by
+    preload_distance. Maps that aren't needed are unloaded after unload_delay seconds, or
+    straight away (longest idle first) while more than max_loaded maps are resident.
+    """
+
+    def __init__(self, game):
+        self.game = game
+
+        settings = get_config().get("tilemap_loading", {})
+        self.preload_distance = settings.get("preload_distance", 256)
+        self.unload_delay = settings.get("unload_delay", 10.0)
+        self.max_loaded = settings.get("max_loaded", 4)
+
+        self.idle = {name: 0.0 for name in self.game.tilemaps}
+
+    def update(self, dt):
+        view = self.game.camera.view_rect(margin=self.preload_distance)
+        near = {name for name, _ in self.game.world_index.query_rect(view)}
+        owner = self.game.player.tilemap_name
+
+        loaded = []
+        for name, tilemap in self.game.tilemaps.items():
+            if tilemap.rendered or name in near or name == owner:
+                tilemap.ensure_loaded()
+                self.idle[name] = 0.0
+                continue
+
+            self.idle[name] = self.idle.get(name, 0.0) + dt
+            if not tilemap.loaded:
+                continue
+            if self.idle[name] >= self.unload_delay:
+                tilemap.unload()
+            else:
+                loaded.append(name)
+
+        needed = sum(1 for tilemap in self.game.tilemaps.values() if tilemap.loaded) - len(loaded)
+        budget = max(0, self.max_loaded - needed)
+        if len(loaded) > budget:
+            loaded.sort(key=lambda n: self.idle[n], reverse=True)
+            for name in loaded[:len(loaded) - budget]:
+                self.game.tilemaps[name].unload()
@@ -1,14 +1,26 @@
+import math
+import os
+import time
+
 import pygame
-import random
 import json
+from bisect import bisect_left, bisect_right, insort
 
 from Game.Sprites.Enemies.Flyer import Flyer
 from Game.Sprites.Enemies.GroundCrawler import GroundCrawler
 from Game.Sprites.NPC import NPC
+from Game.Sprites.Chest import Chest
+from Game.Sprites.MovingPlatform import MovingPlatform
 from Game.Sprites.NPCs.Shop import Shop
 from Game.Sprites.NPCs.SimpleSpeaker import SimpleSpeaker
+from Game.utils.chunks import ChunkStreamer, MANIFEST_SUFFIX
 from Game.utils.config import *
 from Game.utils.helpers import grid_to_px
+from Game.utils.sensors import SensorTrigger, compile_actions
+from Game.utils import raycast, textures
+from Game.utils.navigation import NavGraph
+from Game.utils.enemy_batch import CrawlerBatch, np as batch_np
+from Game.utils.spatial_hash import ALL_LAYERS
 from Game.utils.spritegroup import SpriteGroup
 from Game.GUIs.NPC.Store import StoreScreen
 
@@ -24,6 +36,8 @@ AUTOTILE_MAP = {
     tuple(sorted([(1, 0), (-1, 0), (0, 1), (0, -1)])): 8
 }
 
+DARK_CHUNK_SIZE = 16  # tiles per side of a baked darkness chunk
+
 NEIGHBOR_OFFSET = [(-1, 0), (-1, -1), (0, -1), (1, -1), (1, 0), (0, 0), (-1, 1), (0, 1), (1, 1)]
 PHYSICS_TILES = ['solid']
 
@@ -57,8 +71,9 @@ scale_sizing = {
 }
 
 class TileMap:
-    def __init__(self, game, tile_size=48, pos=(0, 0), rendered=False, overlay=None):
+    def __init__(self, game, tile_size=48, pos=(0, 0), rendered=False, overlay=None, name=None):
         self.game = game
+        self.name = name
         self.tile_size = tile_size
         self.tile_map = {}
         self.off_grid_tiles = []
@@ -71,235 +86,120 @@ class TileMap:
         self.items = SpriteGroup()
         self.chests = SpriteGroup()
         self.npcs = SpriteGroup()
-        self.breakables = SpriteGroup()
+        self.platforms = SpriteGroup()
+
+        # Local grid positions of broken blocks and opened chests, kept across unloads
+        self.broken = set()
+        self.opened_chests = set()
 
         self.overlay = overlay
+        self.streamer = None
+
+        self.path = None
+        self.loaded = False
+        self.load_stats = {"loads": 0, "unloads": 0}
+        self._spawned_enemies = []
+        self._frozen_enemies = None
+
+        if game is not None and getattr(game, 'sensors', None) is not None:
+            game.sensors.subscribe("enter", self._on_sensor_enter)
 
         self.width = 0
         self.height = 0
 
+        # Declared room bounds and the area actually covered by tiles/sensors, in pixels
+        self.bounds = pygame.Rect(0, 0, 0, 0)
+        self.extent = pygame.Rect(0, 0, 0, 0)
+        self._layout_extent = None
+
         self.bg_colour = (45, 45, 45)
         self.tint_colour = (12, 12, 12)
 
-        self.noise_surface = self._generate_noise_surface()
         self._tile_cache = {}
         self._layers = []
-        self._fade_cache = {}
+        self._layer_rows = {}
+        self._dark_chunks = {}
+
+        # Animated cells per layer and chunk; they are drawn from the game's animation clock
+        self._animated_chunks = {}
+        self._shape_cache = {}
+
+        # Solid cells by row, and the walkable runs on top of them as (left, right) inclusive
+        self._solid_cells = set()
+        self._solid_rows = {}
+        self._span_rows = {}
+        self._solid_grid = None
+
+        # Bumped whenever tiles change so derived data (rays, paths) can tell it is stale
+        self.tile_version = 0
+
+        settings = get_config().get("navigation", {})
+        self.nav = NavGraph(
+            self,
+            gravity=settings.get("gravity", 1200),
+            jump_velocity=settings.get("jump_velocity", -500),
+            speed=settings.get("speed", 200),
+            max_drop_tiles=settings.get("max_drop_tiles", 12),
+        )
 
-    def _generate_noise_surface(self, size=128):
-        noise = pygame.Surface((size, size), pygame.SRCALPHA)
-        for x in range(0, size, 4):
-            for y in range(0, size, 4):
-                alpha = random.randint(0, 255)
-                pygame.draw.rect(noise, (0, 0, 0, alpha), (x, y, 4, 4))
-        return noise
+        # Large crawler groups can be stepped as arrays instead of one object at a time
+        settings = get_config().get("enemy_batching", {})
+        self.enemy_batch = CrawlerBatch(self) if settings.get("enabled", True) and batch_np is not None else None
+        self.enemy_batch_threshold = settings.get("min_enemies", 32)
 
     def load_map(self, p):
+        self.load_header(p)
+        self.ensure_loaded()
+
+    def load_header(self, p):
+        """Read just enough of a level to place it in the world: size, colours, extent and sensors."""
+        self.path = p
+        if p.endswith(MANIFEST_SUFFIX):
+            self.load_streamed(p)
+            return
+
         with open(p, 'r') as f:
             data = json.load(f)
 
-        self.width = data['width']
-        self.height = data['height']
-        self.tile_size = data['tile_size']
+        self._apply_header(data)
 
-        self.bg_colour = data.get('bg_colour', self.bg_colour)
-        self.tint_colour = data.get('tint_colour', self.tint_colour)
-
-        temp_layers = set()
         for layer in data['layers']:
-            if layer['type'] == 'tilelayer':
-                for tile in layer['data']:
-                    temp_layers.add(int(tile['z']))
-        self._layers = sorted(list(temp_layers))
+            if layer['type'] == 'sensor_layer':
+                self._load_sensors(layer['data'])
 
-        for layer in data['layers']:
+        for sensor in self.sensors.values():
+            sensor['x'] += int(self.pos.x)
+            sensor['y'] += int(self.pos.y)
 
-            if layer['type'] == 'sensor_layer':
-                for sensor in layer['data']:
-                    sensor_id = sensor["id"]
-                    if sensor_id is not None:
-                        self.sensors[sensor_id] = {
-                            "type": sensor['type'],
-                            'x': float(sensor['x']),
-                            'y': float(sensor['y']),
-                            'w': float(sensor['w']),
-                            'h': float(sensor['h']),
-                            'properties': sensor.get('properties', []),
-                            'triggered': False,
-                            "id": sensor_id
-                        }
-
-            if layer["type"] == "enemies":
-                for enemy in layer['data']:
-                    enemy_type = enemy['type']
-                    x = float(enemy['x'])
-                    y = float(enemy['y'])
-                    match enemy_type:
-                        case "flyer":
-                            surface = pygame.surface.Surface((16,16))
-                            surface.fill((255,0,0))
-                            enemy_sprite = Flyer(surface, (grid_to_px(x), grid_to_px(y)), self.game, self)
-                            self.enemies.append(enemy_sprite)
-
-                        case "groundCrawler":
-                            surface = pygame.surface.Surface((16,16))
-                            surface.fill((255,0,0))
-                            enemy_sprite = GroundCrawler(surface, (grid_to_px(x), grid_to_px(y)), self.game, self)
-                            self.enemies.append(enemy_sprite)
-
-            if layer["type"] == "npcs":
-                for npc in layer['data']:
-                    npc_type = npc['type']
-                    x = float(npc['x'])
-                    y = float(npc['y'])
-
-                    match npc_type:
-                        case "simpleSpeaker":
-                            surface = pygame.surface.Surface((16, 16))
-                            surface.fill((0, 255, 0))
-                            npc_obj = SimpleSpeaker(surface, (grid_to_px(x), grid_to_px(y)), self.game, self, npc['text'])
-                            self.npcs.append(npc_obj)
-                        case "shop":
-                            surface = pygame.surface.Surface((16, 16))
-                            surface.fill((0, 255, 255))
-                            npc_obj = Shop((grid_to_px(x), grid_to_px(y)), self.game, npc['store'], self)
-                            self.npcs.append(npc_obj)
-                            self.game.screens['store'][self.npcs.get_id_by_sprite(npc_obj)] = StoreScreen(self.game, npc_obj)
-                        case _:
-                            surface = pygame.surface.Surface((16,16))
-                            surface.fill((255,0,0))
-                            npc_obj = NPC(surface, (grid_to_px(x), grid_to_px(y)), self.game, self)
-                            self.npcs.append(npc_obj)
+        self._compile_sensors()
+        self._update_bounds()
 
+    def ensure_loaded(self):
+        """Parse, expand, spawn and bake the map the first time something needs it."""
+        if self.loaded or self.path is None:
+            return
+        if self.streamer is not None:
+            self.loaded = True
+            return
 
+        start = time.perf_counter()
+        with open(self.path, 'r') as f:
+            data = json.load(f)
+        parsed = time.perf_counter()
+
+        keep_npcs = len(self.npcs.sprite_dict) > 0
+        keep_chests = len(self.chests.sprite_dict) > 0
+        for layer in data['layers']:
+            if layer["type"] in ("enemies", "platforms") or (layer["type"] == "npcs" and not keep_npcs) or (layer["type"] == "chests" and not keep_chests):
+                self._spawn_entities(layer["type"], layer['data'])
+        self._restore_frozen()
+        spawned = time.perf_counter()
 
+        for layer in data['layers']:
             if layer['type'] == 'tilelayer':
-                for tile in layer['data']:
-                    if "repeat" in tile["properties"]:
-                        for x in range(tile["w"]):
-                            for y in range(tile["h"]):
-                                should_render = True
-                                if "alternate" in tile["properties"]:
-                                    should_render = (x & int(tile["alternate"])) == 0
-
-                                world_x = int(tile['x'] + x)
-                                world_y = int(tile['y'] + y)
-                                tile_variant = tile["variant"]
-
-                                if should_render:
-                                    if tile["render_cut"][0] != 0 and x == tile["w"] - 1:
-                                        tile_variant = None
-
-                                    self.tile_map[(world_x, world_y)] = {
-                                        'x': world_x,
-                                        'y': world_y,
-                                        'z': int(tile['z']),
-                                        'environment': data['environment'],
-                                        'type': tile["type"],
-                                        'variant': tile_variant,
-                                        'properties': tile["properties"]
-                                    }
-                                else:
-                                    self.tile_map[(world_x, world_y)] = {
-                                        'x': world_x,
-                                        'y': world_y,
-                                        'z': int(tile['z']),
-                                        'environment': data['environment'],
-                                        'type': tile["type"],
-                                        'variant': None,
-                                        'properties': tile["properties"]
-                                    }
-
-                                if tile_variant is None:
-                                    self.tile_map[(world_x, world_y)] = {
-                                        'x': world_x,
-                                        'y': world_y,
-                                        'z': int(tile['z']),
-                                        'environment': data['environment'],
-                                        'type': tile["type"],
-                                        'variant': None,
-                                        'properties': tile["properties"]
-                                    }
-
-                                if "dark" in tile["properties"] and should_render:
-                                    depth = int(tile["dark_depth"])
-                                    try:
-                                        solid = int(tile["solid_depth"])
-                                    except ValueError:
-                                        solid = depth
-                                    if solid <= depth:
-                                        for y1 in range(depth):
-                                            tile_x = int(tile['x'] + x)
-                                            tile_y = int(tile['y'] + y1)
-                                            if (tile_x, tile_y) not in self.tile_map:
-                                                if y1 <= solid:
-                                                    self.tile_map[(tile_x, tile_y)] = {
-                                                        'x': tile_x,
-                                                        'y': tile_y,
-                                                        'z': int(tile['z']),
-                                                        'environment': data['environment'],
-                                                        'type': tile["type"],
-                                                        'variant': "dark",
-                                                        'properties': ["solid"],
-                                                    }
-                                                else:
-                                                    self.tile_map[(tile_x, tile_y)] = {
-                                                        'x': tile_x,
-                                                        'y': tile_y,
-                                                        'z': int(tile['z']),
-                                                        'environment': data['environment'],
-                                                        'type': tile["type"],
-                                                        'variant': "dark",
-                                                        'properties': [],
-                                                    }
-                                    else:
-                                        for y1 in range(solid):
-                                            tile_x = int(tile['x'] + x)
-                                            tile_y = int(tile['y'] + y1)
-                                            if (tile_x, tile_y) not in self.tile_map:
-                                                if y1 < solid:
-                                                    self.tile_map[(tile_x, tile_y)] = {
-                                                        'x': tile_x,
-                                                        'y': tile_y,
-                                                        'z': int(tile['z']),
-                                                        'environment': data['environment'],
-                                                        'type': tile["type"],
-                                                        'variant': None,
-                                                        'properties': ["solid"],
-                                                    }
-
-                                if tile["solid_depth"] and "dark_depth" not in tile["properties"]:
-                                    solid = int(tile["solid_depth"])
-                                    for y1 in range(solid):
-                                        tile_x = int(tile['x'] + x)
-                                        tile_y = int(tile['y'] + y1)
-                                        if (tile_x, tile_y) not in self.tile_map:
-                                            if y1 < solid:
-                                                self.tile_map[(tile_x, tile_y)] = {
-                                                    'x': tile_x,
-                                                    'y': tile_y,
-                                                    'z': int(tile['z']),
-                                                    'environment': data['environment'],
-                                                    'type': tile["type"],
-                                                    'variant': None,
-                                                    'properties': ["solid"],
-                                                }
-
-                    else:
-                        x, y, z = tile['x'], tile['y'], tile['z']
-                        self.tile_map[(x, y)] = {
-                            'x': int(x),
-                            'y': int(y),
-                            'z': int(z),
-                            'environment': data['environment'],
-                            'type': tile["type"],
-                            'variant': tile["variant"],
-                            'properties': tile["properties"]
-                        }
-
-        for pos, tile in self.tile_map.items():
-            if 'solid' in tile.get('properties', []):
-                pass
+                self._expand_tile_layer(layer, data['environment'])
+            elif layer['type'] == 'breakables':
+                self._add_breakables(layer['data'], data['environment'])
 
         if self.pos.x != 0 or self.pos.y != 0:
             offset_x = int(self.pos.x)
@@ -310,11 +210,704 @@ class TileMap:
                 tile['y'] = y + offset_y
                 new_map[(tile['x'], tile['y'])] = tile
             self.tile_map = new_map
+        expanded = time.perf_counter()
+
+        self._build_caches()
+        baked = time.perf_counter()
+
+        self.loaded = True
+        self.load_stats["loads"] += 1
+        self.load_stats["parse_ms"] = (parsed - start) * 1000
+        self.load_stats["spawn_ms"] = (spawned - parsed) * 1000
+        self.load_stats["expand_ms"] = (expanded - spawned) * 1000
+        self.load_stats["bake_ms"] = (baked - expanded) * 1000
+        self.load_stats["total_ms"] = (baked - start) * 1000
+
+        if get_config().get("debug", {}).get("log_tilemap_loads", False):
+            print(f"[TileMap] loaded '{self.name}' tiles={len(self.tile_map)} " + " ".join(f"{k}={v:.2f}" if isinstance(v, float) else f"{k}={v}" for k, v in self.load_stats.items()))
+
+    def unload(self):
+        """Drop tiles, caches and enemies, keeping only a compact snapshot of the enemies' state."""
+        if not self.loaded:
+            return
+        self.loaded = False
+        self.load_stats["unloads"] += 1
+
+        if self.streamer is not None:
+            self.streamer.evict_all()
+            return
+
+        # (alive, x, y, health) per spawned enemy, in spawn order
+        alive = {id(enemy) for enemy in self.enemies.sprites()}
+        self._frozen_enemies = [
+            (id(enemy) in alive, enemy.pos.x, enemy.pos.y, enemy.health) for enemy in self._spawned_enemies
+        ]
+        self._spawned_enemies = []
+        self.enemies = SpriteGroup()
+        self._remove_platforms()
+
+        self.tile_map = {}
+        self._layer_rows = {}
+        self._dark_chunks = {}
+        self._tile_cache = {}
+        self._animated_chunks = {}
+        self._solid_cells = set()
+        self._solid_rows = {}
+        self._span_rows = {}
+        self._solid_grid = None
+        self.tile_version += 1
+
+        if get_config().get("debug", {}).get("log_tilemap_loads", False):
+            print(f"[TileMap] unloaded '{self.name}'")
+
+    def _restore_frozen(self):
+        if self._frozen_enemies is None:
+            return
+        for enemy, (alive, x, y, health) in zip(self._spawned_enemies, self._frozen_enemies):
+            if not alive:
+                self.enemies.remove(enemy)
+                continue
+            enemy.pos.x, enemy.pos.y = x, y
+            enemy.rect.topleft = (int(x), int(y))
+            enemy.health = health
+        self._frozen_enemies = None
+
+    def load_streamed(self, p):
+        """Load a chunked level manifest; tiles and entities arrive later through the ChunkStreamer."""
+        with open(p, 'r') as f:
+            manifest = json.load(f)
 
+        self._apply_header(manifest)
+        self._load_sensors(manifest.get('sensors', []))
         for sensor in self.sensors.values():
             sensor['x'] += int(self.pos.x)
             sensor['y'] += int(self.pos.y)
 
+        settings = get_config().get("streaming", {})
+        self.streamer = ChunkStreamer(
+            self,
+            manifest,
+            os.path.dirname(p),
+            chunk_radius=settings.get("chunk_radius", 1),
+            evict_radius=settings.get("evict_radius", 2),
+            prefetch_chunks=settings.get("prefetch_chunks", 1),
+        )
+        # Moving platforms cross chunk borders, so they stay resident with the manifest
+        self._spawn_entities("platforms", manifest.get('platforms', []))
+        self._compile_sensors()
+        self._build_caches()
+
+    def _apply_header(self, data):
+        self.width = data['width']
+        self.height = data['height']
+        self.tile_size = data['tile_size']
+
+        self.bg_colour = data.get('bg_colour', self.bg_colour)
+        self.tint_colour = data.get('tint_colour', self.tint_colour)
+
+        # Chunked manifests list their layers and extent up front since the tiles aren't in the file
+        if 'z_layers' in data:
+            self._layers = sorted(data['z_layers'])
+            self._layout_extent = data.get('extent')
+            return
+
+        temp_layers = set()
+        left = top = right = bottom = None
+        for layer in data['layers']:
+            if layer['type'] == 'tilelayer':
+                for tile in layer['data']:
+                    temp_layers.add(int(tile['z']))
+
+                    # Covers the repeat area and any dark/solid fill hanging below it
+                    x, y = int(tile['x']), int(tile['y'])
+                    w = int(tile.get('w', 1)) if "repeat" in tile['properties'] else 1
+                    h = 1
+                    if "repeat" in tile['properties']:
+                        h = max(int(tile.get('h', 1)), int(tile.get('dark_depth') or 0), int(tile.get('solid_depth') or 0))
+                    left = x if left is None else min(left, x)
+                    top = y if top is None else min(top, y)
+                    right = x + w if right is None else max(right, x + w)
+                    bottom = y + h if bottom is None else max(bottom, y + h)
+        self._layers = sorted(list(temp_layers))
+        self._layout_extent = [left, top, right, bottom] if left is not None else None
+
+    def _load_sensors(self, entries):
+        for sensor in entries:
+            sensor_id = sensor["id"]
+            if sensor_id is not None:
+                self.sensors[sensor_id] = {
+                    "type": sensor['type'],
+                    'x': float(sensor['x']),
+                    'y': float(sensor['y']),
+                    'w': float(sensor['w']),
+                    'h': float(sensor['h']),
+                    'properties': sensor.get('properties', []),
+                    'triggered': False,
+                    "id": sensor_id
+                }
+
+    def _spawn_entities(self, layer_type, entries):
+        spawned = []
+
+        if layer_type == "enemies":
+            for enemy in entries:
+                enemy_type = enemy['type']
+                x = float(enemy['x'])
+                y = float(enemy['y'])
+                match enemy_type:
+                    case "flyer":
+                        surface = pygame.surface.Surface((16,16))
+                        surface.fill((255,0,0))
+                        enemy_sprite = Flyer(surface, (grid_to_px(x + self.pos.x), grid_to_px(y + self.pos.y)), self.game, self)
+                        self.enemies.append(enemy_sprite)
+                        self._spawned_enemies.append(enemy_sprite)
+                        spawned.append(enemy_sprite)
+
+                    case "groundCrawler":
+                        surface = pygame.surface.Surface((16,16))
+                        surface.fill((255,0,0))
+                        enemy_sprite = GroundCrawler(surface, (grid_to_px(x + self.pos.x), grid_to_px(y + self.pos.y)), self.game, self)
+                        self.enemies.append(enemy_sprite)
+                        self._spawned_enemies.append(enemy_sprite)
+                        spawned.append(enemy_sprite)
+
+        if layer_type == "npcs":
+            for npc in entries:
+                npc_type = npc['type']
+                x = float(npc['x'])
+                y = float(npc['y'])
+
+                match npc_type:
+                    case "simpleSpeaker":
+                        surface = pygame.surface.Surface((16, 16))
+                        surface.fill((0, 255, 0))
+                        npc_obj = SimpleSpeaker(surface, (grid_to_px(x + self.pos.x), grid_to_px(y + self.pos.y)), self.game, self, npc['text'])
+                        self.npcs.append(npc_obj)
+                    case "shop":
+                        surface = pygame.surface.Surface((16, 16))
+                        surface.fill((0, 255, 255))
+                        npc_obj = Shop((grid_to_px(x + self.pos.x), grid_to_px(y + self.pos.y)), self.game, npc['store'], self)
+                        self.npcs.append(npc_obj)
+                        self.game.screens['store'][self.npcs.get_id_by_sprite(npc_obj)] = StoreScreen(self.game, npc_obj)
+                    case _:
+                        surface = pygame.surface.Surface((16,16))
+                        surface.fill((255,0,0))
+                        npc_obj = NPC(surface, (grid_to_px(x + self.pos.x), grid_to_px(y + self.pos.y)), self.game, self)
+                        self.npcs.append(npc_obj)
+                spawned.append(npc_obj)
+
+        if layer_type == "chests":
+            for chest in entries:
+                x = float(chest['x'])
+                y = float(chest['y'])
+                chest_id = (int(x), int(y))
+                chest_obj = Chest((grid_to_px(x + self.pos.x), grid_to_px(y + self.pos.y)), self.game, self, chest.get('contains', []), chest_id, opened=chest_id in self.opened_chests)
+                self.chests.append(chest_obj)
+                spawned.append(chest_obj)
+
+        if layer_type == "platforms":
+            # {"x", "y", "w", "h", "path": [[x, y], ...], "speed", "properties"} in grid units
+            for entry in entries:
+                ts = self.tile_size
+                rect = pygame.Rect(int((entry['x'] + self.pos.x) * ts), int((entry['y'] + self.pos.y) * ts), int(entry.get('w', 1) * ts), int(entry.get('h', 1) * ts))
+                path = [((px + self.pos.x) * ts, (py + self.pos.y) * ts) for px, py in entry.get('path', [])]
+                platform = MovingPlatform(rect, self.game, self, path, entry.get('speed', 60), "one_way" in entry.get('properties', []))
+                self.platforms.append(platform)
+                if self.game is not None:
+                    self.game.dynamic_solids.add(platform)
+                spawned.append(platform)
+
+        return spawned
+
+    def _remove_platforms(self):
+        for platform in self.platforms.sprites():
+            self.game.dynamic_solids.remove(platform)
+        self.platforms = SpriteGroup()
+
+    def _add_breakables(self, entries, environment):
+        # Breakable blocks are ordinary solid tiles, so they share every tile cache and break through remove_tiles
+        for block in entries:
+            x, y = int(block['x']), int(block['y'])
+            if (x, y) in self.broken:
+                continue
+            self.tile_map[(x, y)] = {
+                'x': x,
+                'y': y,
+                'z': int(block['z']),
+                'environment': environment,
+                'type': block['type'],
+                'variant': block['variant'],
+                'properties': list(block.get('properties', [])) + ["solid", "breakable"],
+                'breakable': [x, y],
+                'health': block.get('health', 1),
+            }
+
+    def _expand_tile_layer(self, layer, environment):
+        for tile in layer['data']:
+            if "repeat" in tile["properties"]:
+                for x in range(tile["w"]):
+                    for y in range(tile["h"]):
+                        should_render = True
+                        if "alternate" in tile["properties"]:
+                            should_render = (x & int(tile["alternate"])) == 0
+
+                        world_x = int(tile['x'] + x)
+                        world_y = int(tile['y'] + y)
+                        tile_variant = tile["variant"]
+
+                        if should_render:
+                            if tile["render_cut"][0] != 0 and x == tile["w"] - 1:
+                                tile_variant = None
+
+                            self.tile_map[(world_x, world_y)] = {
+                                'x': world_x,
+                                'y': world_y,
+                                'z': int(tile['z']),
+                                'environment': environment,
+                                'type': tile["type"],
+                                'variant': tile_variant,
+                                'properties': tile["properties"]
+                            }
+                            if "animation" in tile and tile_variant is not None:
+                                self.tile_map[(world_x, world_y)]['animation'] = tile["animation"]
+                        else:
+                            self.tile_map[(world_x, world_y)] = {
+                                'x': world_x,
+                                'y': world_y,
+                                'z': int(tile['z']),
+                                'environment': environment,
+                                'type': tile["type"],
+                                'variant': None,
+                                'properties': tile["properties"]
+                            }
+
+                        if tile_variant is None:
+                            self.tile_map[(world_x, world_y)] = {
+                                'x': world_x,
+                                'y': world_y,
+                                'z': int(tile['z']),
+                                'environment': environment,
+                                'type': tile["type"],
+                                'variant': None,
+                                'properties': tile["properties"]
+                            }
+
+                        if "dark" in tile["properties"] and should_render:
+                            depth = int(tile["dark_depth"])
+                            try:
+                                solid = int(tile["solid_depth"])
+                            except ValueError:
+                                solid = depth
+                            if solid <= depth:
+                                for y1 in range(depth):
+                                    tile_x = int(tile['x'] + x)
+                                    tile_y = int(tile['y'] + y1)
+                                    if (tile_x, tile_y) not in self.tile_map:
+                                        if y1 <= solid:
+                                            self.tile_map[(tile_x, tile_y)] = {
+                                                'x': tile_x,
+                                                'y': tile_y,
+                                                'z': int(tile['z']),
+                                                'environment': environment,
+                                                'type': tile["type"],
+                                                'variant': "dark",
+                                                'properties': ["solid"],
+                                            }
+                                        else:
+                                            self.tile_map[(tile_x, tile_y)] = {
+                                                'x': tile_x,
+                                                'y': tile_y,
+                                                'z': int(tile['z']),
+                                                'environment': environment,
+                                                'type': tile["type"],
+                                                'variant': "dark",
+                                                'properties': [],
+                                            }
+                            else:
+                                for y1 in range(solid):
+                                    tile_x = int(tile['x'] + x)
+                                    tile_y = int(tile['y'] + y1)
+                                    if (tile_x, tile_y) not in self.tile_map:
+                                        if y1 < solid:
+                                            self.tile_map[(tile_x, tile_y)] = {
+                                                'x': tile_x,
+                                                'y': tile_y,
+                                                'z': int(tile['z']),
+                                                'environment': environment,
+                                                'type': tile["type"],
+                                                'variant': None,
+                                                'properties': ["solid"],
+                                            }
+
+                        if tile["solid_depth"] and "dark_depth" not in tile["properties"]:
+                            solid = int(tile["solid_depth"])
+                            for y1 in range(solid):
+                                tile_x = int(tile['x'] + x)
+                                tile_y = int(tile['y'] + y1)
+                                if (tile_x, tile_y) not in self.tile_map:
+                                    if y1 < solid:
+                                        self.tile_map[(tile_x, tile_y)] = {
+                                            'x': tile_x,
+                                            'y': tile_y,
+                                            'z': int(tile['z']),
+                                            'environment': environment,
+                                            'type': tile["type"],
+                                            'variant': None,
+                                            'properties': ["solid"],
+                                        }
+
+            else:
+                x, y, z = tile['x'], tile['y'], tile['z']
+                self.tile_map[(x, y)] = {
+                    'x': int(x),
+                    'y': int(y),
+                    'z': int(z),
+                    'environment': environment,
+                    'type': tile["type"],
+                    'variant': tile["variant"],
+                    'properties': tile["properties"]
+                }
+                if "animation" in tile:
+                    self.tile_map[(x, y)]['animation'] = tile["animation"]
+
+    def _build_caches(self):
+        self.tile_version += 1
+        self._solid_grid = None
+        self._build_layer_index()
+        self._build_spans()
+        self._bake_dark_chunks()
+        self._update_bounds()
+
+        minimap = getattr(self.game, 'minimap', None)
+        if minimap is not None and self.name is not None:
+            minimap.bake(self.name, self)
+
+    def _update_bounds(self):
+        ts = self.tile_size
+        self.bounds = pygame.Rect(int(self.pos.x * ts), int(self.pos.y * ts), int(self.width * ts), int(self.height * ts))
+
+        extent = self.bounds.copy()
+        if self.tile_map:
+            xs = [x for x, _ in self.tile_map]
+            ys = [y for _, y in self.tile_map]
+            extent.union_ip(pygame.Rect(min(xs) * ts, min(ys) * ts, (max(xs) - min(xs) + 1) * ts, (max(ys) - min(ys) + 1) * ts))
+        if self._layout_extent is not None:
+            left, top, right, bottom = self._layout_extent
+            extent.union_ip(pygame.Rect((left + self.pos.x) * ts, (top + self.pos.y) * ts, (right - left) * ts, (bottom - top) * ts))
+        for sensor in self.sensors.values():
+            extent.union_ip(pygame.Rect(sensor['x'] * ts, sensor['y'] * ts, max(1, sensor['w'] * ts), max(1, sensor['h'] * ts)))
+        self.extent = extent
+
+        index = getattr(self.game, 'world_index', None)
+        if index is not None and self.name is not None:
+            index.insert(self.name, self)
+
+    def move_to(self, pos):
+        """Shift the whole map (tiles and sensors) to a new grid position."""
+        dx = int(pos[0]) - int(self.pos.x)
+        dy = int(pos[1]) - int(self.pos.y)
+        self.pos = pygame.math.Vector2(*pos)
+
+        new_map = {}
+        for (x, y), tile in self.tile_map.items():
+            tile['x'] = x + dx
+            tile['y'] = y + dy
+            new_map[(tile['x'], tile['y'])] = tile
+        self.tile_map = new_map
+
+        for sensor in self.sensors.values():
+            sensor['x'] += dx
+            sensor['y'] += dy
+
+        self._compile_sensors()
+        self._build_caches()
+
+    def _build_layer_index(self):
+        # Sorted x columns of drawable tiles, keyed by layer then row
+        self._layer_rows = {}
+        self._animated_chunks = {}
+        self._solid_cells = set()
+        self._solid_rows = {}
+        for (x, y), tile in self.tile_map.items():
+            self._index_tile(x, y, tile)
+
+    def _index_tile(self, x, y, tile):
+        if 'solid' in tile.get('properties', []):
+            self._solid_cells.add((x, y))
+            insort(self._solid_rows.setdefault(y, []), x)
+
+        variant = tile.get('variant')
+        if variant is None or variant == "dark":
+            return
+        if self._get_animation(tile) is not None:
+            chunks = self._animated_chunks.setdefault(tile.get('z'), {})
+            chunks.setdefault((x // DARK_CHUNK_SIZE, y // DARK_CHUNK_SIZE), []).append((x, y))
+            return
+        rows = self._layer_rows.setdefault(tile.get('z'), {})
+        insort(rows.setdefault(y, []), x)
+
+    def _unindex_tile(self, x, y, tile):
+        solid = self._solid_rows.get(y)
+        if solid and 'solid' in tile.get('properties', []):
+            self._solid_cells.discard((x, y))
+            i = bisect_left(solid, x)
+            if i < len(solid) and solid[i] == x:
+                solid.pop(i)
+
+        animated = self._animated_chunks.get(tile.get('z'), {}).get((x // DARK_CHUNK_SIZE, y // DARK_CHUNK_SIZE))
+        if animated and (x, y) in animated:
+            animated.remove((x, y))
+
+        row = self._layer_rows.get(tile.get('z'), {}).get(y)
+        if not row:
+            return
+        i = bisect_left(row, x)
+        if i < len(row) and row[i] == x:
+            row.pop(i)
+
+    def set_tiles(self, tiles):
+        """Insert or replace world-space tiles, patching the caches around them instead of rebuilding."""
+        changed = []
+        for tile in tiles:
+            key = (tile['x'], tile['y'])
+            old = self.tile_map.get(key)
+            if old is not None:
+                self._unindex_tile(key[0], key[1], old)
+            self.tile_map[key] = tile
+            self._index_tile(key[0], key[1], tile)
+            if tile.get('z') not in self._layers:
+                insort(self._layers, tile.get('z'))
+            changed.append(key)
+        self._tiles_changed(changed)
+
+    def remove_tiles(self, cells, evicted=False):
+        """Remove tiles; evicted=True means they were only paged out, so the map keeps showing them."""
+        changed = []
+        for key in cells:
+            old = self.tile_map.pop(key, None)
+            if old is not None:
+                self._unindex_tile(key[0], key[1], old)
+                changed.append(key)
+        self._tiles_changed(changed, evicted)
+
+    def hit_breakables(self, rect, damage, already_hit=None):
+        """Damage breakable tiles overlapping rect, removing the ones that break. Returns the cells hit."""
+        ts = self.tile_size
+        hit = []
+        broken = []
+        for x in range(rect.left // ts, (rect.right - 1) // ts + 1):
+            for y in range(rect.top // ts, (rect.bottom - 1) // ts + 1):
+                tile = self.tile_map.get((x, y))
+                if tile is None or 'breakable' not in tile or (already_hit is not None and (x, y) in already_hit):
+                    continue
+                hit.append((x, y))
+                tile['health'] -= damage
+                if tile['health'] <= 0:
+                    self.broken.add(tuple(tile['breakable']))
+                    broken.append((x, y))
+
+        if already_hit is not None:
+            already_hit.update(hit)
+        self.remove_tiles(broken)
+        return hit
+
+    def _tiles_changed(self, cells, evicted=False):
+        if not cells:
+            return
+
+        self.tile_version += 1
+        self._solid_grid = None
+
+        # Bodies asleep on or next to the changed cells may have lost their footing
+        entities = getattr(self.game, 'entities', None)
+        if entities is not None:
+            ts = self.tile_size
+            xs = [x for x, _ in cells]
+            ys = [y for _, y in cells]
+            area = pygame.Rect(min(xs) * ts, min(ys) * ts, (max(xs) - min(xs) + 1) * ts, (max(ys) - min(ys) + 1) * ts).inflate(ts * 2, ts * 2)
+            for body in entities.query(area, ALL_LAYERS):
+                if hasattr(body, 'wake'):
+                    body.wake()
+
+        # A solid cell is the floor of its own row's spans and the ceiling of the row below
+        span_rows = set()
+        for x, y in cells:
+            span_rows.add(y)
+            span_rows.add(y + 1)
+        for y in span_rows:
+            self._build_span_row(y)
+
+        # A cell's darkness also shapes the fades of its left, right and upper neighbours
+        dark_chunks = set()
+        for x, y in cells:
+            for nx, ny in ((x, y), (x - 1, y), (x + 1, y), (x, y - 1)):
+                dark_chunks.add((nx // DARK_CHUNK_SIZE, ny // DARK_CHUNK_SIZE))
+        for cx, cy in dark_chunks:
+            self._bake_dark_chunk(cx, cy)
+
+        grown = self.extent.copy()
+        ts = self.tile_size
+        for x, y in cells:
+            grown.union_ip(pygame.Rect(x * ts, y * ts, ts, ts))
+        if grown != self.extent:
+            self.extent = grown
+            index = getattr(self.game, 'world_index', None)
+            if index is not None and self.name is not None:
+                index.update(self.name)
+
+        minimap = getattr(self.game, 'minimap', None)
+        if minimap is not None and self.name is not None and not evicted:
+            minimap.patch(self.name, self, cells)
+
+    def _is_solid_cell(self, x, y):
+        return (x, y) in self._solid_cells
+
+    def _build_spans(self):
+        self._span_rows = {}
+        for y in list(self._solid_rows):
+            self._build_span_row(y)
+
+    def _build_span_row(self, y):
+        # Runs of solid cells in row y with open space above them
+        spans = []
+        for x in self._solid_rows.get(y, ()):
+            if self._is_solid_cell(x, y - 1):
+                continue
+            if spans and spans[-1][1] == x - 1:
+                spans[-1] = (spans[-1][0], x)
+            else:
+                spans.append((x, x))
+
+        if spans:
+            self._span_rows[y] = spans
+        else:
+            self._span_rows.pop(y, None)
+
+    def iter_spans(self):
+        for y, spans in self._span_rows.items():
+            for left, right in spans:
+                yield y, left, right
+
+    def span_at(self, x, y):
+        """The walkable (left, right) span whose surface cell (x, y) belongs to, or None."""
+        spans = self._span_rows.get(y)
+        if not spans:
+            return None
+        i = bisect_right(spans, (x, float('inf'))) - 1
+        if i >= 0 and spans[i][0] <= x <= spans[i][1]:
+            return spans[i]
+        return None
+
+    def distance_to_ledge(self, px, py, direction):
+        """
+        Pixels from px to the end of the span under pixel (px, py) when walking in direction,
+        where the span ends at either a drop or a wall. None if there is no ground there.
+        """
+        ts = self.tile_size
+        span = self.span_at(int(px) // ts, int(py) // ts)
+        if span is None:
+            return None
+        if direction >= 0:
+            return (span[1] + 1) * ts - px
+        return px - span[0] * ts
+
+    def _default_ray_length(self):
+        return math.hypot(self.extent.width, self.extent.height)
+
+    def raycast(self, origin, direction, max_distance=None):
+        """First solid tile hit by a ray from origin (pixels), as {'distance', 'point', 'cell', 'normal'} or None."""
+        if max_distance is None:
+            max_distance = self._default_ray_length()
+        return raycast.cast_ray(self._is_solid_cell, self.tile_size, origin, direction, max_distance)
+
+    def line_of_sight(self, a, b):
+        """True if no solid tile lies on the segment between pixel positions a and b."""
+        direction = (b[0] - a[0], b[1] - a[1])
+        distance = math.hypot(*direction)
+        if distance == 0:
+            return not self._is_solid_cell(int(a[0]) // self.tile_size, int(a[1]) // self.tile_size)
+        return raycast.cast_ray(self._is_solid_cell, self.tile_size, a, direction, distance) is None
+
+    def _get_solid_grid(self):
+        # Dense [y, x] copy of the solid cells for batched casts, rebuilt after tiles change
+        if self._solid_grid is None:
+            if not self._solid_cells:
+                self._solid_grid = (raycast.np.zeros((1, 1), dtype=bool), (0, 0))
+            else:
+                xs = [x for x, _ in self._solid_cells]
+                ys = [y for _, y in self._solid_cells]
+                x0, y0 = min(xs), min(ys)
+                grid = raycast.np.zeros((max(ys) - y0 + 1, max(xs) - x0 + 1), dtype=bool)
+                grid[raycast.np.array(ys) - y0, raycast.np.array(xs) - x0] = True
+                self._solid_grid = (grid, (x0, y0))
+        return self._solid_grid
+
+    def raycast_many(self, origins, directions, max_distance=None):
+        """
+        Cast many rays in one call. Returns lists (distances, cells); a miss has an inf distance and a None cell.
+
+        Uses a vectorized traversal when numpy is installed, otherwise casts the rays one by one.
+        """
+        if max_distance is None:
+            max_distance = self._default_ray_length()
+
+        if raycast.np is not None:
+            grid, grid_origin = self._get_solid_grid()
+            return raycast.cast_rays(grid, grid_origin, self.tile_size, origins, directions, max_distance)
+
+        distances = []
+        cells = []
+        for origin, direction in zip(origins, directions):
+            hit = raycast.cast_ray(self._is_solid_cell, self.tile_size, origin, direction, max_distance)
+            distances.append(hit['distance'] if hit else math.inf)
+            cells.append(hit['cell'] if hit else None)
+        return distances, cells
+
+    def _is_dark(self, x, y):
+        tile = self.tile_map.get((x, y))
+        return tile is not None and (tile.get('variant') == 'dark' or 'dark' in tile.get('properties', []))
+
+    def _get_fade(self, direction):
+        return textures.fade_ramp(self.tile_size, self.tile_size, direction)
+
+    def _bake_dark_chunks(self):
+        self._dark_chunks = {}
+        chunks = set()
+        for (x, y) in self.tile_map:
+            if self._is_dark(x, y):
+                chunks.add((x // DARK_CHUNK_SIZE, y // DARK_CHUNK_SIZE))
+        for cx, cy in chunks:
+            self._bake_dark_chunk(cx, cy)
+
+    def _bake_dark_chunk(self, cx, cy):
+        ts = self.tile_size
+        drop = int(ts * 0.05)
+
+        cells = []
+        for lx in range(DARK_CHUNK_SIZE):
+            for ly in range(DARK_CHUNK_SIZE):
+                if self._is_dark(cx * DARK_CHUNK_SIZE + lx, cy * DARK_CHUNK_SIZE + ly):
+                    cells.append((lx, ly))
+
+        if not cells:
+            self._dark_chunks.pop((cx, cy), None)
+            return
+
+        # One extra row of tiles so bottom fades of the last row aren't clipped
+        chunk = pygame.Surface((DARK_CHUNK_SIZE * ts, (DARK_CHUNK_SIZE + 1) * ts + drop), pygame.SRCALPHA)
+        for lx, ly in cells:
+            x = cx * DARK_CHUNK_SIZE + lx
+            y = cy * DARK_CHUNK_SIZE + ly
+            tx = lx * ts
+            ty = ly * ts
+            # The old left / right fades were min-blended over this black cell and never showed
+            chunk.fill((0, 0, 0, 255), (tx, ty + drop, ts, ts))
+
+            if not self._is_dark(x, y + 1):
+                chunk.blit(self._get_fade('bottom'), (tx, ty + drop + ts))
+
+        self._dark_chunks[(cx, cy)] = chunk
+
     def get_tiles_around(self, pos):
         x, y = pos
         grid_x = x // self.tile_size
@@ -350,13 +943,7 @@ class TileMap:
     def contains_rect(self, rect):
         if self.tile_size <= 0 or self.width <= 0 or self.height <= 0:
             return False
-        bounds = pygame.Rect(
-            int(self.pos.x * self.tile_size),
-            int(self.pos.y * self.tile_size),
-            int(self.width * self.tile_size),
-            int(self.height * self.tile_size),
-        )
-        return bounds.colliderect(rect)
+        return self.bounds.colliderect(rect)
 
     def render(self, surface, camera_offset, layer):
         camera_offset = pygame.math.Vector2(camera_offset)
@@ -368,78 +955,45 @@ class TileMap:
         bottom = int((camera_offset.y + surf_h) // self.tile_size) + 1
 
         if len(self._layers) > 0 and layer == self._layers[0]:
-            for x in range(left, right + 1):
-                for y in range(top, bottom + 1):
-                    tile = self.tile_map.get((x, y))
-                    if not tile: continue
-                    if tile["variant"] == "dark" or "dark" in tile.get("properties", []):
-                        tx = tile['x'] * self.tile_size - camera_offset.x
-                        ty = tile['y'] * self.tile_size - camera_offset.y + (self.tile_size * 0.05)
-                        pygame.draw.rect(surface, (0, 0, 0), (tx, ty, self.tile_size, self.tile_size))
-
-                        def is_dark(itx, ity):
-                            t = self.tile_map.get((itx, ity))
-                            return t and (t.get('variant') == 'dark' or 'dark' in t.get('properties', []))
-
-                        has_bottom = is_dark(tile['x'], tile['y'] + 1)
-                        has_left = is_dark(tile['x'] - 1, tile['y'])
-                        has_right = is_dark(tile['x'] + 1, tile['y'])
-
-                        if not has_bottom:
-                            if 'bottom' not in self._fade_cache:
-                                f_surf = pygame.Surface((self.tile_size, self.tile_size), pygame.SRCALPHA)
-                                for i in range(self.tile_size):
-                                    alpha = int(255 * (1 - i / self.tile_size) * 0.5)
-                                    pygame.draw.line(f_surf, (0, 0, 0, alpha), (0, i), (self.tile_size, i))
-                                self._fade_cache['bottom'] = f_surf
-                            surface.blit(self._fade_cache['bottom'], (tx, ty + self.tile_size))
-
-                        if not has_left:
-                            if 'left' not in self._fade_cache:
-                                f_surf = pygame.Surface((self.tile_size, self.tile_size), pygame.SRCALPHA)
-                                for i in range(self.tile_size):
-                                    alpha = int(255 * (i / self.tile_size) * 0.5)
-                                    pygame.draw.line(f_surf, (0, 0, 0, alpha), (i, 0), (i, self.tile_size))
-                                self._fade_cache['left'] = f_surf
-                            surface.blit(self._fade_cache['left'], (tx, ty), special_flags=pygame.BLEND_RGBA_MIN)
-
-                        if not has_right:
-                            if 'right' not in self._fade_cache:
-                                f_surf = pygame.Surface((self.tile_size, self.tile_size), pygame.SRCALPHA)
-                                for i in range(self.tile_size):
-                                    alpha = int(255 * (1 - i / self.tile_size) * 0.5)
-                                    pygame.draw.line(f_surf, (0, 0, 0, alpha), (i, 0), (i, self.tile_size))
-                                self._fade_cache['right'] = f_surf
-                            surface.blit(self._fade_cache['right'], (tx, ty), special_flags=pygame.BLEND_RGBA_MIN)
+            chunk_px = DARK_CHUNK_SIZE * self.tile_size
+            for cx in range(left // DARK_CHUNK_SIZE, right // DARK_CHUNK_SIZE + 1):
+                for cy in range(top // DARK_CHUNK_SIZE - 1, bottom // DARK_CHUNK_SIZE + 1):
+                    chunk = self._dark_chunks.get((cx, cy))
+                    if chunk is not None:
+                        surface.blit(chunk, (cx * chunk_px - camera_offset.x, cy * chunk_px - camera_offset.y))
 
             self.chests.draw(surface, camera_offset)
+            self.platforms.draw(surface, (camera_offset.x, camera_offset.y))
             self.items.draw(surface, (camera_offset.x, camera_offset.y))
             self.enemies.draw(surface, (camera_offset.x, camera_offset.y))
-            self.breakables.draw(surface, (camera_offset.x, camera_offset.y))
             self.npcs.draw(surface, (camera_offset.x, camera_offset.y))
 
-        for x in range(left, right + 1):
-            for y in range(top, bottom + 1):
-                tile = self.tile_map.get((x, y))
-                if not tile or tile.get("z") != layer or tile.get("variant") is None or tile.get("variant") == "dark":
-                    continue
-
-                env = tile.get('environment')
-                ttype = tile.get('type')
-                variant = int(tile.get('variant'))
-                cache_key = (env, ttype, variant)
-
-                if cache_key not in self._tile_cache:
-                    try:
-                        img = self.game.assets[env][ttype].get_images_list()[variant]
-                        if env in scale_sizing and ttype in scale_sizing[env] and str(variant) in scale_sizing[env][ttype]:
-                            size = scale_sizing[env][ttype][str(variant)]
-                            img = pygame.transform.scale(img, size)
-                        self._tile_cache[cache_key] = img
-                    except (KeyError, IndexError):
-                        continue
-                
-                surface.blit(self._tile_cache[cache_key], (tile['x'] * self.tile_size - camera_offset.x, tile['y'] * self.tile_size - camera_offset.y))
+        rows = self._layer_rows.get(layer, {})
+        for y in range(top, bottom + 1):
+            row = rows.get(y)
+            if not row:
+                continue
+
+            for x in row[bisect_left(row, left):bisect_right(row, right)]:
+                tile = self.tile_map[(x, y)]
+                img = self._get_tile_image(tile.get('environment'), tile.get('type'), int(tile.get('variant')))
+                if img is not None:
+                    surface.blit(img, (tile['x'] * self.tile_size - camera_offset.x, tile['y'] * self.tile_size - camera_offset.y))
+
+        animated = self._animated_chunks.get(layer)
+        if animated:
+            clock = self.game.animation_time
+            for cx in range(left // DARK_CHUNK_SIZE, right // DARK_CHUNK_SIZE + 1):
+                for cy in range(top // DARK_CHUNK_SIZE, bottom // DARK_CHUNK_SIZE + 1):
+                    for x, y in animated.get((cx, cy), ()):
+                        if not (left <= x <= right and top <= y <= bottom):
+                            continue
+                        tile = self.tile_map[(x, y)]
+                        frames, fps = self._get_animation(tile)
+                        variant = int(frames[int(clock * fps) % len(frames)])
+                        img = self._get_tile_image(tile.get('environment'), tile.get('type'), variant)
+                        if img is not None:
+                            surface.blit(img, (x * self.tile_size - camera_offset.x, y * self.tile_size - camera_offset.y))
 
         self.crystals.draw(surface, (camera_offset.x, camera_offset.y))
 
@@ -450,6 +1004,59 @@ class TileMap:
                 self._tile_cache['overlay'] = overlay_img
             surface.blit(self._tile_cache['overlay'], (-camera_offset.x, - camera_offset.y))
 
+    def _get_tile_image(self, env, ttype, variant):
+        cache_key = (env, ttype, variant)
+        if cache_key not in self._tile_cache:
+            try:
+                img = self.game.assets[env][ttype].get_images_list()[variant]
+            except (KeyError, IndexError):
+                return None
+            if env in scale_sizing and ttype in scale_sizing[env] and str(variant) in scale_sizing[env][ttype]:
+                size = scale_sizing[env][ttype][str(variant)]
+                img = pygame.transform.scale(img, size)
+            self._tile_cache[cache_key] = img
+        return self._tile_cache[cache_key]
+
+    def get_collision_shape(self, tile):
+        """
+        None for a full solid box, ("one_way", None) for a jump-through top, or ("slope", heights)
+        where heights[column] is the surface depth below the tile's top, from the tileset's alpha.
+        """
+        properties = tile.get('properties', [])
+        if "one_way" in properties:
+            return ("one_way", None)
+        if "slope" not in properties:
+            return None
+
+        env, ttype, variant = tile.get('environment'), tile.get('type'), tile.get('variant')
+        key = (env, ttype, variant)
+        if key not in self._shape_cache:
+            ts = self.tile_size
+            try:
+                sheet = self.game.assets[env][ttype]
+                size = None
+                if env in scale_sizing and ttype in scale_sizing[env] and str(variant) in scale_sizing[env][ttype]:
+                    size = scale_sizing[env][ttype][str(variant)]
+                profile = sheet.get_height_profile(int(variant), size)
+            except (KeyError, IndexError, TypeError, ValueError):
+                profile = ()
+            heights = [profile[x] if x < len(profile) and profile[x] is not None and profile[x] < ts else None for x in range(ts)]
+            self._shape_cache[key] = ("slope", heights)
+        return self._shape_cache[key]
+
+    def _get_animation(self, tile):
+        """(frames, fps) for an animated tile, from the level entry or its sprite sheet's cut JSON."""
+        animation = tile.get('animation')
+        if animation is None and self.game is not None:
+            try:
+                sheet = self.game.assets[tile.get('environment')][tile.get('type')]
+            except (KeyError, TypeError):
+                return None
+            animation = getattr(sheet, 'animations', {}).get(str(tile.get('variant')))
+        if not animation or not animation.get('frames'):
+            return None
+        return animation['frames'], animation.get('fps', 8)
+
     def is_solid(self, pos, offset):
         x = pos[0] // self.tile_size
         y = pos[1] // self.tile_size
@@ -460,62 +1067,97 @@ class TileMap:
         tile = self.tile_map.get((x, y))
         return tile is not None and ("solid" in tile.get('properties', []))
 
-    def update(self, dt):
-        self.chests.update(dt)
-
-        self.items.update(dt)
-
-        self.crystals.update(dt)
-
-        self.breakables.update(dt)
-
-        self.npcs.update(dt)
+    def _due(self, group, dt):
+        # (sprite, dt) pairs to update this tick, after the simulation level of detail has had its say
+        group.set_sprite_group()
+        lod = getattr(self.game, 'lod', None)
+        if lod is None:
+            return [(sprite, dt) for sprite in group.sprites()]
+        return lod.due(group.sprites(), dt)
 
+    def update(self, dt):
+        if self.loaded:
+            # Platforms move first so bodies resolve against where they are this frame
+            self.platforms.update(dt)
+
+            # Entities of maps that aren't shown don't need simulating
+            if not self.rendered:
+                return
+
+            for group in (self.chests, self.items, self.crystals, self.npcs):
+                for sprite, sprite_dt in self._due(group, dt):
+                    sprite.update(sprite_dt)
+
+    def update_enemies(self, dt):
+        due = self._due(self.enemies, dt)
+        rest = due
+        if self.enemy_batch is not None and len(due) >= self.enemy_batch_threshold:
+            crawlers = [(enemy, enemy_dt) for enemy, enemy_dt in due if type(enemy) is GroundCrawler]
+            rest = [(enemy, enemy_dt) for enemy, enemy_dt in due if type(enemy) is not GroundCrawler]
+            rest += self.enemy_batch.update([enemy for enemy, _ in crawlers], [enemy_dt for _, enemy_dt in crawlers])
+        for enemy, enemy_dt in rest:
+            enemy.update(enemy_dt)
+
+    def index_entities(self, entities):
+        # Register everything that other bodies can touch in the world's spatial hash
+        for group in (self.enemies, self.npcs, self.chests, self.items, self.crystals):
+            for sprite in group.sprites():
+                layer = getattr(sprite, 'collision_layer', 0)
+                if layer:
+                    entities.update(sprite, layer)
+
+    def sleep_counts(self):
+        """(asleep, total) over this map's physics bodies."""
+        asleep = total = 0
+        for group in (self.chests, self.items, self.crystals, self.npcs, self.enemies):
+            for sprite in group.sprites():
+                if hasattr(sprite, 'sleeping'):
+                    total += 1
+                    asleep += sprite.sleeping
+        return asleep, total
+
+    def snapshot_positions(self):
+        # Remember where every moving sprite starts the tick so drawing can interpolate from there
+        for group in (self.platforms, self.chests, self.items, self.crystals, self.npcs, self.enemies):
+            for sprite in group.sprites():
+                if hasattr(sprite, 'prev_pos'):
+                    sprite.prev_pos.update(sprite.pos)
+
+    def _compile_sensors(self):
+        """Register this map's sensors as pre-parsed triggers in the game's SensorSystem."""
+        system = getattr(self.game, 'sensors', None)
+        if system is None:
+            return
+        system.remove_owner(self)
+
+        ts = self.tile_size
         for sensor in self.sensors.values():
-            if sensor["type"] == "render":
-                rect = pygame.Rect(sensor["x"] * self.tile_size,
-                                   sensor["y"] * self.tile_size,
-                                   sensor["w"] * self.tile_size,
-                                   sensor["h"] * self.tile_size)
-
-                player_in_sensor = rect.colliderect(self.game.player.rect)
-
-                for prop in sensor["properties"]:
-                    if "render" in prop and not sensor["triggered"] and "derender" not in prop and "toggle_render" not in prop:
-                        map_name = prop.split(":")[1]
-                        if player_in_sensor:
-                            self.game.tilemap_current = map_name
-                            self.game.tilemap = self.game.tilemaps[self.game.tilemap_current]
-                            self.game.tilemaps[map_name].rendered = True
-                            sensor["triggered"] = True
-
-                    if "derender" in prop and not sensor["triggered"]:
-                        map_name = prop.split(":")[1]
-                        if player_in_sensor:
-                            self.game.tilemap_current = map_name
-                            self.game.tilemap = self.game.tilemaps[self.game.tilemap_current]
-                            self.game.tilemaps[map_name].rendered = False
-                            sensor["triggered"] = True
-
-                    if "toggle_render" in prop and not sensor["triggered"]:
-                        map_name = prop.split(":")[1]
-                        if player_in_sensor:
-                            self.game.tilemaps[map_name].rendered = not self.game.tilemaps[map_name].rendered
-
-                            current_found = False
-                            for name, tilemap in self.game.tilemaps.items():
-                                if tilemap.rendered:
-                                    self.game.tilemap_current = name
-                                    self.game.tilemap = tilemap
-                                    current_found = True
-                                    break
-
-                            if not current_found:
-                                pass
-
-                            sensor["triggered"] = True
-
-                if sensor["triggered"] and not player_in_sensor:
-                    sensor["triggered"] = False
-
-
+            rect = pygame.Rect(sensor["x"] * ts, sensor["y"] * ts, sensor["w"] * ts, sensor["h"] * ts)
+            system.add(SensorTrigger(sensor["id"], sensor["type"], rect, compile_actions(sensor["properties"]), owner=self))
+
+    def _on_sensor_enter(self, trigger, body):
+        if trigger.owner is not self or trigger.kind != "render":
+            return
+
+        for action, map_name in trigger.actions:
+            if action == "render":
+                self.game.tilemap_current = map_name
+                self.game.tilemap = self.game.tilemaps[self.game.tilemap_current]
+                self.game.tilemaps[map_name].ensure_loaded()
+                self.game.tilemaps[map_name].rendered = True
+
+            elif action == "derender":
+                self.game.tilemap_current = map_name
+                self.game.tilemap = self.game.tilemaps[self.game.tilemap_current]
+                self.game.tilemaps[map_name].rendered = False
+
+            elif action == "toggle_render":
+                self.game.tilemaps[map_name].rendered = not self.game.tilemaps[map_name].rendered
+                if self.game.tilemaps[map_name].rendered:
+                    self.game.tilemaps[map_name].ensure_loaded()
+
+                for name, tilemap in self.game.tilemaps.items():
+                    if tilemap.rendered:
+                        self.game.tilemap_current = name
+                        self.game.tilemap = tilemap
+                        break
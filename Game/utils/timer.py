@@ -2,22 +2,43 @@ import pygame
 
 
 class Timer:
-    def __init__(self, duration, func=None):
+    """
+    One-shot timer. Given a TimerWheel (game.timers) it runs on game time and fires func by
+    itself when it runs out; without one it polls pygame.time.get_ticks() from update().
+    """
+
+    def __init__(self, duration, func=None, wheel=None):
         self.duration_ms = int(duration * 1000)
         self.func = func
+        self.wheel = wheel
         self.start_time = 0
         self.active = False
+        self._handle = None
 
     def activate(self):
         self.active = True
-        self.start_time = pygame.time.get_ticks()
+        if self.wheel is not None:
+            if self._handle is not None:
+                self._handle.cancel()
+            self._handle = self.wheel.schedule(self.duration_ms / 1000, self._expire)
+        else:
+            self.start_time = pygame.time.get_ticks()
 
     def deactivate(self):
         self.active = False
         self.start_time = 0
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def _expire(self):
+        self._handle = None
+        self.deactivate()
+        if self.func:
+            self.func()
 
     def finished(self):
-        if not self.active:
+        if not self.active or self.wheel is not None:
             return False
         return pygame.time.get_ticks() - self.start_time >= self.duration_ms
 
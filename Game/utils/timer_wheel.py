@@ -0,0 +1,120 @@
+import math
+
+
+class TimerHandle:
+    def __init__(self, due, callback):
+        self.due = due  # Wheel tick the timer fires on
+        self.callback = callback
+        self.active = True
+
+    def cancel(self):
+        # Cancelled timers are dropped when their slot comes up
+        self.active = False
+
+
+class TimerWheel:
+    """
+    Hierarchical timing wheel on game time.
+
+    Time advances in ticks of tick_length seconds. Level 0 has one slot per tick for the next
+    2**slot_bits ticks, each level above covers 2**slot_bits times as much time per slot. When
+    a lower level wraps round, the next slot of the level above is cascaded down, so every timer
+    ends up in the level 0 slot of the tick it fires on. A tick only touches that one slot (and
+    now and then a cascade), so the cost follows the timers that fire, not how many are pending.
+
+    Timers longer than the whole wheel are parked in the top level and re-cascaded each time
+    round until they are in range.
+    """
+
+    def __init__(self, tick_length=1 / 60, slot_bits=6, levels=4):
+        self.tick_length = tick_length
+        self.slot_bits = slot_bits
+        self.levels = levels
+        self._mask = (1 << slot_bits) - 1
+        self._wheels = [[[] for _ in range(1 << slot_bits)] for _ in range(levels)]
+        self.now = 0  # Ticks elapsed
+        self.time = 0.0  # Game time elapsed
+        # (id(target), key) -> handle of the countdown currently running on it
+        self._countdowns = {}
+        # Scheduled timers, cancelled ones included until their slot comes up
+        self.pending = 0
+
+    def _insert(self, handle):
+        delta = handle.due - self.now
+        for level in range(self.levels):
+            if delta < 1 << (self.slot_bits * (level + 1)) or level == self.levels - 1:
+                slot = (handle.due >> (self.slot_bits * level)) & self._mask
+                self._wheels[level][slot].append(handle)
+                return
+
+    def schedule(self, delay, callback):
+        """Call callback() after delay seconds of game time. Returns a handle that can cancel it."""
+        ticks = max(1, math.ceil(delay / self.tick_length - 1e-9))
+        handle = TimerHandle(self.now + ticks, callback)
+        self._insert(handle)
+        self.pending += 1
+        return handle
+
+    def countdown(self, target, key, duration):
+        """
+        Set target[key] (an attribute when target isn't a dict) to duration and back to 0 once it
+        runs out, so the usual "> 0" / "<= 0" checks keep working. Starting it again while it is
+        running restarts it.
+        """
+        running = self._countdowns.pop((id(target), key), None)
+        if running is not None:
+            running.cancel()
+
+        if isinstance(target, dict):
+            target[key] = duration
+        else:
+            setattr(target, key, duration)
+
+        def expire():
+            del self._countdowns[(id(target), key)]
+            if isinstance(target, dict):
+                target[key] = 0
+            else:
+                setattr(target, key, 0)
+
+        self._countdowns[(id(target), key)] = self.schedule(duration, expire)
+
+    def _cascade(self, level):
+        slot = (self.now >> (self.slot_bits * level)) & self._mask
+        handles = self._wheels[level][slot]
+        self._wheels[level][slot] = []
+        for handle in handles:
+            if handle.active:
+                self._insert(handle)
+            else:
+                self.pending -= 1
+
+    def _step(self):
+        self.now += 1
+        # Pull the timers of the slot we just reached down from each level that wrapped
+        for level in range(1, self.levels):
+            if (self.now >> (self.slot_bits * (level - 1))) & self._mask:
+                break
+            self._cascade(level)
+
+        slot = self.now & self._mask
+        handles = self._wheels[0][slot]
+        if not handles:
+            return
+        self._wheels[0][slot] = []
+        for handle in handles:
+            if not handle.active:
+                self.pending -= 1
+            elif handle.due > self.now:
+                # Parked beyond the wheel's range, not due yet
+                self._insert(handle)
+            else:
+                handle.active = False
+                self.pending -= 1
+                handle.callback()
+
+    def advance(self, dt):
+        self.time += dt
+        target = int(self.time / self.tick_length + 1e-9)
+        while self.now < target:
+            self._step()
@@ -44,7 +44,11 @@ class SpriteSheet:
         self.colorkey = colorkey
         self.scale = scale
 
-        self.cut = cut if cut is not None else {"0": (0, 0, 64, 64)}
+        self.cut = dict(cut) if cut is not None else {"0": (0, 0, 64, 64)}
+
+        # Optional {"variant": {"frames": [variants...], "fps": n}} entries for animated tiles
+        self.animations = self.cut.pop("animations", {})
+        self._height_profiles = {}
 
         if tile_size:
             self.get_images()
@@ -86,6 +90,26 @@ class SpriteSheet:
             sprites.append(self.images[key])
         return sprites
 
+    def get_height_profile(self, variant, size=None):
+        """Per-column depth of the first opaque pixel of an image (None for empty columns), computed once."""
+        key = (variant, size)
+        if key not in self._height_profiles:
+            img = self.get_images_list()[variant]
+            if size is not None:
+                img = pygame.transform.scale(img, size)
+            mask = pygame.mask.from_surface(img)
+            width, height = mask.get_size()
+            profile = []
+            for x in range(width):
+                top = None
+                for y in range(height):
+                    if mask.get_at((x, y)):
+                        top = y
+                        break
+                profile.append(top)
+            self._height_profiles[key] = tuple(profile)
+        return self._height_profiles[key]
+
     def get_debug_image(self):
         base = load_image(self.path, colorkey=self.colorkey)
         base_copy = base.copy()
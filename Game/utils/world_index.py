@@ -0,0 +1,143 @@
+import math
+
+import pygame
+
+
+class WorldIndex:
+    """Uniform grid over tilemap bounds so point/rect lookups only touch nearby rooms."""
+
+    def __init__(self, cell_size=1024):
+        self.cell_size = cell_size
+        self._cells = {}
+        self._entries = {}
+        self._next_order = 0
+
+    def _cells_for(self, rect):
+        cs = self.cell_size
+        for cx in range(rect.left // cs, (rect.right - 1) // cs + 1):
+            for cy in range(rect.top // cs, (rect.bottom - 1) // cs + 1):
+                yield cx, cy
+
+    def insert(self, name, tilemap):
+        if name in self._entries:
+            self.update(name)
+            return
+
+        self._entries[name] = {
+            "tilemap": tilemap,
+            "order": self._next_order,
+            "cells": [],
+        }
+        self._next_order += 1
+        self.update(name)
+
+    def update(self, name):
+        entry = self._entries.get(name)
+        if entry is None:
+            return
+
+        for cell in entry["cells"]:
+            bucket = self._cells.get(cell)
+            if bucket is not None:
+                bucket.discard(name)
+                if not bucket:
+                    del self._cells[cell]
+
+        extent = entry["tilemap"].extent
+        entry["cells"] = list(self._cells_for(extent)) if extent.width > 0 and extent.height > 0 else []
+        for cell in entry["cells"]:
+            self._cells.setdefault(cell, set()).add(name)
+
+    def remove(self, name):
+        entry = self._entries.pop(name, None)
+        if entry is None:
+            return
+        for cell in entry["cells"]:
+            bucket = self._cells.get(cell)
+            if bucket is not None:
+                bucket.discard(name)
+                if not bucket:
+                    del self._cells[cell]
+
+    def _candidates(self, rect):
+        names = set()
+        for cell in self._cells_for(rect):
+            bucket = self._cells.get(cell)
+            if bucket:
+                names.update(bucket)
+        return sorted(names, key=lambda n: self._entries[n]["order"])
+
+    def query_rect(self, rect):
+        """Every (name, tilemap) whose tiles or sensors overlap rect, in insertion order."""
+        rect = pygame.Rect(rect)
+        found = []
+        for name in self._candidates(rect):
+            tilemap = self._entries[name]["tilemap"]
+            if tilemap.extent.colliderect(rect):
+                found.append((name, tilemap))
+        return found
+
+    def query_point(self, pos):
+        return self.query_rect(pygame.Rect(int(pos[0]), int(pos[1]), 1, 1))
+
+    def find_owner(self, rect):
+        """The first tilemap (in insertion order) whose declared bounds overlap rect."""
+        rect = pygame.Rect(rect)
+        for name in self._candidates(rect):
+            tilemap = self._entries[name]["tilemap"]
+            if tilemap.bounds.colliderect(rect):
+                return name, tilemap
+        return None, None
+
+    def _ray_candidates(self, origin, direction, max_distance):
+        length = math.hypot(*direction)
+        if length == 0:
+            return []
+        end = (origin[0] + direction[0] / length * max_distance, origin[1] + direction[1] / length * max_distance)
+        left, top = min(origin[0], end[0]), min(origin[1], end[1])
+        box = pygame.Rect(int(left), int(top), int(abs(end[0] - origin[0])) + 1, int(abs(end[1] - origin[1])) + 1)
+        return [tilemap for _, tilemap in self.query_rect(box) if tilemap.loaded]
+
+    def raycast(self, origin, direction, max_distance):
+        """Nearest solid hit across every loaded tilemap the ray passes over, with 'tilemap' added, or None."""
+        nearest = None
+        for tilemap in self._ray_candidates(origin, direction, max_distance):
+            hit = tilemap.raycast(origin, direction, max_distance)
+            if hit is not None and (nearest is None or hit['distance'] < nearest['distance']):
+                hit['tilemap'] = tilemap
+                nearest = hit
+        return nearest
+
+    def raycast_many(self, origins, directions, max_distance):
+        """
+        Batched raycast: lists (distances, cells, tilemaps) with the nearest hit of each ray
+        across every loaded tilemap the rays pass over. A miss has inf, None, None.
+        """
+        distances = [math.inf] * len(origins)
+        cells = [None] * len(origins)
+        tilemaps = [None] * len(origins)
+
+        # One batch per tilemap in the box round all the rays; rays that don't reach it just miss
+        xs = []
+        ys = []
+        for origin, direction in zip(origins, directions):
+            length = math.hypot(*direction)
+            if length:
+                xs += [origin[0], origin[0] + direction[0] / length * max_distance]
+                ys += [origin[1], origin[1] + direction[1] / length * max_distance]
+        if not xs:
+            return distances, cells, tilemaps
+        box = pygame.Rect(int(min(xs)), int(min(ys)), int(max(xs) - min(xs)) + 1, int(max(ys) - min(ys)) + 1)
+        for tilemap in [tilemap for _, tilemap in self.query_rect(box) if tilemap.loaded]:
+            map_distances, map_cells = tilemap.raycast_many(origins, directions, max_distance)
+            for i, distance in enumerate(map_distances):
+                if distance < distances[i]:
+                    distances[i] = distance
+                    cells[i] = map_cells[i]
+                    tilemaps[i] = tilemap
+        return distances, cells, tilemaps
+
+    def line_of_sight(self, a, b):
+        direction = (b[0] - a[0], b[1] - a[1])
+        distance = math.hypot(*direction)
+        return all(tilemap.line_of_sight(a, b) for tilemap in self._ray_candidates(a, direction, distance))
@@ -0,0 +1,56 @@
+"""
+Hundreds of breakable blocks in view: cost of breaking them one at a time, and of drawing them.
+
+    python -m benchmarks.breakables [count]
+"""
+import sys
+import time
+
+import pygame
+
+from benchmarks.common import make_game
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    game = make_game()
+    tilemap = game.tilemaps["cave"]
+    tilemap.ensure_loaded()
+    ts = tilemap.tile_size
+
+    # A wall of blocks from the top of the camera view down, as wide as the view
+    game.camera.update(game.player, 1.0)
+    view = game.camera.view_rect()
+    columns = max(1, view.width // ts)
+    left, top = view.left // ts, view.top // ts
+    tiles = []
+    for i in range(count):
+        x, y = left + i % columns, top + i // columns
+        tiles.append({'x': x, 'y': y, 'z': 5, 'environment': 'cave', 'type': 'big_rocks', 'variant': 0,
+                      'properties': ['solid', 'breakable'], 'breakable': [x, y], 'health': 1})
+    tilemap.set_tiles(tiles)
+
+    def draw_frame():
+        start = time.perf_counter()
+        for layer in tilemap._layers:
+            tilemap.render(game.screen, game.camera.offset, layer)
+        return time.perf_counter() - start
+
+    draw_full = min(draw_frame() for _ in range(10))
+
+    times = []
+    for tile in tiles:
+        start = time.perf_counter()
+        tilemap.hit_breakables(pygame.Rect(tile['x'] * ts + 1, tile['y'] * ts + 1, 4, 4), 1)
+        times.append(time.perf_counter() - start)
+    draw_empty = min(draw_frame() for _ in range(10))
+
+    times.sort()
+    print(f"{count} breakables in view, broken one at a time")
+    print(f"  total {sum(times) * 1000:.1f} ms, per break median {times[len(times) // 2] * 1000:.3f} ms, "
+          f"worst {times[-1] * 1000:.3f} ms")
+    print(f"  drawing the map: {draw_full * 1000:.2f} ms with the blocks, {draw_empty * 1000:.2f} ms after")
+
+
+if __name__ == "__main__":
+    main()
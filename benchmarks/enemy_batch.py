@@ -0,0 +1,63 @@
+"""
+Enemy updates per tick: the batched GroundCrawler update against updating each one as an object.
+
+    python -m benchmarks.enemy_batch
+
+Runs 10, 100, 1000 and 10000 crawlers walking the cave map and prints ms per tick for both.
+Needs numpy; without it every crawler is updated as an object anyway.
+"""
+import random
+
+import pygame
+
+from benchmarks.common import make_game, best_time
+
+CRAWLER_SIZE = 24
+
+
+def spawn(game, tilemap, count, seed):
+    from Game.Sprites.Enemies.GroundCrawler import GroundCrawler
+
+    rng = random.Random(seed)
+    spans = list(tilemap.iter_spans())
+    ts = tilemap.tile_size
+    image = pygame.Surface((CRAWLER_SIZE, CRAWLER_SIZE))
+    crawlers = []
+    while len(crawlers) < count:
+        row, left, right = rng.choice(spans)
+        x = rng.randint(left * ts, (right + 1) * ts - CRAWLER_SIZE)
+        crawler = GroundCrawler(image, (x, row * ts - CRAWLER_SIZE), game, tilemap)
+        crawler.direction = rng.choice([-1, 1])
+        crawlers.append(crawler)
+    return crawlers
+
+
+def main():
+    game = make_game()
+    tilemap = game.tilemaps["cave"]
+    tilemap.ensure_loaded()
+    if tilemap.enemy_batch is None:
+        print("numpy is not installed, nothing to compare")
+        return
+
+    for count in (10, 100, 1000, 10000):
+        ticks = max(5, 2000 // count)
+        timings = []
+        for threshold in (10 ** 9, 0):
+            tilemap.enemies.empty()
+            for crawler in spawn(game, tilemap, count, count):
+                tilemap.enemies.append(crawler)
+            tilemap.enemy_batch_threshold = threshold
+
+            def run():
+                for _ in range(ticks):
+                    tilemap.update_enemies(1 / 60)
+
+            timings.append(best_time(run, repeat=3) / ticks)
+        objects, batched = timings
+        print(f"{count:6d} crawlers  objects {objects * 1000:8.3f} ms/tick  batched {batched * 1000:8.3f} ms/tick  "
+              f"x{objects / batched:5.1f}")
+
+
+if __name__ == "__main__":
+    main()
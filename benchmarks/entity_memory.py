@@ -0,0 +1,127 @@
+"""
+Memory per entity and update throughput of the slotted sprite classes against dict-backed copies.
+
+    python -m benchmarks.entity_memory [count]
+
+The dict-backed baseline is the same sprite modules recompiled with every __slots__ taken out,
+so the comparison shows what the slots themselves are worth. Builds count (default 5000)
+GroundCrawlers, Flyers and NPCs of both kinds under tracemalloc and prints the bytes each one
+costs and how long creating it takes (tracemalloc slows that down), then times update passes
+over the crawlers.
+"""
+import ast
+import gc
+import importlib
+import inspect
+import sys
+import time
+import tracemalloc
+
+from benchmarks.common import make_game, best_time
+
+# In import order, so each copy can be handed the copies it builds on
+SLOTTED_MODULES = (
+    "Game.Sprites.Sprite",
+    "Game.Sprites.PhysicsSprite",
+    "Game.Sprites.Enemy",
+    "Game.Sprites.Enemies.GroundCrawler",
+    "Game.Sprites.Enemies.Flyer",
+    "Game.Sprites.NPC",
+)
+
+
+class _Unslot(ast.NodeTransformer):
+    def __init__(self, copied):
+        self.copied = copied
+
+    def visit_ClassDef(self, node):
+        node.body = [statement for statement in node.body
+                     if not (isinstance(statement, ast.Assign)
+                             and any(isinstance(target, ast.Name) and target.id == "__slots__" for target in statement.targets))]
+        node.body = node.body or [ast.Pass()]
+        return node
+
+    def visit_ImportFrom(self, node):
+        # Imports of classes that have been copied already come from the copies instead
+        if all(alias.name in self.copied for alias in node.names):
+            return None
+        return node
+
+
+def unslotted_classes():
+    """Name -> dict-backed copy of every class in the slotted sprite modules."""
+    copied = {}
+    for name in SLOTTED_MODULES:
+        module = importlib.import_module(name)
+        tree = _Unslot(copied).visit(ast.parse(inspect.getsource(module)))
+        namespace = dict(copied, __name__=name + "_unslotted")
+        exec(compile(ast.fix_missing_locations(tree), module.__file__, "exec"), namespace)
+        for key, value in namespace.items():
+            if isinstance(value, type) and value.__module__ == namespace["__name__"]:
+                copied[key] = value
+    return copied
+
+
+def measure(make, count):
+    """(objects, bytes per object, seconds per object) for count calls of make()."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    start = time.perf_counter()
+    objects = [make() for _ in range(count)]
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'filename')) - sys.getsizeof(objects)
+    return objects, size / count, elapsed / count
+
+
+def update_times(groups, rounds=5):
+    """Fastest update pass over each group of crawlers, taking turns so drift hits both alike."""
+    for crawlers in groups.values():
+        # Keep them all awake so every pass does the full update
+        for crawler in crawlers:
+            crawler.can_sleep = False
+
+    best = {}
+    for _ in range(rounds):
+        for label, crawlers in groups.items():
+            elapsed = best_time(lambda: [crawler.update(1 / 60) for crawler in crawlers], repeat=1)
+            best[label] = min(elapsed, best.get(label, elapsed))
+    return best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    game = make_game()
+
+    from Game.Sprites.Enemies.Flyer import Flyer
+    from Game.Sprites.Enemies.GroundCrawler import GroundCrawler
+    from Game.Sprites.NPC import NPC
+
+    tilemap = game.tilemaps["cave"]
+    tilemap.ensure_loaded()
+    template = next(enemy for enemy in tilemap.enemies.sprites() if type(enemy) is GroundCrawler)
+    image, position = template.image, template.rect.topleft
+    unslotted = unslotted_classes()
+
+    crawlers = {}
+    for cls in (GroundCrawler, Flyer, NPC):
+        baseline = unslotted[cls.__name__]
+        old, old_size, old_created = measure(lambda: baseline(image, position, game, tilemap), count)
+        new, new_size, new_created = measure(lambda: cls(image, position, game, tilemap), count)
+        assert "pos" in vars(old[0]) and "pos" not in vars(new[0])
+        print(f"{cls.__name__:14s} {old_size:7.0f} -> {new_size:7.0f} bytes each  "
+              f"{old_created * 1e6:7.1f} -> {new_created * 1e6:7.1f} us to create")
+        if cls is GroundCrawler:
+            crawlers = {"dict-backed": old, "slotted": new}
+        del old, new
+
+    for label, elapsed in update_times(crawlers).items():
+        print(f"update {label:11s} {elapsed * 1000:8.2f} ms per pass over {count} crawlers "
+              f"({count / elapsed:.0f} updates/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Ray casts per frame: TileMap.raycast_many against casting the same rays one by one.
+
+    python -m benchmarks.raycast [budget_ms]
+
+Prints the time per batch and how many rays fit in the per-frame budget (default 4 ms).
+"""
+import math
+import random
+import sys
+
+from benchmarks.common import make_game, best_time
+
+
+def main():
+    budget_ms = float(sys.argv[1]) if len(sys.argv) > 1 else 4.0
+    game = make_game()
+    tilemap = game.tilemaps["cave"]
+    tilemap.ensure_loaded()
+    origin = game.player.rect.center
+    rng = random.Random(1)
+
+    for count in (1000, 2000, 5000, 10000):
+        origins = [origin] * count
+        directions = [(math.cos(a), math.sin(a)) for a in (rng.uniform(0, math.tau) for _ in range(count))]
+
+        # The batched and single casts have to agree for the comparison to mean anything
+        distances, _ = tilemap.raycast_many(origins, directions, 600)
+        for i in range(0, count, 97):
+            hit = tilemap.raycast(origins[i], directions[i], 600)
+            single = hit['distance'] if hit else math.inf
+            assert single == distances[i] or abs(single - distances[i]) < 1e-6, (i, single, distances[i])
+
+        batched = best_time(lambda: tilemap.raycast_many(origins, directions, 600))
+        single = best_time(lambda: [tilemap.raycast(o, d, 600) for o, d in zip(origins, directions)], repeat=2)
+        print(f"{count:6d} rays  batched {batched * 1000:8.2f} ms  one by one {single * 1000:8.2f} ms  "
+              f"-> {int(count * budget_ms / 1000 / batched):7d} rays per {budget_ms:g} ms frame budget")
+
+
+if __name__ == "__main__":
+    main()
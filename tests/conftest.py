@@ -0,0 +1,15 @@
+import os
+import sys
+
+# Headless pygame, and the repo root on the path and as cwd since asset paths are relative to it
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import pygame
+
+pygame.init()
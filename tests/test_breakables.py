@@ -0,0 +1,104 @@
+import random
+
+import pygame
+
+from Game.utils.tilemaps import TileMap
+
+TS = 32
+
+
+def _tile(x, y, solid=True, breakable=False, dark=False):
+    properties = ["solid"] if solid else []
+    tile = {'x': x, 'y': y, 'z': 5, 'environment': 'cave', 'type': 'big_rocks',
+            'variant': 'dark' if dark else 0, 'properties': properties}
+    if breakable:
+        tile['properties'] = properties + ["breakable"]
+        tile['breakable'] = [x, y]
+        tile['health'] = 1
+    return tile
+
+
+def _field(seed):
+    """A floor with a wall of several hundred breakables on it, some of them dark, and dark rock around."""
+    rng = random.Random(seed)
+    tilemap = TileMap(None, tile_size=TS)
+    for x in range(-2, 34):
+        tilemap.tile_map[(x, 20)] = _tile(x, 20)
+    for x in range(30):
+        for y in range(5, 20):
+            tilemap.tile_map[(x, y)] = _tile(x, y, breakable=True, dark=rng.random() < 0.2)
+    for y in range(0, 21):
+        tilemap.tile_map[(-1, y)] = _tile(-1, y, dark=True)
+        tilemap.tile_map[(30, y)] = _tile(30, y, dark=True)
+    tilemap._build_caches()
+    return tilemap
+
+
+def _rebuilt(tilemap):
+    """The same tiles with every derived structure built from scratch."""
+    fresh = TileMap(None, tile_size=TS)
+    fresh.tile_map = {key: dict(tile) for key, tile in tilemap.tile_map.items()}
+    fresh._build_layer_index()
+    fresh._build_spans()
+    fresh._bake_dark_chunks()
+    return fresh
+
+
+def _assert_matches_rebuild(tilemap):
+    fresh = _rebuilt(tilemap)
+    assert tilemap._solid_cells == fresh._solid_cells
+    assert {y: xs for y, xs in tilemap._solid_rows.items() if xs} == fresh._solid_rows
+    assert tilemap._span_rows == fresh._span_rows
+    assert set(tilemap._dark_chunks) == set(fresh._dark_chunks)
+    for key, chunk in fresh._dark_chunks.items():
+        assert pygame.image.tobytes(tilemap._dark_chunks[key], "RGBA") == pygame.image.tobytes(chunk, "RGBA"), key
+
+
+def test_field_has_hundreds_of_breakables():
+    tilemap = _field(0)
+    breakables = [key for key, tile in tilemap.tile_map.items() if 'breakable' in tile]
+    assert len(breakables) == 450
+    _assert_matches_rebuild(tilemap)
+
+
+def test_each_break_patches_caches_like_a_rebuild():
+    tilemap = _field(1)
+    cells = [key for key, tile in tilemap.tile_map.items() if 'breakable' in tile]
+    random.Random(1).shuffle(cells)
+
+    for x, y in cells:
+        version = tilemap.tile_version
+        hit = tilemap.hit_breakables(pygame.Rect(x * TS + 4, y * TS + 4, 8, 8), 1)
+        assert hit == [(x, y)]
+        assert (x, y) not in tilemap.tile_map
+        assert (x, y) in tilemap.broken
+        assert tilemap.tile_version == version + 1
+        _assert_matches_rebuild(tilemap)
+
+
+def test_breaking_everything_in_view_at_once():
+    tilemap = _field(2)
+    view = pygame.Rect(0, 5 * TS, 30 * TS, 15 * TS)
+    version = tilemap.tile_version
+    hit = tilemap.hit_breakables(view, 1)
+    assert len(hit) == 450
+    assert tilemap.tile_version == version + 1
+    assert not any('breakable' in tile for tile in tilemap.tile_map.values())
+    _assert_matches_rebuild(tilemap)
+
+
+def test_damage_below_health_and_already_hit_cells():
+    tilemap = _field(3)
+    tile = tilemap.tile_map[(3, 10)]
+    tile['health'] = 2
+    version = tilemap.tile_version
+    already_hit = set()
+    rect = pygame.Rect(3 * TS + 4, 10 * TS + 4, 8, 8)
+
+    assert tilemap.hit_breakables(rect, 1, already_hit) == [(3, 10)]
+    assert (3, 10) in tilemap.tile_map and tilemap.tile_version == version
+    # The same swing doesn't hit the same block twice
+    assert tilemap.hit_breakables(rect, 1, already_hit) == []
+    assert tilemap.hit_breakables(rect, 1) == [(3, 10)]
+    assert (3, 10) not in tilemap.tile_map and tilemap.tile_version == version + 1
+    _assert_matches_rebuild(tilemap)
@@ -0,0 +1,56 @@
+import random
+
+import pygame
+
+from Game.utils.tilemaps import TileMap, DARK_CHUNK_SIZE
+
+TS = 32
+
+
+def _fade(direction):
+    # The fade surfaces the per-tile drawing built
+    surface = pygame.Surface((TS, TS), pygame.SRCALPHA)
+    for i in range(TS):
+        if direction == 'bottom':
+            pygame.draw.line(surface, (0, 0, 0, int(255 * (1 - i / TS) * 0.5)), (0, i), (TS, i))
+        elif direction == 'left':
+            pygame.draw.line(surface, (0, 0, 0, int(255 * (i / TS) * 0.5)), (i, 0), (i, TS))
+        else:
+            pygame.draw.line(surface, (0, 0, 0, int(255 * (1 - i / TS) * 0.5)), (i, 0), (i, TS))
+    return surface
+
+
+def _draw_per_tile(tilemap, surface, chunk):
+    """The dark tile drawing the baked chunks replaced, for the tiles of one chunk."""
+    fades = {direction: _fade(direction) for direction in ('bottom', 'left', 'right')}
+    ox, oy = chunk[0] * DARK_CHUNK_SIZE * TS, chunk[1] * DARK_CHUNK_SIZE * TS
+    for x, y in tilemap.tile_map:
+        if not tilemap._is_dark(x, y) or (x // DARK_CHUNK_SIZE, y // DARK_CHUNK_SIZE) != chunk:
+            continue
+        tx = x * TS - ox
+        ty = y * TS - oy + TS * 0.05
+        pygame.draw.rect(surface, (0, 0, 0), (tx, ty, TS, TS))
+        if not tilemap._is_dark(x, y + 1):
+            surface.blit(fades['bottom'], (tx, ty + TS))
+        if not tilemap._is_dark(x - 1, y):
+            surface.blit(fades['left'], (tx, ty), special_flags=pygame.BLEND_RGBA_MIN)
+        if not tilemap._is_dark(x + 1, y):
+            surface.blit(fades['right'], (tx, ty), special_flags=pygame.BLEND_RGBA_MIN)
+
+
+def test_baked_chunks_match_per_tile_drawing():
+    rng = random.Random(0)
+    tilemap = TileMap(None, tile_size=TS)
+    for x in range(-5, 40):
+        for y in range(-5, 40):
+            if rng.random() < 0.4:
+                tilemap.tile_map[(x, y)] = {'x': x, 'y': y, 'variant': 'dark', 'properties': ['solid']}
+    tilemap._bake_dark_chunks()
+
+    for key, chunk in tilemap._dark_chunks.items():
+        baked = pygame.Surface(chunk.get_size())
+        baked.fill((90, 90, 90))
+        drawn = baked.copy()
+        baked.blit(chunk, (0, 0))
+        _draw_per_tile(tilemap, drawn, key)
+        assert pygame.image.tobytes(baked, "RGB") == pygame.image.tobytes(drawn, "RGB"), key
@@ -0,0 +1,90 @@
+import random
+
+import pygame
+import pytest
+
+pytest.importorskip("numpy")
+
+import Game
+from Game.Sprites.Enemies.GroundCrawler import GroundCrawler
+
+CRAWLER_SIZE = 24
+
+
+@pytest.fixture(scope="module")
+def game():
+    return Game.Game()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # The flip cooldown reads pygame's clock; step it by hand so both paths see the same times
+    now = [0]
+    monkeypatch.setattr(pygame.time, "get_ticks", lambda: now[0])
+    return now
+
+
+def _spawn(game, tilemap, count, seed):
+    """Crawlers dropped just above random walkable spans, some rising, some falling."""
+    rng = random.Random(seed)
+    spans = list(tilemap.iter_spans())
+    ts = tilemap.tile_size
+    image = pygame.Surface((CRAWLER_SIZE, CRAWLER_SIZE))
+    crawlers = []
+    while len(crawlers) < count:
+        row, left, right = rng.choice(spans)
+        x = rng.randint(left * ts, (right + 1) * ts - CRAWLER_SIZE)
+        y = row * ts - CRAWLER_SIZE - rng.randint(0, 40)
+        direction = rng.choice([-1, 1])
+        fall = rng.uniform(-200, 100)
+        rect = pygame.Rect(x, y, CRAWLER_SIZE, CRAWLER_SIZE)
+        if any(tilemap._is_solid_cell(cx, cy)
+               for cx in range(rect.left // ts, (rect.right - 1) // ts + 1)
+               for cy in range(rect.top // ts, (rect.bottom - 1) // ts + 1)):
+            continue
+        crawler = GroundCrawler(image, (x, y), game, tilemap)
+        crawler.direction = direction
+        crawler.velocity.y = fall
+        crawlers.append(crawler)
+    return crawlers
+
+
+def _update(tilemap, crawlers, batched, dt):
+    tilemap.enemies.empty()
+    for crawler in crawlers:
+        tilemap.enemies.append(crawler)
+    tilemap.enemy_batch_threshold = 0 if batched else 10 ** 9
+    tilemap.update_enemies(dt)
+
+
+def _state(crawler):
+    return (tuple(crawler.rect), tuple(crawler.pos), tuple(crawler.velocity), crawler.direction,
+            crawler.last_flip_ts, crawler.collisions.bits)
+
+
+@pytest.mark.parametrize("seed", [1, 2])
+def test_batched_update_matches_per_object(game, clock, seed):
+    tilemap = game.tilemaps["cave"]
+    tilemap.ensure_loaded()
+    threshold = tilemap.enemy_batch_threshold
+    enemies = tilemap.enemies.sprites()
+    objects = _spawn(game, tilemap, 150, seed)
+    batched = _spawn(game, tilemap, 150, seed)
+
+    try:
+        # Long enough for everything to land, walk into walls, turn at ledges and turn again
+        for tick in range(400):
+            clock[0] += 17
+            _update(tilemap, objects, False, 1 / 60)
+            _update(tilemap, batched, True, 1 / 60)
+            for i, (expected, actual) in enumerate(zip(objects, batched)):
+                assert _state(actual) == _state(expected), (tick, i)
+    finally:
+        tilemap.enemy_batch_threshold = threshold
+        tilemap.enemies.empty()
+        for enemy in enemies:
+            tilemap.enemies.append(enemy)
+
+    # The comparison is only worth something if crawlers turned and the batch did the work
+    assert any(crawler.last_flip_ts for crawler in objects)
+    assert len(tilemap.enemy_batch.update(batched, 1 / 60)) < len(batched) // 2
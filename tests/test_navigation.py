@@ -0,0 +1,76 @@
+import pytest
+
+import Game
+from Game.utils.navigation import JUMP_PENALTY
+
+
+@pytest.fixture
+def cave():
+    game = Game.Game()
+    tilemap = game.tilemaps["cave"]
+    tilemap.ensure_loaded()
+    return game, tilemap
+
+
+def _route_with(nav, start, kinds):
+    # A goal whose cheapest route from start uses every kind of link in kinds
+    nav.ensure_current()
+    for goal in sorted(nav.edges):
+        path = nav.find_path(start, goal)
+        if path and kinds <= {kind for _, kind in path}:
+            return goal, path
+    return None, None
+
+
+def test_graph_is_built_on_first_use(cave):
+    _, tilemap = cave
+    assert tilemap.nav.version is None
+    tilemap.nav.ensure_current()
+    assert tilemap.nav.version == tilemap.tile_version
+
+
+def test_walk_drop_and_jump_links(cave):
+    _, tilemap = cave
+    nav = tilemap.nav
+    nav.ensure_current()
+    spans = set(tilemap.iter_spans())
+    assert set(nav.edges) == spans
+
+    kinds = set()
+    for (ya, la, ra), links in nav.edges.items():
+        for (yb, lb, rb), kind, cost in links:
+            assert (yb, lb, rb) in spans and cost > 0
+            kinds.add(kind)
+            if kind == "walk":
+                # Stepping off an end onto the row just below
+                assert yb == ya + 1 and (lb <= ra + 1 <= rb or lb <= la - 1 <= rb)
+            elif kind == "drop":
+                assert yb > ya
+            else:
+                assert cost > JUMP_PENALTY
+    assert kinds == {"walk", "drop", "jump"}
+
+
+def test_find_path_is_cached_until_tiles_change(cave):
+    game, tilemap = cave
+    nav = tilemap.nav
+    start = nav.span_under(game.player.rect)
+    assert start is not None
+
+    goal, path = _route_with(nav, start, {"drop", "jump"})
+    assert path is not None
+    node = start
+    for span, kind in path:
+        assert any(other == span and link == kind for other, link, _ in nav.edges[node])
+        node = span
+    assert node == goal
+    assert nav.find_path(start, goal) is path
+
+    # Any tile change invalidates the graph and the paths worked out on it
+    version = tilemap.tile_version
+    tilemap.set_tiles([{'x': 500, 'y': 500, 'z': 0, 'environment': 'cave', 'type': 'big_rocks',
+                        'variant': 0, 'properties': ['solid']}])
+    assert tilemap.tile_version > version
+    repath = nav.find_path(start, goal)
+    assert nav.version == tilemap.tile_version
+    assert repath is not path and repath == path
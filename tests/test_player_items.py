@@ -0,0 +1,68 @@
+import pytest
+
+import Game
+from Game.utils.stats import Modifier
+
+
+class _Item:
+    def __init__(self, name, attribute_values):
+        self.name = name
+        self.attribute_values = attribute_values
+
+
+@pytest.fixture
+def player():
+    return Game.Game().player
+
+
+def test_health_item_heals_by_its_value(player):
+    player.attributes["health"] = 3
+    player.give_item(_Item("Heart", {"health": 2}))
+    assert player.stats.current_max_health == 7
+    assert player.attributes["health"] == 5
+
+
+def test_health_item_heals_at_the_max_health_cap(player):
+    player.stats.set_base("current_max_health", player.stats.max_health)
+    player.attributes["health"] = 6
+    player.give_item(_Item("Heart", {"health": 2}))
+    assert player.stats.current_max_health == player.stats.max_health
+    assert player.attributes["health"] == 8
+
+
+def test_negative_health_item_takes_its_value(player):
+    player.give_item(_Item("Curse", {"health": -1}))
+    assert player.stats.current_max_health == 4
+    assert player.attributes["health"] == 4
+
+
+def test_copies_of_a_shared_item_stack(player):
+    # ItemManager hands out the same object for every purchase
+    boots = _Item("Boots", {"speed": 10, "health": 1})
+    base_speed = player.stats.max_speed
+    player.give_item(boots)
+    player.give_item(boots)
+    assert player.item_counts["Boots"] == 2
+    assert player.stats.max_speed == base_speed + 20
+    assert player.stats.current_max_health == 7
+
+    player.unequip(boots)
+    assert player.stats.max_speed == base_speed
+    assert player.stats.current_max_health == 5
+    assert player.attributes["health"] <= 5
+
+    # Equipping again puts every copy back on, without healing
+    health = player.attributes["health"]
+    player.equip(boots)
+    assert player.stats.max_speed == base_speed + 20
+    assert player.attributes["health"] == health
+
+    # Picking up another while it's off puts all of them on
+    player.unequip(boots)
+    player.give_item(boots)
+    assert player.stats.max_speed == base_speed + 30
+
+
+def test_losing_max_health_clamps_health(player):
+    player.stats.add_modifiers([Modifier("current_max_health", -2)])
+    assert player.attributes["health"] == 3
@@ -0,0 +1,60 @@
+import math
+import random
+
+import pytest
+
+import Game
+from Game.utils import raycast
+
+
+@pytest.fixture(scope="module")
+def game():
+    return Game.Game()
+
+
+def _rays(tilemap, count, seed):
+    # Rays from all over the map and well above it, so plenty of them miss
+    rng = random.Random(seed)
+    bounds = tilemap.bounds
+    origins = [(rng.uniform(bounds.left, bounds.right), rng.uniform(bounds.top - 2000, bounds.bottom))
+               for _ in range(count)]
+    directions = [(math.cos(a), math.sin(a)) for a in (rng.uniform(0, math.tau) for _ in range(count))]
+    directions[0] = (0, 0)
+    return origins, directions
+
+
+def _close(a, b):
+    return a == b or abs(a - b) < 1e-6
+
+
+def test_batched_and_fallback_casts_agree(game, monkeypatch):
+    pytest.importorskip("numpy")
+    tilemap = game.tilemaps["cave"]
+    tilemap.ensure_loaded()
+    origins, directions = _rays(tilemap, 500, 1)
+
+    batched = tilemap.raycast_many(origins, directions, 600)
+    monkeypatch.setattr(raycast, "np", None)
+    fallback = tilemap.raycast_many(origins, directions, 600)
+
+    assert type(batched[0]) is type(fallback[0]) is list
+    assert batched[1] == fallback[1]
+    assert all(_close(a, b) for a, b in zip(batched[0], fallback[0]))
+    misses = [cell for distance, cell in zip(*batched) if distance == math.inf]
+    assert misses and all(cell is None for cell in misses)
+
+
+def test_world_index_raycast_many_matches_single_casts(game):
+    tilemap = game.tilemaps["cave"]
+    tilemap.ensure_loaded()
+    origins, directions = _rays(tilemap, 300, 2)
+
+    distances, cells, tilemaps = game.world_index.raycast_many(origins, directions, 600)
+    assert tilemap in tilemaps and None in tilemaps
+    for i, (origin, direction) in enumerate(zip(origins, directions)):
+        hit = game.world_index.raycast(origin, direction, 600)
+        if hit is None:
+            assert (distances[i], cells[i], tilemaps[i]) == (math.inf, None, None), i
+        else:
+            assert _close(hit['distance'], distances[i]), i
+            assert (hit['cell'], hit['tilemap']) == (cells[i], tilemaps[i]), i
@@ -0,0 +1,32 @@
+import pytest
+
+from Game.utils.stats import StatBlock, MOD_MULTIPLY
+
+
+def test_unknown_stats_raise():
+    stats = StatBlock({"max_speed": 200})
+    with pytest.raises(AttributeError):
+        stats.max_sped
+
+
+def test_modifiers_bring_new_stats_in_from_zero():
+    stats = StatBlock({"max_speed": 200})
+    changes = []
+    stats.subscribe(changes.append)
+
+    stats.add_modifier("luck", 2, source="charm")
+    assert stats.luck == 2
+    assert changes == [{"luck": (0, 2)}]
+
+    stats.remove_source("charm")
+    assert stats.luck == 0
+
+
+def test_stacking_and_limits():
+    stats = StatBlock({"max_health": 10, "current_max_health": 5},
+                      limits={"current_max_health": (0, "max_health")})
+    stats.add_modifier("current_max_health", 3)
+    stats.add_modifier("current_max_health", 0.5, MOD_MULTIPLY)
+    assert stats.current_max_health == 10
+    stats.set_base("max_health", 20)
+    assert stats.current_max_health == 12
@@ -0,0 +1,176 @@
+import random
+
+import pygame
+import pytest
+
+from Game.Sprites.PhysicsSprite import PhysicsSprite
+
+TS = 32
+# A 45-degree-ish ramp rising to the left: surface depth per pixel column
+SLOPE_PROFILE = [TS - i // 2 for i in range(TS)]
+SHAPES = {"one_way": ("one_way", None), "slope": ("slope", SLOPE_PROFILE)}
+
+
+class _Map:
+    rendered = True
+    tile_size = TS
+
+    def __init__(self, tiles):
+        self.tiles = tiles
+
+    def get_tile(self, x, y):
+        return self.tiles.get((x, y))
+
+    def get_collision_shape(self, tile):
+        return SHAPES.get(tile.get('shape'))
+
+
+class _WorldIndex:
+    def __init__(self, tilemap):
+        self.tilemap = tilemap
+
+    def query_rect(self, rect):
+        return [("map", self.tilemap)]
+
+
+class _Game:
+    def __init__(self, tiles):
+        self.world_index = _WorldIndex(_Map(tiles))
+
+
+def _surface_height(body, tile_rect, shape):
+    kind, profile = shape
+    if kind == "one_way":
+        if body.rect.right > tile_rect.left and body.rect.left < tile_rect.right:
+            return tile_rect.top
+        return None
+    column = body.rect.centerx - tile_rect.left
+    if 0 <= column < len(profile) and profile[column] is not None:
+        return tile_rect.top + profile[column]
+    return None
+
+
+def stepper_move(body, dx, dy):
+    """The resolver _move_and_collide replaced: 2px steps, re-querying the tiles at every step."""
+    STEPSIZE = 2
+
+    remaining_x = dx
+    while abs(remaining_x) > 0.01:
+        step = max(-STEPSIZE, min(STEPSIZE, remaining_x))
+        body.pos.x += step
+        body.rect.x = int(round(body.pos.x))
+
+        collided = False
+        solid_rects, shaped = body._get_tiles_in_rect(body.rect)
+        for tile_rect in solid_rects:
+            if body.rect.colliderect(tile_rect):
+                if step > 0:
+                    body.rect.right = tile_rect.left
+                    body.collisions["right"] = True
+                else:
+                    body.rect.left = tile_rect.right
+                    body.collisions["left"] = True
+                body.pos.x = float(body.rect.x)
+                if (step > 0 and body.velocity.x > 0) or (step < 0 and body.velocity.x < 0):
+                    body.velocity.x = 0
+                collided = True
+                break
+        if collided:
+            break
+
+        for tile_rect, shape in shaped:
+            if shape[0] != "slope":
+                continue
+            surface = _surface_height(body, tile_rect, shape)
+            if surface is not None and surface < body.rect.bottom <= surface + tile_rect.height // 2:
+                body.rect.bottom = surface
+                body.pos.y = float(body.rect.y)
+                body.collisions["bottom"] = True
+        remaining_x -= step
+
+    remaining_y = dy
+    while abs(remaining_y) > 0.01:
+        step = max(-STEPSIZE, min(STEPSIZE, remaining_y))
+        previous_bottom = body.rect.bottom
+        body.pos.y += step
+        body.rect.y = int(round(body.pos.y))
+
+        collided = False
+        solid_rects, shaped = body._get_tiles_in_rect(body.rect)
+        for tile_rect in solid_rects:
+            if body.rect.colliderect(tile_rect):
+                if step > 0:
+                    body.rect.bottom = tile_rect.top
+                    body.collisions["bottom"] = True
+                else:
+                    body.rect.top = tile_rect.bottom
+                    body.collisions["top"] = True
+                body.pos.y = float(body.rect.y)
+                if (step > 0 and body.velocity.y > 0) or (step < 0 and body.velocity.y < 0):
+                    body.velocity.y = 0
+                collided = True
+                break
+
+        if not collided and step > 0:
+            for tile_rect, shape in shaped:
+                surface = _surface_height(body, tile_rect, shape)
+                if surface is not None and previous_bottom <= surface < body.rect.bottom:
+                    body.rect.bottom = surface
+                    body.collisions["bottom"] = True
+                    body.pos.y = float(body.rect.y)
+                    if body.velocity.y > 0:
+                        body.velocity.y = 0
+                    collided = True
+                    break
+        if collided:
+            break
+        remaining_y -= step
+
+    body.pos.x = body.rect.x
+    body.pos.y = body.rect.y
+
+
+def _layout(rng, kinds):
+    tiles = {}
+    for x in range(-4, 8):
+        for y in range(-4, 8):
+            r = rng.random()
+            if r < 0.25:
+                tiles[(x, y)] = {'properties': ['solid']}
+            elif r < 0.30 and "one_way" in kinds:
+                tiles[(x, y)] = {'properties': ['solid'], 'shape': 'one_way'}
+            elif r < 0.33 and "slope" in kinds:
+                tiles[(x, y)] = {'properties': ['solid'], 'shape': 'slope'}
+    return tiles
+
+
+def _embedded(rect, tiles):
+    # Starting inside a tile has no single right answer; the two resolvers push out differently
+    return any(rect.colliderect(pygame.Rect(x * TS, y * TS, TS, TS)) for x, y in tiles)
+
+
+def _moved(resolve, tiles, pos, size, velocity, dt):
+    body = PhysicsSprite(pygame.Surface(size), pos, _Game(tiles), velocity=velocity)
+    body._reset_collisions()
+    resolve(body, velocity[0] * dt, velocity[1] * dt)
+    return tuple(body.rect), body.collisions.bits, tuple(body.velocity)
+
+
+@pytest.mark.parametrize("kinds", [(), ("one_way",), ("slope",), ("one_way", "slope")])
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_swept_resolver_matches_stepper(kinds, seed):
+    rng = random.Random(f"{seed}-{kinds}")
+    compared = 0
+    while compared < 400:
+        tiles = _layout(rng, kinds)
+        pos = (rng.randint(-40, 160), rng.randint(-40, 160))
+        size = (rng.choice([16, 24, 32]), rng.choice([24, 32, 48]))
+        velocity = (rng.uniform(-400, 400), rng.uniform(-700, 700))
+        dt = rng.choice([1 / 60, 1 / 30, 0.05])
+        if _embedded(pygame.Rect(pos, size), tiles):
+            continue
+
+        expected = _moved(stepper_move, tiles, pos, size, velocity, dt)
+        actual = _moved(PhysicsSprite._move_and_collide, tiles, pos, size, velocity, dt)
+        assert actual == expected, (pos, size, velocity, dt, tiles)
+        compared += 1